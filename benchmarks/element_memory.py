@@ -0,0 +1,149 @@
+# measures the memory of the element storage of a large building, e.g.:
+#   python element_memory.py --floors 200 --walls 16 --roof-size 64
+# the elements are added to the columnar floors and roof of the models and to the previous storage,
+# dicts of element objects with a __dict__ each. The size is the sum of sys.getsizeof of all reachable objects,
+# strings and numbers shared by both are counted as well
+# only the building model is used, maya is not needed
+import argparse
+import os
+import sys
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from models.Floor import *
+from models.Roof import *
+
+blueprints = ["wall_blueprint", "window_blueprint", "door_blueprint"]
+
+
+# element of the previous storage, every instance has a __dict__
+class DictElement(object):
+    def __init__(self, object="new_element", position=kFront, blueprint=None):
+        self._object = object
+        self._position = position
+        self._blueprint = blueprint
+
+
+def get_deep_size(value=None, seen=None):
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(get_deep_size(key, seen) + get_deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(get_deep_size(item, seen) for item in value)
+    elif isinstance(value, (basestring, int, float, array)) or value is None:
+        pass
+    else:
+        if hasattr(value, "__dict__"):
+            size += get_deep_size(value.__dict__, seen)
+        for cls in type(value).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                if hasattr(value, slot):
+                    size += get_deep_size(getattr(value, slot), seen)
+
+    return size
+
+
+# region Columnar
+def create_floors(floor_count=200, wall_count=16):
+    floors = []
+    for level in range(floor_count):
+        floor = Floor("floor_{}".format(level), level)
+        for side in range(4):
+            for i in range(wall_count):
+                floor.add_wall(Wall(floor._get_wall_name(side, i), side, blueprints[i % 3], i))
+            floor.add_corner(Corner(floor._get_corner_name(side), side, "corner_blueprint"))
+        floors.append(floor)
+
+    return floors
+
+
+def create_roof(size=64):
+    roof = Roof("roof")
+    for x in range(size):
+        for y in range(size):
+            roof.add_tile(Tile(roof._get_tile_name(x, y), (x, y), "tile_blueprint"))
+
+    for side in range(4):
+        for i in range(size):
+            roof.add_edge(Edge(roof._get_edge_name(side, i), side, "edge_blueprint", i))
+        roof.add_corner(Corner(roof._get_corner_name(side), side, "roof_corner_blueprint"))
+
+    return roof
+# endregion
+
+
+# region Dicts
+def create_dict_floors(floor_count=200, wall_count=16):
+    floors = []
+    for level in range(floor_count):
+        floor = Floor("floor_{}".format(level), level)
+        walls = {}
+        corners = {}
+        for side in range(4):
+            walls[side] = [DictElement(floor._get_wall_name(side, i), side, blueprints[i % 3]) for i in range(wall_count)]
+            corners[side] = DictElement(floor._get_corner_name(side), side, "corner_blueprint")
+        floors.append((walls, corners))
+
+    return floors
+
+
+def create_dict_roof(size=64):
+    roof = Roof("roof")
+    tiles = {}
+    for x in range(size):
+        tiles[x] = {}
+        for y in range(size):
+            tiles[x][y] = DictElement(roof._get_tile_name(x, y), (x, y), "tile_blueprint")
+
+    edges = {}
+    corners = {}
+    for side in range(4):
+        edges[side] = [DictElement(roof._get_edge_name(side, i), side, "edge_blueprint") for i in range(size)]
+        corners[side] = DictElement(roof._get_corner_name(side), side, "roof_corner_blueprint")
+
+    return tiles, edges, corners
+# endregion
+
+
+def print_size(name="storage", element_count=0, size=0):
+    print "  {}: {} elements, {:.1f} KB, {:.0f} bytes per element".format(name, element_count, size / 1024.0, float(size) / element_count)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Measures the memory of the element storage of a large building.")
+    parser.add_argument("--floors", type=int, default=200, help="number of floors")
+    parser.add_argument("--walls", type=int, default=16, help="number of walls per side of a floor")
+    parser.add_argument("--roof-size", type=int, default=64, help="number of tiles per side of the roof")
+    args = parser.parse_args(args)
+
+    floor_elements = args.floors * 4 * (args.walls + 1)
+    roof_elements = args.roof_size * args.roof_size + 4 * (args.roof_size + 1)
+
+    print "roof ({0}x{0} tiles)".format(args.roof_size)
+    roof_size = get_deep_size(create_roof(args.roof_size))
+    dict_roof_size = get_deep_size(create_dict_roof(args.roof_size))
+    print_size("columnar", roof_elements, roof_size)
+    print_size("dicts", roof_elements, dict_roof_size)
+
+    print "floors ({} floors, {} walls per side)".format(args.floors, args.walls)
+    floors_size = get_deep_size(create_floors(args.floors, args.walls))
+    dict_floors_size = get_deep_size(create_dict_floors(args.floors, args.walls))
+    print_size("columnar", floor_elements, floors_size)
+    print_size("dicts", floor_elements, dict_floors_size)
+
+    total = roof_size + floors_size
+    dict_total = dict_roof_size + dict_floors_size
+    print "total: {:.1f} KB columnar, {:.1f} KB dicts ({:.0%})".format(total / 1024.0, dict_total / 1024.0, float(total) / dict_total)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
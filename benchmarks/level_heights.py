@@ -0,0 +1,79 @@
+# times the level height lookups of a 200 floor building, e.g.:
+#   python level_heights.py --floors 200 --elements 40
+# every element of a floor reads the height of its level, once with the cumulative heights cached by the Building
+# and once by walking the floors below like the generator did before. Both are repeated after swapping
+# and inserting floors, which drop the cached heights above the changed level
+# only the building model is used, maya is not needed
+import argparse
+import os
+import sys
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from models.Building import *
+
+
+def create_building(floor_count=200):
+    building = Building("benchmark_building")
+    for level in range(floor_count):
+        building.add_floor(Floor("floor_{}".format(level), level, "floor_template", None, 2.5 + level % 3))
+
+    return building
+
+
+def get_walked_level_height(building=Building(), level=0):
+    height = 0
+    for cur_level in range(level):
+        height += building.get_floor_height(cur_level)
+
+    return height
+
+
+# reads the height of every level once per element, returns the time and the heights
+def read_level_heights(building=Building(), elements=40, get_level_height=None):
+    start = default_timer()
+
+    heights = []
+    for level in range(building.get_floor_count()):
+        for i in range(elements):
+            height = get_level_height(building, level)
+        heights.append(height)
+
+    return default_timer() - start, heights
+
+
+def compare(name="generate", building=Building(), elements=40):
+    cached_time, cached_heights = read_level_heights(building, elements, Building.get_level_height)
+    walked_time, walked_heights = read_level_heights(building, elements, get_walked_level_height)
+
+    if cached_heights != walked_heights:
+        print "{}: cached level heights differ from the walked ones".format(name)
+        return False
+
+    print "{}: cached {:.4f}s, walked {:.4f}s ({:.0f}x)".format(name, cached_time, walked_time, walked_time / max(cached_time, 1e-9))
+    return True
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Times the level height lookups of a tall building.")
+    parser.add_argument("--floors", type=int, default=200, help="number of floors of the building")
+    parser.add_argument("--elements", type=int, default=40, help="number of elements per floor reading the level height")
+    args = parser.parse_args(args)
+
+    building = create_building(args.floors)
+    print "{} floors, {} elements per floor".format(args.floors, args.elements)
+
+    valid = compare("generate", building, args.elements)
+
+    building.swap_floors(args.floors / 2, args.floors / 2 + 1)
+    valid = compare("swap", building, args.elements) and valid
+
+    building.insert_floor(Floor("inserted_floor", 1, "floor_template", None, 4.0))
+    valid = compare("insert", building, args.elements) and valid
+
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# compares the node counts of the duplication modes, e.g.:
+#   mayapy node_counts.py --templates templates.json --specs specs.json --scene blueprints.ma
+# the same specs are generated in copy, lean and instance mode, each into a freshly opened scene,
+# and the dag and dependency node counts of every building are printed per mode
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from batch_generate import *
+
+modes = [("copy", kDuplicateCopy), ("lean", kDuplicateLean), ("instance", kDuplicateInstance)]
+
+
+def count_nodes(mode=kDuplicateCopy, specs=[], scene=None):
+    if scene:
+        mc.file(scene, open=True, force=True)
+
+    generator = BuildingGenerator(duplication_mode=mode, undo=False)
+    generator.create_buildings(specs)
+
+    return [(spec.id, generator.get_node_count_report(spec.id)) for spec in specs]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Compares the node counts of the duplication modes.")
+    parser.add_argument("--templates", required=True, help="json file or library directory with the building templates")
+    parser.add_argument("--specs", required=True, help="json file with the building specs")
+    parser.add_argument("--scene", help="scene with the blueprints, opened before each mode")
+    args = parser.parse_args(args)
+
+    if args.scene:
+        mc.file(args.scene, open=True, force=True)
+    templates = load_templates(args.templates)
+    specs = load_specs(args.specs, templates)
+
+    totals = {}
+    for name, mode in modes:
+        print "{} mode".format(name)
+
+        total = {"dag": 0, "dependency": 0, "total": 0}
+        for building_id, report in count_nodes(mode, specs, args.scene):
+            if report is None:
+                print "  {}: not created".format(building_id)
+                continue
+
+            print "  {}: {dag} dag, {dependency} dependency, {total} total".format(building_id, **report)
+            for key in total.keys():
+                total[key] += report[key]
+
+        totals[name] = total
+
+    print "totals"
+    for name, mode in modes:
+        print "  {}: {dag} dag, {dependency} dependency, {total} total".format(name, **totals[name])
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,10 @@ import inspect
 import os
 import sys
 from gui.MenuEntry import*
+from gui.CallbackManager import callback_manager
+from models.BlueprintCache import blueprint_cache
+from models.BuildingRegistry import building_registry
+from apply_plan_command import *
 
 # menu to create
 menu_entry = None
@@ -21,11 +25,18 @@ def initializePlugin(mobject):
     dir_name = os.path.dirname(file_name)
     sys.path.append(dir_name)
 
+    # command of the api applier, makes its plans undoable
+    mplugin.registerCommand(kApplyPlanCommand, ApplyPlanCommand.creator)
+
     # create menu entry
     global menu_entry
     menu_entry = MenuEntry()
     menu_entry.create()
 
+    # watch the scene for blueprint and building changes
+    blueprint_cache.add_callbacks()
+    building_registry.add_callbacks()
+
     print "Loaded Building Generator plugin"
 
 
@@ -34,4 +45,17 @@ def uninitializePlugin(mobject):
     global menu_entry
     menu_entry.destroy()
 
+    # command of the api applier
+    mplugin = om.MFnPlugin(mobject)
+    mplugin.deregisterCommand(kApplyPlanCommand)
+
+    # stop watching the scene
+    blueprint_cache.remove_callbacks()
+    building_registry.remove_callbacks()
+
+    # callbacks of editors which have not been closed
+    if callback_manager.get_callback_count() > 0:
+        mc.warning("Removing {} callbacks of the Building Generator editor.".format(callback_manager.get_callback_count()))
+        callback_manager.remove_all()
+
     print "Unloaded Building Generator plugin"
@@ -0,0 +1,33 @@
+import maya.api.OpenMaya as om
+import maya.cmds as mc
+from plan_appliers import *
+
+
+# plugin command which applies the pending edit of the ApiPlanApplier, registered as kApplyPlanCommand
+# the edit is kept by the command, so undo and redo revert and repeat the whole plan
+class ApplyPlanCommand(om.MPxCommand):
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        self._edit = None
+
+    @staticmethod
+    def creator():
+        return ApplyPlanCommand()
+
+    def doIt(self, args):
+        self._edit = take_pending_edit()
+        if self._edit is None:
+            mc.error("There is no plan to apply, {} is only run by the ApiPlanApplier.".format(kApplyPlanCommand))
+            return
+
+        self._edit.do_it()
+
+    def undoIt(self):
+        self._edit.undo_it()
+
+    def redoIt(self):
+        self._edit.redo_it()
+
+    def isUndoable(self):
+        return self._edit is not None
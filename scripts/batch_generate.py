@@ -0,0 +1,107 @@
+# generates buildings without the editor, e.g. on farm nodes:
+#   mayapy batch_generate.py --templates templates.json --specs specs.json --scene blueprints.ma --output city.ma
+# templates: a building template or a list of them (in the format of BuildingTemplate.get_serializable)
+#            or the directory of a template library
+# specs: a list of building specs (in the format of BuildingSpec.get_serializable)
+# only maya.cmds is required (the OpenMaya api is used to count the commands if it is available),
+# neither PySide2 nor the gui modules are imported
+import argparse
+import json
+import os
+import sys
+
+# start maya when running in mayapy, stand-ins for maya.cmds do not need it
+try:
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+except (ImportError, AttributeError):
+    pass
+
+import maya.cmds as mc
+from building_generator import *
+from models.TemplateLibrary import *
+
+
+def load_templates(path="templates.json"):
+    # template library?
+    if os.path.isdir(path):
+        library = TemplateLibrary(path)
+        return dict((id, library.get_template(id)) for id in library.get_template_ids())
+
+    with open(path, "r") as templates_file:
+        serializable = json.load(templates_file)
+
+    # single template?
+    if isinstance(serializable, dict):
+        serializable = [serializable]
+
+    templates = {}
+    for serializable_template in serializable:
+        template = BuildingTemplate.get_from_serializable(serializable_template)
+        templates[template.id] = template
+
+    return templates
+
+
+def load_specs(path="specs.json", templates={}):
+    with open(path, "r") as specs_file:
+        serializable = json.load(specs_file)
+
+    return [BuildingSpec.get_from_serializable(serializable_spec, templates) for serializable_spec in serializable]
+
+
+def save_scene(path="scene.ma"):
+    file_type = "mayaBinary" if path.lower().endswith(".mb") else "mayaAscii"
+
+    mc.file(rename=path)
+    mc.file(save=True, force=True, type=file_type)
+
+
+def print_progress(created=0, count=0, building_id="building"):
+    print "Created building {} ({}/{})".format(building_id, created, count)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Generates buildings from json specs.")
+    parser.add_argument("--templates", required=True, help="json file or library directory with the building templates")
+    parser.add_argument("--specs", required=True, help="json file with the building specs")
+    parser.add_argument("--scene", help="scene with the blueprints to open before generating")
+    parser.add_argument("--output", help="path to save the scene to, the opened scene is saved if not given")
+    parser.add_argument("--mode", choices=["copy", "instance", "lean"], default="copy", help="duplication mode of the elements")
+    parser.add_argument("--compress", action="store_true", help="compress the meta data of the buildings")
+    parser.add_argument("--no-undo", action="store_true", help="do not record the generation on the undo queue")
+    parser.add_argument("--progress", action="store_true", help="print every created floor and roof")
+    args = parser.parse_args(args)
+
+    # open scene with blueprints
+    if args.scene:
+        mc.file(args.scene, open=True, force=True)
+
+    # load templates and specs
+    templates = load_templates(args.templates)
+    specs = load_specs(args.specs, templates)
+
+    # generate
+    modes = {"copy": kDuplicateCopy, "instance": kDuplicateInstance, "lean": kDuplicateLean}
+    generator = BuildingGenerator(duplication_mode=modes[args.mode], metadata_compression="zlib" if args.compress else None,
+                                  undo=not args.no_undo, progress_reporter=ConsoleProgressReporter() if args.progress else None)
+    buildings = generator.create_buildings(specs, print_progress)
+    if buildings is None:
+        print "Generation has been cancelled"
+        return 1
+
+    undo_report = generator.get_undo_recorder().get_last_report()
+    if undo_report["commands"] is not None:
+        print "Ran {} commands, {} recorded for undo".format(undo_report["commands"], undo_report["recorded_commands"])
+
+    # save
+    output = args.output or args.scene
+    if output:
+        save_scene(output)
+
+    print "Generated {} of {} buildings".format(len(buildings), len(specs))
+    return 0 if len(buildings) == len(specs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,75 @@
+import multiprocessing
 import random
 import sys
-import uuid
 from models.Building import *
-from models.Templates import *
+from models.BuildingSpec import *
+from building_planner import *
+from plan_appliers import *
+from floor_transaction import *
+from generation_context import *
 
 
 # Generator class for creating Buildings
+# Floors and roofs are planned by the BuildingPlanner and the plans are applied to the scene by an applier
+# (CmdsPlanApplier by default, ApiPlanApplier to apply each plan with a single DAG modifier)
+# Elements are either copies of their blueprint (instancing its leaf shapes, except for floor corners),
+# lean copies with their own shapes but without intermediate shapes, or instances sharing the shape of the blueprint
+# Every public operation which changes the scene runs in the GenerationContext of the generator:
+# it is one undo chunk (with undo=False nothing is recorded), reports its progress per floor and roof
+# and can be cancelled between its elements. A cancelled operation is rolled back and returns None
 class BuildingGenerator:
 
+    def __init__(self, applier=None, duplication_mode=kDuplicateCopy, metadata_compression=None, undo=True,
+                 progress_reporter=None):
+        self._planner = BuildingPlanner()
+        self._context = GenerationContext(UndoRecorder(undo), progress_reporter)
+
+        if applier is None:
+            applier = CmdsPlanApplier()
+        self._applier = applier
+        self._duplication_mode = duplication_mode
+        self._metadata_compression = metadata_compression
+
+    def get_planner(self):
+        return self._planner
+
+    def get_applier(self):
+        return self._applier
+
+    def set_applier(self, applier=CmdsPlanApplier()):
+        self._applier = applier
+
+    def get_duplication_mode(self):
+        return self._duplication_mode
+
+    def set_duplication_mode(self, duplication_mode=kDuplicateCopy):
+        self._duplication_mode = duplication_mode
+
+    # compression of the meta data of buildings, None or "zlib"
+    def get_metadata_compression(self):
+        return self._metadata_compression
+
+    def set_metadata_compression(self, metadata_compression=None):
+        self._metadata_compression = metadata_compression
+
+    # undo, progress and cancellation of the operations
+    def get_context(self):
+        return self._context
+
+    # undo chunks of the operations and the growth of the undo queue
+    def get_undo_recorder(self):
+        return self._context.get_undo_recorder()
+
     # region Building
     def building_exists(self, building_id="new_building"):
         return mc.objExists(building_root_format.format(building_id))
 
+    @generator_operation
     def destroy_building(self, building_id="building_name"):
         if self.building_exists(building_id):
             mc.delete(building_root_format.format(building_id))
 
+    @generator_operation
     def create_empty_building(self, building_id="building_name", template=BuildingTemplate()):
         # destroy the building if it already exists
         self.destroy_building(building_id)
@@ -23,549 +77,378 @@ class BuildingGenerator:
         # create building with root
         building_root = mc.createNode('transform', name=building_root_format.format(building_id))
         building = Building(building_root, template.id)
+        self._context.building_created(building_root)
 
         # return the new building
         return building
+
+    # number of nodes used by a building: dag nodes below the root and the dependency nodes upstream of them
+    def get_node_count_report(self, building_id="building_name"):
+        if not self.building_exists(building_id):
+            return None
+
+        root = building_root_format.format(building_id)
+        dag_nodes = mc.ls([root] + (mc.listRelatives(root, allDescendents=True, fullPath=True) or []), long=True)
+
+        history = set(mc.ls(mc.listHistory(dag_nodes) or [], long=True))
+        dependency_nodes = history.difference(dag_nodes)
+
+        return {
+            "dag": len(dag_nodes),
+            "dependency": len(dependency_nodes),
+            "total": len(dag_nodes) + len(dependency_nodes),
+        }
+    # endregion
+
+    # region Batch
+    # creates all buildings of the specs with a single undo chunk and returns them, or None if it has been cancelled
+    # progress_callback is called with (number of created buildings, number of buildings, building id)
+    # with processes > 1 the buildings are planned by a pool of worker processes and applied to the scene here,
+    # the result is the same as with a single process since the seeds are chosen before planning
+    # (inside of maya on windows multiprocessing.set_executable has to point to mayapy)
+    @generator_operation
+    def create_buildings(self, specs=[], progress_callback=None, processes=1):
+        tasks = []
+
+        # valid templates per building template, shared by all specs
+        valid_templates = {}
+
+        for spec in specs:
+            template_key = id(spec.template)
+            if not valid_templates.has_key(template_key):
+                valid_templates[template_key] = self._get_batch_templates(spec.template)
+
+            floor_templates, roof_templates = valid_templates[template_key]
+            if floor_templates is None:
+                mc.warning("Skipped building \"{}\", its template is not valid.".format(spec.id))
+                continue
+
+            # random seed for specs without one
+            seed = spec.seed
+            if seed is None:
+                seed = random.randint(0, sys.maxint)
+
+            tasks.append((spec, seed, floor_templates, roof_templates))
+
+        # plan
+        pool = None
+        if processes > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(processes)
+            building_plans = pool.imap(plan_building_task, tasks, max(1, len(tasks) // (processes * 4)))
+        else:
+            building_plans = (plan_building_task(task) for task in tasks)
+
+        # apply
+        buildings = []
+        try:
+            for task, building_plan in zip(tasks, building_plans):
+                buildings.append(self.apply_building_plan(task[0].template, building_plan))
+
+                if progress_callback is not None:
+                    progress_callback(len(buildings), len(tasks), task[0].id)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        return buildings
+
+    @generator_operation
+    def create_building(self, spec=BuildingSpec(), seed=None):
+        floor_templates, roof_templates = self._get_batch_templates(spec.template)
+        if floor_templates is None:
+            mc.error("Can not create building \"{}\", its template is not valid.".format(spec.id))
+            return None
+
+        if seed is None:
+            seed = spec.seed
+        if seed is None:
+            seed = random.randint(0, sys.maxint)
+
+        building_plan = self._planner.plan_building(spec, seed, floor_templates, roof_templates)
+        return self.apply_building_plan(spec.template, building_plan)
+
+    @generator_operation
+    def apply_building_plan(self, building_template=BuildingTemplate(), building_plan=BuildingPlan()):
+        # create building at its position
+        building = self.create_empty_building(building_plan.id, building_template)
+        building.set_position(building_plan.position)
+
+        # floors and roof
+        for floor_plan in building_plan.floor_plans:
+            self.apply_floor_plan(building, floor_plan)
+        self.apply_roof_plan(building, building_plan.roof_plan)
+
+        # save building in the scene
+        building.save_metadata(self._metadata_compression)
+
+        return building
+
+    def _get_batch_templates(self, building_template=BuildingTemplate()):
+        if building_template.is_valid() != 1:
+            return None, None
+
+        floor_templates = building_template.get_valid_floor_templates()
+        roof_templates = building_template.get_valid_roof_templates()
+        if len(floor_templates) == 0 or len(roof_templates) == 0:
+            return None, None
+
+        return floor_templates, roof_templates
     # endregion
 
     #region Create Floors
+    @generator_operation
     def create_floor(self, building=Building(), building_template=BuildingTemplate(), floor_template=FloorTemplate(), level=0, seed=None):
         # remove existing floor
         if building.has_floor_at(level):
             existing_floor = building.get_floor_at_level(level)
 
-            floor_template_id = existing_floor.get_template_id()
-            offset_y = building_template.get_floor_template(floor_template_id).unit[1]
+            offset_y = building.get_floor_height(level, building_template)
 
             building.remove_floor(level)
             existing_floor.destroy()
 
             direction = (0, floor_template.unit[1] - offset_y, 0)
-            self._move_floors_in_range(building, level + 1, building.get_floor_count(), direction, 0)
-            building.get_roof().move_position(direction)
+            building.move_floors(level + 1, building.get_floor_count(), direction, 0, True)
 
         # adjust roof if exists
         elif building.get_roof() is not None:
             building.get_roof().move_position((0, floor_template.unit[1], 0))
 
-        # set seed
-        if seed is None:
-            seed = random.randint(0, sys.maxint)
-        random.seed(seed)
+        # plan and create the floor
+        floor_plan = self.plan_floor(building, building_template, floor_template, level, seed)
+        self.apply_floor_plan(building, floor_plan)
 
-        # create floor with root
-        floor_root = self._get_floor_root(building, building_template, level)
-        new_floor = Floor(floor_root, level, floor_template.id, seed)
+    def plan_floor(self, building=Building(), building_template=BuildingTemplate(), floor_template=FloorTemplate(), level=0, seed=None,
+                   floor_root=None):
+        return self._planner.plan_floor(building, building_template, floor_template, level, seed, building.get_position(),
+                                        floor_root)
 
-        # walls and corners
-        self._crate_floor_walls(building, building_template, new_floor, floor_template)
-        self._create_floor_corners(building, building_template, new_floor, floor_template)
+    @generator_operation
+    def apply_floor_plan(self, building=Building(), floor_plan=FloorPlan()):
+        new_floor = self._create_floor_from_plan(floor_plan)
 
         # add floor to building
         building.add_floor(new_floor)
 
-    def _crate_floor_walls(self, building=Building(), building_template=BuildingTemplate(), floor=Floor(), floor_template=FloorTemplate()):
-        for side in [kFront, kBack, kLeft, kRight]:
-            self._create_floor_walls_for_side(side, building, building_template, floor, floor_template)
-
-    def _create_floor_walls_for_side(self, side, building=Building(), building_template=BuildingTemplate(), floor=Floor(), floor_template=FloorTemplate()):
-        # level of the floor to create
-        level = floor.get_level()
-
-        # calculate origin parameters
-        start_x = floor_template.width * 0.5 * floor_template.unit[0] - self._get_offset(floor_template.unit[0])
-        start_z = floor_template.depth * 0.5 * floor_template.unit[2] - self._get_offset(floor_template.unit[2])
-        length = self._get_length_of_side(floor_template, side)
-
-        # create floor walls
-        for i in range(length):
-            # skip corners
-            if floor_template.corners:
-                if i == 0 or i == length - 1:
-                    continue
-
-            # choose random wall
-            wall_index = random.randint(0, len(floor_template.walls) - 1)
-
-            # create mesh and rename
-            wall_object = mc.duplicate(floor_template.walls[wall_index], ilf=True)[0]
-            wall_object = mc.rename(wall_object, floor_wall_format.format(building.get_object(), str(level), side_names[side], i))
-
-            # new wall element
-            new_wall = Wall(wall_object, side)
-
-            # set position and rotation
-            wall_position = [0, self._get_level_height(building, building_template, floor.get_level()) + self._get_offset(floor_template.unit[1]), 0]
-            wall_rotation = [0, self._get_y_angle_of_side(side), 0]
-
-            if side == kFront:
-                wall_position[0] = start_x - i * floor_template.unit[0]
-                wall_position[2] = floor_template.depth * self._get_offset(floor_template.unit[2])
-            if side == kBack:
-                wall_position[0] = start_x - i * floor_template.unit[0]
-                wall_position[2] = -floor_template.depth * self._get_offset(floor_template.unit[2])
-            if side == kLeft:
-                wall_position[0] = floor_template.width * self._get_offset(floor_template.unit[0])
-                wall_position[2] = start_z - i * floor_template.unit[2]
-            if side == kRight:
-                wall_position[0] = -floor_template.width * self._get_offset(floor_template.unit[0])
-                wall_position[2] = start_z - i * floor_template.unit[2]
-
-            # add building offset
-            wall_position[0] += building.get_position()[0]
-            wall_position[1] += building.get_position()[1]
-            wall_position[2] += building.get_position()[2]
-
-            new_wall.set_position(tuple(wall_position))
-            new_wall.set_rotation(tuple(wall_rotation))
-
-            # parent wall to floor root
-            new_wall.set_parent(self._get_floor_wall_root(floor, side))
-
-            # add wall to its floor
-            floor.add_wall(new_wall)
-
-    def _create_floor_corners(self, building=Building(), building_template=BuildingTemplate(), floor=Floor(), floor_template=FloorTemplate()):
-        # level of the floor
-        level = floor.get_level()
-
-        # create corners
-        for i in range(4):
-            # choose corner for individual side
-            corner_index = i
-            if corner_index > len(floor_template.corners) - 1:
-                corner_index = len(floor_template.corners) - 1
-
-            # create corner object
-            corner_object = mc.duplicate(floor_template.corners[corner_index])[0]
-            corner_object = mc.rename(corner_object, floor_corner_format.format(building.get_object(), str(level), side_names[i]))
-
-            # create corner
-            new_corner = Corner(corner_object, i)
-
-            # get parameters for face direction
-            face_width = self._get_corner_face_width(i)
-            face_depth = self._get_corner_face_depth(i)
-
-            # set position and rotation of the corner
-            corner_position = [floor_template.width * self._get_offset(floor_template.unit[0]) * face_width,
-                               self._get_level_height(building, building_template, floor.get_level()) + self._get_offset(floor_template.unit[1]),
-                               floor_template.depth * self._get_offset(floor_template.unit[2]) * face_depth]
-            corner_rotation = [0,
-                               self._get_y_angle_of_side(i),
-                               0]
-
-            # add building offset
-            corner_position[0] += building.get_position()[0]
-            corner_position[1] += building.get_position()[1]
-            corner_position[2] += building.get_position()[2]
-
-            new_corner.set_position(tuple(corner_position))
-            new_corner.set_rotation(tuple(corner_rotation))
-
-            # parent corner to the root
-            new_corner.set_parent(self._get_floor_corner_root(floor))
-
-            # add corner to the floor
-            floor.add_corner(new_corner)
+        return new_floor
+
+    def _create_floor_from_plan(self, floor_plan=FloorPlan()):
+        # create roots and elements in the scene
+        self._context.part_started(floor_plan.object, len(floor_plan.elements))
+        element_objects = self._applier.apply(floor_plan, self._duplication_mode, self._context.element_created)
+
+        return self._get_floor_of_plan(floor_plan, element_objects)
+
+    def _get_floor_of_plan(self, floor_plan=FloorPlan(), element_objects=[]):
+        # create floor
+        new_floor = Floor(floor_plan.object, floor_plan.level, floor_plan.template_id, floor_plan.seed, floor_plan.height)
+        new_floor.set_layout(floor_plan.layout)
+
+        # walls and corners
+        for element_plan, element_object in zip(floor_plan.elements, element_objects):
+            if element_plan.kind == kWallElement:
+                new_floor.add_wall(Wall(element_object, element_plan.side, element_plan.blueprint, element_plan.index))
+            elif element_plan.kind == kCornerElement:
+                new_floor.add_corner(Corner(element_object, element_plan.side, element_plan.blueprint))
+
+        return new_floor
     #endregion
 
     # region Create Roof
+    @generator_operation
     def create_roof(self, building=Building(), building_template=BuildingTemplate(), roof_template=RoofTemplate(), seed=None):
         # destroy roof if exist
         if building.get_roof() is not None:
             building.get_roof().destroy()
             building.remove_roof()
 
-        # set seed
-        if seed is None:
-            seed = random.randint(0, sys.maxint)
-        random.seed(seed)
+        # plan and create the roof
+        roof_plan = self.plan_roof(building, building_template, roof_template, seed)
+        self.apply_roof_plan(building, roof_plan)
 
-        # create roof with root
-        roof_root = self._get_roof_root(building, building_template)
-        new_roof = Roof(roof_root, roof_template.id, seed)
+    def plan_roof(self, building=Building(), building_template=BuildingTemplate(), roof_template=RoofTemplate(), seed=None):
+        return self._planner.plan_roof(building, building_template, roof_template, seed, building.get_position())
 
-        # create roof parts
-        self._create_roof_tiles(building, building_template, new_roof, roof_template)
-        self._create_roof_edges(building, building_template, new_roof, roof_template)
-        self._create_roof_corners(building, building_template, new_roof, roof_template)
+    @generator_operation
+    def apply_roof_plan(self, building=Building(), roof_plan=RoofPlan()):
+        # create roots and elements in the scene
+        self._context.part_started(roof_plan.object, len(roof_plan.elements))
+        element_objects = self._applier.apply(roof_plan, self._duplication_mode, self._context.element_created)
 
         # add roof to building
+        new_roof = self._get_roof_of_plan(roof_plan, element_objects)
         building.set_roof(new_roof)
 
-    def _create_roof_tiles(self, building=Building(), building_template=BuildingTemplate(), roof=Roof(), roof_template=RoofTemplate()):
-        # calculate start paremeters
-        start_x = roof_template.width * 0.5 * roof_template.unit[0] - self._get_offset(roof_template.unit[0])
-        start_z = roof_template.depth * 0.5 * roof_template.unit[2] - self._get_offset(roof_template.unit[2])
-
-        # create tiles
-        for x in range(roof_template.width):
-            for y in range(roof_template.depth):
-                # skip corners
-                if self._position_is_cornder_or_edge(roof_template, x, y):
-                    continue
-
-                # get random tile
-                tile_index = random.randint(0, len(roof_template.tiles) - 1)
-
-                # create tile object
-                tile_object = mc.duplicate(roof_template.tiles[tile_index], ilf=True)[0]
-                tile_object = mc.rename(tile_object, roof_tile_format.format(building.get_object(), str(x), str(y)))
-
-                # create tile
-                new_tile = Tile(tile_object, (x, y))
-
-                # calculate position
-                tile_position = [start_x - x * roof_template.unit[0],
-                                 self._get_level_height(building, building_template, building.get_floor_count()),
-                                 start_z - y * roof_template.unit[2]]
-
-                # add building offset
-                tile_position[0] += building.get_position()[0]
-                tile_position[1] += building.get_position()[1]
-                tile_position[2] += building.get_position()[2]
-
-                # set position of the tile
-                new_tile.set_position(tuple(tile_position))
-
-                # parent tile to root
-                new_tile.set_parent(self._get_roof_tile_root(roof))
-
-                # add tile to roof
-                roof.add_tile(new_tile)
-
-    def _create_roof_edges(self, building=Building(), building_template=BuildingTemplate(), roof=Roof(), roof_template=RoofTemplate()):
-        for side in [kFront, kBack, kLeft, kRight]:
-            self._create_roof_edges_for_side(side, building, building_template, roof, roof_template)
-
-    def _create_roof_edges_for_side(self, side, building=Building(), building_template=BuildingTemplate(), roof=Roof(), roof_template=RoofTemplate()):
-        # calculate start parameters
-        start_x = roof_template.width * 0.5 * roof_template.unit[0] - self._get_offset(roof_template.unit[0])
-        start_z = roof_template.depth * 0.5 * roof_template.unit[2] - self._get_offset(roof_template.unit[2])
-        length = self._get_length_of_side(roof_template, side)
-
-        for i in range(length):
-            # skip corners
-            if roof_template.corners:
-                if i == 0 or i == length - 1:
-                    continue
-
-            # choose random edge
-            edge_index = random.randint(0, len(roof_template.edges) - 1)
-
-            # create mesh and rename
-            edge_object = mc.duplicate(roof_template.edges[edge_index], ilf=True)[0]
-            edge_object = mc.rename(edge_object,
-                                    roof_edge_format.format(building.get_object(), side, str(i)))
-
-            # new edge
-            new_edge = Edge(edge_object, side)
-
-            # set position and rotation
-            edge_position = [0,
-                             self._get_level_height(building, building_template, building.get_floor_count()),
-                             0]
-            edge_rotation = [0,
-                             self._get_y_angle_of_side(side),
-                             0]
-
-            if side == kFront:
-                edge_position[0] = start_x - i * roof_template.unit[0]
-                edge_position[2] = (roof_template.depth * self._get_offset(roof_template.unit[2])) - self._get_offset(roof_template.unit[2])
-            if side == kBack:
-                edge_position[0] = start_x - i * roof_template.unit[0]
-                edge_position[2] = (-roof_template.depth * self._get_offset(roof_template.unit[2])) + self._get_offset(roof_template.unit[2])
-            if side == kLeft:
-                edge_position[0] = (roof_template.width * self._get_offset(roof_template.unit[0])) - self._get_offset(roof_template.unit[0])
-                edge_position[2] = start_z - i * roof_template.unit[2]
-            if side == kRight:
-                edge_position[0] = (-roof_template.width * self._get_offset(roof_template.unit[0])) + self._get_offset(roof_template.unit[0])
-                edge_position[2] = start_z - i * roof_template.unit[2]
-
-            # add building offset
-            edge_position[0] += building.get_position()[0]
-            edge_position[1] += building.get_position()[1]
-            edge_position[2] += building.get_position()[2]
-
-            new_edge.set_position(tuple(edge_position))
-            new_edge.set_rotation(tuple(edge_rotation))
-
-            # parent edge to root
-            new_edge.set_parent(self._get_roof_edge_root(roof, side))
-
-            # add edge to roof
-            roof.add_edge(new_edge)
-
-    def _create_roof_corners(self, building=Building(), building_template=BuildingTemplate(), roof=Roof(), roof_template=RoofTemplate()):
-        for i in range(4):
-            # choose corner for individual side
-            corner_index = i
-            if corner_index > len(roof_template.corners) - 1:
-                corner_index = len(roof_template.corners) - 1
-
-            # create corner object
-            corner_object = mc.duplicate(roof_template.corners[corner_index], ilf=True)[0]
-            corner_object = mc.rename(corner_object,
-                                      roof_corner_format.format(building.get_object(), side_names[i]))
-
-            # create corner
-            new_corner = Corner(corner_object, i)
-
-            # get parameters for face direction
-            face_width = self._get_corner_face_width(i)
-            face_depth = self._get_corner_face_depth(i)
-
-            offset_width = self._get_offset(roof_template.unit[0]) * face_width
-            offset_depth = self._get_offset(roof_template.unit[2]) * face_depth
-
-            # set position and rotation of the corner
-            corner_position = [(roof_template.width * offset_width) - offset_width,
-                               self._get_level_height(building, building_template, building.get_floor_count()),
-                               (roof_template.depth * offset_depth) - offset_depth]
-            corner_rotation = [0,
-                               self._get_y_angle_of_side(i),
-                               0]
-
-            # add building offset
-            corner_position[0] += building.get_position()[0]
-            corner_position[1] += building.get_position()[1]
-            corner_position[2] += building.get_position()[2]
-
-            new_corner.set_position(tuple(corner_position))
-            new_corner.set_rotation(tuple(corner_rotation))
-
-            # parent corner to root
-            new_corner.set_parent(self._get_roof_corner_root(roof))
-
-            # add corner to roof
-            roof.add_corner(new_corner)
-    # endregion
+        return new_roof
 
-    # region Floor Modifications
-    def swap_floors(self, building=Building(), building_template=BuildingTemplate(), level_1=0, level_2=1):
-        # get floors
-        floor_1 = building.get_floor_at_level(level_1)
-        floor_2 = building.get_floor_at_level(level_2)
+    def _get_roof_of_plan(self, roof_plan=RoofPlan(), element_objects=[]):
+        # create roof
+        new_roof = Roof(roof_plan.object, roof_plan.template_id, roof_plan.seed)
+        new_roof.set_layout(roof_plan.layout)
 
-        # switch floor levels
-        floor_1.set_level(level_2)
-        floor_2.set_level(level_1)
-
-        # remove floors
-        building.add_floor(floor_1)
-        building.add_floor(floor_2)
-
-        # swap positions
-        building.get_floor_at_level(level_1).set_position((0, self._get_level_height(building, building_template, level_1), 0))
-        building.get_floor_at_level(level_2).set_position((0, self._get_level_height(building, building_template, level_2), 0))
-
-        # adjust floors in between
-        if len(range(level_1, level_2)) > 1:
-            template_1 = building_template.get_floor_template(floor_1.get_template_id())
-            template_2 = building_template.get_floor_template(floor_2.get_template_id())
-
-            direction = (0, template_2.unit[1] - template_1.unit[1], 0)
-            self._move_floors_in_range(building, level_1 + 1, level_2 - 1, direction, 0)
-
-    def destroy_floor(self, building=Building(), building_template=BuildingTemplate(), level=0):
-        # get floor to destroy
-        floor_to_destroy = building.get_floor_at_level(level)
+        # tiles, edges and corners
+        for element_plan, element_object in zip(roof_plan.elements, element_objects):
+            if element_plan.kind == kTileElement:
+                new_roof.add_tile(Tile(element_object, element_plan.tile_position, element_plan.blueprint))
+            elif element_plan.kind == kEdgeElement:
+                new_roof.add_edge(Edge(element_object, element_plan.side, element_plan.blueprint, element_plan.index))
+            elif element_plan.kind == kCornerElement:
+                new_roof.add_corner(Corner(element_object, element_plan.side, element_plan.blueprint))
 
-        # get the offset y of the floor
-        floor_template_id = floor_to_destroy.get_template_id()
-        offset_y = building_template.get_floor_template(floor_template_id).unit[1]
-
-        # remove and destroy the floor
-        building.remove_floor(level)
-        floor_to_destroy.destroy()
-
-        # adjust all following floors
-        self._move_floors_in_range(building, level+1, building.get_floor_count(), (0, -offset_y, 0))
-
-        # adjust roof
-        building.get_roof().move_position((0, -offset_y, 0))
-
-    def insert_floor(self, building=Building(), building_template=BuildingTemplate(), floor_template=FloorTemplate(), level=0):
-        # offset of new floor
-        offset_y = floor_template.unit[1]
-
-        # move floors up
-        if level <= building.get_floor_count() - 1:
-            self._move_floors_in_range(building, level, building.get_floor_count() - 1, (0, offset_y, 0), 1)
+        return new_roof
+    # endregion
 
-        # create new floor
-        self.create_floor(building, building_template, floor_template, level)
+    # region Regenerate
+    # regenerates a floor and only applies the differences to its current elements to the scene:
+    # elements of removed slots are deleted, new slots are created, changed blueprints are swapped
+    # and the rest is only moved if the layout (unit, size, height or position) changed
+    # floors of older versions, without the blueprints of their elements, and floors with another height are recreated
+    @generator_operation
+    def regenerate_floor(self, building=Building(), building_template=BuildingTemplate(), floor_template=FloorTemplate(), level=0, seed=None):
+        floor = building.get_floor_at_level(level)
+        if floor.get_height() != floor_template.unit[1] or not self._can_regenerate(floor):
+            self.create_floor(building, building_template, floor_template, level, seed)
+            return
 
-    def _move_floors_in_range(self, building=Building(), start_level=0, end_level=1, direction=(0, 0, 0), adjust_level=2):
-        # move floors
-        for cur_level in range(start_level, end_level + 1):
-            # get the current floor
-            cur_floor = building.get_floor_at_level(cur_level)
+        floor_plan = self.plan_floor(building, building_template, floor_template, level, seed, floor.get_object())
+        element_objects = self._apply_plan_changes(floor, floor_plan)
 
-            # move the floor by the previews offset
-            cur_floor.move_position(direction)
+        building.add_floor(self._get_floor_of_plan(floor_plan, element_objects))
 
-        # no level adjustment
-        if adjust_level == 0:
+    @generator_operation
+    def regenerate_roof(self, building=Building(), building_template=BuildingTemplate(), roof_template=RoofTemplate(), seed=None):
+        roof = building.get_roof()
+        if roof is None or not self._can_regenerate(roof):
+            self.create_roof(building, building_template, roof_template, seed)
             return
 
-        # adjust level up
-        if adjust_level == 1:
-            for cur_level in reversed(range(start_level, end_level + 1)):
-                # get the current floor
-                cur_floor = building.get_floor_at_level(cur_level)
+        roof_plan = self.plan_roof(building, building_template, roof_template, seed)
+        element_objects = self._apply_plan_changes(roof, roof_plan)
 
-                # change floor level
-                cur_floor.set_level(cur_level + 1)
+        building.set_roof(self._get_roof_of_plan(roof_plan, element_objects))
 
-                # remove floor from current level
-                building.remove_floor(cur_level)
+    def _can_regenerate(self, part=Floor()):
+        if part.get_layout() is None:
+            return False
 
-                # add floor again
-                building.add_floor(cur_floor)
+        for element in part.get_elements():
+            if element.get_blueprint() is None:
+                return False
 
-        # adjust level down
-        elif adjust_level == 2:
-            for cur_level in range(start_level, end_level + 1):
-                # get the current floor
-                cur_floor = building.get_floor_at_level(cur_level)
+        return True
 
-                # change floor level
-                cur_floor.set_level(cur_level - 1)
+    # applies the differences between the elements of a floor or roof and a plan, returns the objects of the planned elements
+    def _apply_plan_changes(self, part=Floor(), part_plan=FloorPlan()):
+        # current elements by slot
+        existing = {}
+        for element in part.get_elements():
+            existing[element.get_slot()] = element
 
-                # remove floor from current level
-                building.remove_floor(cur_level)
+        layout_changed = list(part.get_layout()) != list(part_plan.layout)
 
-                # add floor again
-                building.add_floor(cur_floor)
-    # endregion
-
-    # region Helper
-    def _get_offset(self, unit=1):
-        return unit * 0.5
-
-    def _remove_duplicates(self, template=BuildingTemplate()):
-        if mc.objExists(building_root_format.format(template.id)):
-            mc.delete(building_root_format.format(template.id))
+        result = []
+        to_create = []
+        to_move = []
+        to_destroy = []
 
-    def _get_y_angle_of_side(self, side=kFront):
-        if side == kFront:
-            return 0
-        if side == kBack:
-            return 180
-        if side == kLeft:
-            return 90
-        if side == kRight:
-            return -90
-
-    def _get_length_of_side(self, template=BaseTemplate(), side=kFront):
-        if side == kLeft or side == kRight:
-            return template.depth
-        else:
-            return template.width
+        for element_plan in part_plan.elements:
+            element = existing.pop(element_plan.get_slot(), None)
 
-    def _get_corner_face_width(self, corner_index=0):
-        if corner_index == 1 or corner_index == 3:
-            return -1
-        return 1
+            # keep element with the same blueprint
+            if element is not None and element.get_blueprint() == element_plan.blueprint:
+                result.append(element.get_object())
+                if layout_changed:
+                    to_move.append((element.get_object(), element_plan))
+                continue
 
-    def _get_corner_face_depth(self, corner_index=0):
-        if corner_index == 2 or corner_index == 1:
-            return -1
-        return 1
+            # swap or create
+            if element is not None:
+                to_destroy.append(element)
+            to_create.append(element_plan)
+            result.append(None)
 
-    def _position_is_cornder_or_edge(self, template=BaseTemplate(), position_x=0, position_y=0):
-        if position_x == 0 or position_y == 0 or position_x == template.width - 1 or position_y == template.depth - 1:
-            return True
+        # elements of slots which do not exist anymore
+        to_destroy.extend(existing.values())
 
-        return False
+        # destroy first, so the names can be used by the new elements
+        self._context.part_started(part_plan.object, len(to_create))
+        for element in to_destroy:
+            element.destroy()
 
-    def _get_level_height(self, building=Building(), building_template=BuildingTemplate(), level=0):
-        height = 0
+        if len(to_create) > 0:
+            created = iter(self._applier.apply(part_plan.get_partial_plan(to_create), self._duplication_mode,
+                                               self._context.element_created))
+            result = [element_object if element_object is not None else created.next() for element_object in result]
 
-        for i in range(level):
-            floor = building.get_floor_at_level(i)
-            template_id = floor.get_template_id()
-            floor_template = building_template.get_floor_template(template_id)
-            height += floor_template.unit[1]
+        if len(to_move) > 0:
+            self._applier.move_elements([element_object for element_object, element_plan in to_move],
+                                        [element_plan for element_object, element_plan in to_move])
 
-        return height
+        return result
     # endregion
 
-    # region Formatting
-    def _get_floors_root(self, building=Building()):
-        root = floors_root_format.format(building.get_object())
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, building.get_object())
-
-        return root
-
-    def _get_floor_root(self, building=Building(), building_template=BuildingTemplate(), level=0):
-        root = floor_format.format(building.get_object(), str(uuid.uuid4()).replace("-", "_"))
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, self._get_floors_root(building))
-
-            pos = self._get_level_height(building, building_template, level)
-            mc.setAttr(root + '.translate', 0, pos, 0)
-
-        return root
-
-    def _get_floor_wall_root(self, floor=Floor(), side=kFront):
-        root = floor_walls_root_format.format(floor.get_object(), side_names[side])
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, floor.get_object())
+    # region Floor Modifications
+    # queues changes of the floor stack which are applied at once with commit()
+    def begin_floor_transaction(self, building=Building(), building_template=BuildingTemplate()):
+        return FloorTransaction(self, building, building_template)
 
-        return root
+    @generator_operation
+    def swap_floors(self, building=Building(), building_template=BuildingTemplate(), level_1=0, level_2=1):
+        # heights of the floors before swapping
+        height_1 = building.get_floor_height(level_1, building_template)
+        height_2 = building.get_floor_height(level_2, building_template)
 
-    def _get_floor_corner_root(self, floor=Floor()):
-        root = floor_corner_root_format.format(floor.get_object())
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, floor.get_object())
+        # switch floor levels
+        building.swap_floors(level_1, level_2)
 
-        return root
+        # swap positions
+        building.get_floor_at_level(level_1).set_position((0, self._get_level_height(building, building_template, level_1), 0))
+        building.get_floor_at_level(level_2).set_position((0, self._get_level_height(building, building_template, level_2), 0))
 
-    def _get_roof_root(self, building=Building(), building_template=BuildingTemplate()):
-        root = roof_root_format.format(building.get_object())
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, building.get_object())
+        # adjust floors in between
+        if len(range(level_1, level_2)) > 1:
+            direction = (0, height_2 - height_1, 0)
+            building.move_floors(level_1 + 1, level_2 - 1, direction)
 
-            pos = self._get_level_height(building, building_template, building.get_floor_count())
-            mc.setAttr(root + '.translate', 0, pos, 0)
+    @generator_operation
+    def destroy_floor(self, building=Building(), building_template=BuildingTemplate(), level=0):
+        # get floor to destroy
+        floor_to_destroy = building.get_floor_at_level(level)
 
-        return root
+        # get the offset y of the floor
+        offset_y = building.get_floor_height(level, building_template)
 
-    def _get_roof_tile_root(self, roof=Roof()):
-        root = roof_tiles_root_format.format(roof.get_object())
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, roof.get_object())
+        # remove and destroy the floor
+        building.remove_floor(level)
+        floor_to_destroy.destroy()
 
-        return root
+        # adjust all following floors and the roof
+        building.move_floors(level + 1, building.get_floor_count(), (0, -offset_y, 0), -1, True)
 
-    def _get_roof_corner_root(self, roof=Roof(), side=kFront):
-        root = roof_corners_root_format.format(roof.get_object(), side_names[side])
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, roof.get_object())
+    @generator_operation
+    def insert_floor(self, building=Building(), building_template=BuildingTemplate(), floor_template=FloorTemplate(), level=0):
+        # no floor to move up?
+        if level > building.get_floor_count() - 1:
+            self.create_floor(building, building_template, floor_template, level)
+            return
 
-        return root
+        # offset of new floor
+        offset_y = floor_template.unit[1]
 
-    def _get_roof_edge_root(self, roof=Roof(), side=kFront):
-        root = roof_edges_root_format.format(roof.get_object(), side_names[side])
-        if not mc.objExists(root):
-            mc.createNode('transform', name=root)
-            mc.parent(root, roof.get_object())
+        # move floors and roof up
+        building.move_floors(level, building.get_floor_count() - 1, (0, offset_y, 0), 1, True)
 
-        return root
+        # create new floor
+        floor_plan = self.plan_floor(building, building_template, floor_template, level)
+        building.add_floor(self._create_floor_from_plan(floor_plan))
     # endregion
 
+    # region Helper
+    def _remove_duplicates(self, template=BuildingTemplate()):
+        if mc.objExists(building_root_format.format(template.id)):
+            mc.delete(building_root_format.format(template.id))
 
-
-
-
+    def _get_level_height(self, building=Building(), building_template=BuildingTemplate(), level=0):
+        return self._planner.get_level_height(building, building_template, level)
+    # endregion
@@ -0,0 +1,360 @@
+import hashlib
+import random
+import sys
+import uuid
+from models.Plans import *
+from models.Building import *
+from models.BuildingSpec import *
+
+
+# Planner for floors and roofs
+# Decides which blueprint is placed where, without touching the scene
+class BuildingPlanner:
+
+    # region Plan Buildings
+    # plans all floors and the roof of a building spec, all random decisions are derived from the seed
+    # floor_templates and roof_templates are the valid templates to choose from for random templates
+    def plan_building(self, spec=BuildingSpec(), seed=0, floor_templates=[], roof_templates=[]):
+        building_template = spec.template
+
+        # model of the building to keep track of the level heights, it does not exist in the scene yet
+        building = Building(building_root_format.format(spec.id), building_template.id)
+        building_plan = BuildingPlan(spec.id, building_template.id, spec.position, seed)
+
+        # floors
+        for level in range(spec.get_floor_count()):
+            if spec.floor_templates == kRandomTemplate:
+                floor_template = floor_templates[self._get_keyed_random(len(floor_templates) - 1, seed, "floor_template", level)]
+            else:
+                floor_template = building_template.get_floor_template(spec.floor_templates[level])
+
+            # the building is new, so the floors can be named by their level
+            floor_root = floor_format.format(building.get_object(), level)
+            floor_seed = self._get_keyed_random(sys.maxint, seed, "floor", level)
+            floor_plan = self.plan_floor(building, building_template, floor_template, level, floor_seed,
+                                         spec.position, floor_root)
+
+            building_plan.add_floor_plan(floor_plan)
+            building.add_floor(Floor(floor_plan.object, level, floor_plan.template_id, floor_plan.seed, floor_plan.height))
+
+        # roof
+        if spec.roof_template == kRandomTemplate:
+            roof_template = roof_templates[self._get_keyed_random(len(roof_templates) - 1, seed, "roof_template")]
+        else:
+            roof_template = building_template.get_roof_template(spec.roof_template)
+
+        roof_seed = self._get_keyed_random(sys.maxint, seed, "roof")
+        building_plan.set_roof_plan(self.plan_roof(building, building_template, roof_template, roof_seed,
+                                                   spec.position))
+
+        return building_plan
+    # endregion
+
+    # region Plan Floors
+    def plan_floor(self, building=None, building_template=BuildingTemplate(), floor_template=FloorTemplate(), level=0,
+                   seed=None, building_position=(0, 0, 0), floor_root=None):
+        # set seed
+        if seed is None:
+            seed = random.randint(0, sys.maxint)
+
+        # name of the floor root
+        if floor_root is None:
+            floor_root = floor_format.format(building.get_object(), str(uuid.uuid4()).replace("-", "_"))
+
+        floor_plan = FloorPlan(floor_root, level, floor_template.id, seed, floor_template.unit[1])
+        level_height = self.get_level_height(building, building_template, level)
+        floor_plan.layout = self._get_layout(floor_template, level_height, building_position)
+
+        # floor roots
+        floors_root = floors_root_format.format(building.get_object())
+        floor_plan.add_group(GroupPlan(floors_root, building.get_object()))
+        floor_plan.add_group(GroupPlan(floor_root, floors_root, (0, level_height, 0)))
+
+        # walls and corners
+        for side in [kFront, kBack, kLeft, kRight]:
+            self._plan_floor_walls_for_side(side, building, floor_plan, floor_template, level_height, building_position)
+        self._plan_floor_corners(building, floor_plan, floor_template, level_height, building_position)
+
+        return floor_plan
+
+    def _plan_floor_walls_for_side(self, side, building=None, floor_plan=FloorPlan(), floor_template=FloorTemplate(),
+                                   level_height=0, building_position=(0, 0, 0)):
+        # calculate origin parameters
+        start_x = floor_template.width * 0.5 * floor_template.unit[0] - self._get_offset(floor_template.unit[0])
+        start_z = floor_template.depth * 0.5 * floor_template.unit[2] - self._get_offset(floor_template.unit[2])
+        length = self._get_length_of_side(floor_template, side)
+
+        # root of the walls
+        wall_root = floor_walls_root_format.format(floor_plan.object, side_names[side])
+
+        # plan floor walls
+        for i in range(length):
+            # skip corners
+            if floor_template.corners:
+                if i == 0 or i == length - 1:
+                    continue
+
+            # choose random wall
+            wall_index = self._get_keyed_random(len(floor_template.walls) - 1, floor_plan.seed, "wall", side, i)
+
+            # set position and rotation
+            wall_position = [0, level_height + self._get_offset(floor_template.unit[1]), 0]
+            wall_rotation = (0, self._get_y_angle_of_side(side), 0)
+
+            if side == kFront:
+                wall_position[0] = start_x - i * floor_template.unit[0]
+                wall_position[2] = floor_template.depth * self._get_offset(floor_template.unit[2])
+            if side == kBack:
+                wall_position[0] = start_x - i * floor_template.unit[0]
+                wall_position[2] = -floor_template.depth * self._get_offset(floor_template.unit[2])
+            if side == kLeft:
+                wall_position[0] = floor_template.width * self._get_offset(floor_template.unit[0])
+                wall_position[2] = start_z - i * floor_template.unit[2]
+            if side == kRight:
+                wall_position[0] = -floor_template.width * self._get_offset(floor_template.unit[0])
+                wall_position[2] = start_z - i * floor_template.unit[2]
+
+            # add building offset
+            wall_position = self._add_offset(wall_position, building_position)
+
+            # add root of the side
+            if not floor_plan.has_group(wall_root):
+                floor_plan.add_group(GroupPlan(wall_root, floor_plan.object))
+
+            # add wall to the plan
+            wall_name = floor_wall_format.format(building.get_object(), str(floor_plan.level), side_names[side], i)
+            floor_plan.add_element(ElementPlan(kWallElement, floor_template.walls[wall_index], wall_name,
+                                               wall_position, wall_rotation, wall_root, side, None, i))
+
+    def _plan_floor_corners(self, building=None, floor_plan=FloorPlan(), floor_template=FloorTemplate(),
+                            level_height=0, building_position=(0, 0, 0)):
+        # root of the corners
+        corner_root = floor_corner_root_format.format(floor_plan.object)
+        floor_plan.add_group(GroupPlan(corner_root, floor_plan.object))
+
+        # plan corners
+        for i in range(4):
+            # choose corner for individual side
+            corner_index = i
+            if corner_index > len(floor_template.corners) - 1:
+                corner_index = len(floor_template.corners) - 1
+
+            # get parameters for face direction
+            face_width = self._get_corner_face_width(i)
+            face_depth = self._get_corner_face_depth(i)
+
+            # set position and rotation of the corner
+            corner_position = [floor_template.width * self._get_offset(floor_template.unit[0]) * face_width,
+                               level_height + self._get_offset(floor_template.unit[1]),
+                               floor_template.depth * self._get_offset(floor_template.unit[2]) * face_depth]
+            corner_rotation = (0, self._get_y_angle_of_side(i), 0)
+
+            # add building offset
+            corner_position = self._add_offset(corner_position, building_position)
+
+            # add corner to the plan
+            corner_name = floor_corner_format.format(building.get_object(), str(floor_plan.level), side_names[i])
+            floor_plan.add_element(ElementPlan(kCornerElement, floor_template.corners[corner_index], corner_name,
+                                               corner_position, corner_rotation, corner_root, i))
+    # endregion
+
+    # region Plan Roof
+    def plan_roof(self, building=None, building_template=BuildingTemplate(), roof_template=RoofTemplate(), seed=None,
+                  building_position=(0, 0, 0)):
+        # set seed
+        if seed is None:
+            seed = random.randint(0, sys.maxint)
+
+        # roof root
+        roof_root = roof_root_format.format(building.get_object())
+        roof_plan = RoofPlan(roof_root, roof_template.id, seed)
+        level_height = self.get_level_height(building, building_template, building.get_floor_count())
+        roof_plan.layout = self._get_layout(roof_template, level_height, building_position)
+
+        roof_plan.add_group(GroupPlan(roof_root, building.get_object(), (0, level_height, 0)))
+
+        # roof parts
+        self._plan_roof_tiles(building, roof_plan, roof_template, level_height, building_position)
+        for side in [kFront, kBack, kLeft, kRight]:
+            self._plan_roof_edges_for_side(side, building, roof_plan, roof_template, level_height, building_position)
+        self._plan_roof_corners(building, roof_plan, roof_template, level_height, building_position)
+
+        return roof_plan
+
+    def _plan_roof_tiles(self, building=None, roof_plan=RoofPlan(), roof_template=RoofTemplate(), level_height=0,
+                         building_position=(0, 0, 0)):
+        # calculate start paremeters
+        start_x = roof_template.width * 0.5 * roof_template.unit[0] - self._get_offset(roof_template.unit[0])
+        start_z = roof_template.depth * 0.5 * roof_template.unit[2] - self._get_offset(roof_template.unit[2])
+
+        # root of the tiles
+        tile_root = roof_tiles_root_format.format(roof_plan.object)
+
+        # plan tiles
+        for x in range(roof_template.width):
+            for y in range(roof_template.depth):
+                # skip corners
+                if self._position_is_cornder_or_edge(roof_template, x, y):
+                    continue
+
+                # get random tile
+                tile_index = self._get_keyed_random(len(roof_template.tiles) - 1, roof_plan.seed, "tile", x, y)
+
+                # calculate position
+                tile_position = [start_x - x * roof_template.unit[0],
+                                 level_height,
+                                 start_z - y * roof_template.unit[2]]
+
+                # add building offset
+                tile_position = self._add_offset(tile_position, building_position)
+
+                # add root of the tiles
+                if not roof_plan.has_group(tile_root):
+                    roof_plan.add_group(GroupPlan(tile_root, roof_plan.object))
+
+                # add tile to the plan, tiles keep the rotation of their blueprint
+                tile_name = roof_tile_format.format(building.get_object(), str(x), str(y))
+                roof_plan.add_element(ElementPlan(kTileElement, roof_template.tiles[tile_index], tile_name,
+                                                  tile_position, None, tile_root, kFront, (x, y)))
+
+    def _plan_roof_edges_for_side(self, side, building=None, roof_plan=RoofPlan(), roof_template=RoofTemplate(),
+                                  level_height=0, building_position=(0, 0, 0)):
+        # calculate start parameters
+        start_x = roof_template.width * 0.5 * roof_template.unit[0] - self._get_offset(roof_template.unit[0])
+        start_z = roof_template.depth * 0.5 * roof_template.unit[2] - self._get_offset(roof_template.unit[2])
+        length = self._get_length_of_side(roof_template, side)
+
+        # root of the edges
+        edge_root = roof_edges_root_format.format(roof_plan.object, side_names[side])
+
+        for i in range(length):
+            # skip corners
+            if roof_template.corners:
+                if i == 0 or i == length - 1:
+                    continue
+
+            # choose random edge
+            edge_index = self._get_keyed_random(len(roof_template.edges) - 1, roof_plan.seed, "edge", side, i)
+
+            # set position and rotation
+            edge_position = [0, level_height, 0]
+            edge_rotation = (0, self._get_y_angle_of_side(side), 0)
+
+            if side == kFront:
+                edge_position[0] = start_x - i * roof_template.unit[0]
+                edge_position[2] = (roof_template.depth * self._get_offset(roof_template.unit[2])) - self._get_offset(roof_template.unit[2])
+            if side == kBack:
+                edge_position[0] = start_x - i * roof_template.unit[0]
+                edge_position[2] = (-roof_template.depth * self._get_offset(roof_template.unit[2])) + self._get_offset(roof_template.unit[2])
+            if side == kLeft:
+                edge_position[0] = (roof_template.width * self._get_offset(roof_template.unit[0])) - self._get_offset(roof_template.unit[0])
+                edge_position[2] = start_z - i * roof_template.unit[2]
+            if side == kRight:
+                edge_position[0] = (-roof_template.width * self._get_offset(roof_template.unit[0])) + self._get_offset(roof_template.unit[0])
+                edge_position[2] = start_z - i * roof_template.unit[2]
+
+            # add building offset
+            edge_position = self._add_offset(edge_position, building_position)
+
+            # add root of the side
+            if not roof_plan.has_group(edge_root):
+                roof_plan.add_group(GroupPlan(edge_root, roof_plan.object))
+
+            # add edge to the plan
+            edge_name = roof_edge_format.format(building.get_object(), side, str(i))
+            roof_plan.add_element(ElementPlan(kEdgeElement, roof_template.edges[edge_index], edge_name,
+                                              edge_position, edge_rotation, edge_root, side, None, i))
+
+    def _plan_roof_corners(self, building=None, roof_plan=RoofPlan(), roof_template=RoofTemplate(), level_height=0,
+                           building_position=(0, 0, 0)):
+        # root of the corners
+        corner_root = roof_corners_root_format.format(roof_plan.object)
+        roof_plan.add_group(GroupPlan(corner_root, roof_plan.object))
+
+        for i in range(4):
+            # choose corner for individual side
+            corner_index = i
+            if corner_index > len(roof_template.corners) - 1:
+                corner_index = len(roof_template.corners) - 1
+
+            # get parameters for face direction
+            face_width = self._get_corner_face_width(i)
+            face_depth = self._get_corner_face_depth(i)
+
+            offset_width = self._get_offset(roof_template.unit[0]) * face_width
+            offset_depth = self._get_offset(roof_template.unit[2]) * face_depth
+
+            # set position and rotation of the corner
+            corner_position = [(roof_template.width * offset_width) - offset_width,
+                               level_height,
+                               (roof_template.depth * offset_depth) - offset_depth]
+            corner_rotation = (0, self._get_y_angle_of_side(i), 0)
+
+            # add building offset
+            corner_position = self._add_offset(corner_position, building_position)
+
+            # add corner to the plan
+            corner_name = roof_corner_format.format(building.get_object(), side_names[i])
+            roof_plan.add_element(ElementPlan(kCornerElement, roof_template.corners[corner_index], corner_name,
+                                              corner_position, corner_rotation, corner_root, i))
+    # endregion
+
+    # region Helper
+    def get_level_height(self, building=None, building_template=BuildingTemplate(), level=0):
+        return building.get_level_height(level, building_template)
+
+    # stateless random number between 0 and maximum for a key (seed, kind of choice, slot...)
+    # each slot gets its own choice, independent of the size of the template and the other slots
+    # the level is not part of the keys of floors, so a floor keeps its look when it is moved
+    def _get_keyed_random(self, maximum=0, *key):
+        digest = hashlib.md5("_".join([str(part) for part in key])).hexdigest()
+        return int(digest[:15], 16) % (maximum + 1)
+
+    def _get_layout(self, template=BaseTemplate(), level_height=0, building_position=(0, 0, 0)):
+        return list(template.unit) + [template.width, template.depth, level_height] + list(building_position)
+
+    def _add_offset(self, position=(0, 0, 0), offset=(0, 0, 0)):
+        return (position[0] + offset[0],
+                position[1] + offset[1],
+                position[2] + offset[2])
+
+    def _get_offset(self, unit=1):
+        return unit * 0.5
+
+    def _get_y_angle_of_side(self, side=kFront):
+        if side == kFront:
+            return 0
+        if side == kBack:
+            return 180
+        if side == kLeft:
+            return 90
+        if side == kRight:
+            return -90
+
+    def _get_length_of_side(self, template=BaseTemplate(), side=kFront):
+        if side == kLeft or side == kRight:
+            return template.depth
+        else:
+            return template.width
+
+    def _get_corner_face_width(self, corner_index=0):
+        if corner_index == 1 or corner_index == 3:
+            return -1
+        return 1
+
+    def _get_corner_face_depth(self, corner_index=0):
+        if corner_index == 2 or corner_index == 1:
+            return -1
+        return 1
+
+    def _position_is_cornder_or_edge(self, template=BaseTemplate(), position_x=0, position_y=0):
+        if position_x == 0 or position_y == 0 or position_x == template.width - 1 or position_y == template.depth - 1:
+            return True
+
+        return False
+    # endregion
+
+
+# plans a building in a worker process, arguments are (spec, seed, floor templates, roof templates)
+def plan_building_task(arguments=()):
+    return BuildingPlanner().plan_building(*arguments)
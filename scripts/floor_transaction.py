@@ -0,0 +1,139 @@
+import sys
+import maya.cmds as mc
+from models.Building import *
+from models.Templates import *
+from generation_context import *
+
+
+# a floor of the stack of a transaction, either an existing floor or a new one
+class _StackEntry:
+    def __init__(self, floor=None, template=None, seed=None):
+        self.floor = floor
+        self.template = template
+        self.seed = seed
+
+
+# Transaction for changing the floor stack of a building
+# Inserts, deletes, moves and template changes are queued (levels refer to the stack after the queued changes)
+# and applied at once by commit(): floors are destroyed, moved with one relative move per distance,
+# renumbered in one pass and new floors are created on their final level
+# a commit which fails is rolled back like a cancelled one before the error is raised
+class FloorTransaction:
+
+    def __init__(self, generator=None, building=Building(), building_template=BuildingTemplate()):
+        self._generator = generator
+        self._building = building
+        self._building_template = building_template
+
+        # current order of the floors
+        self._stack = [_StackEntry(building.get_floor_at_level(level)) for level in range(building.get_floor_count())]
+        self._destroyed = []
+
+        # error of the last commit, raised after the roll back
+        self._error = None
+
+    def get_floor_count(self):
+        return len(self._stack)
+
+    def insert_floor(self, level=0, floor_template=FloorTemplate(), seed=None):
+        self._stack.insert(level, _StackEntry(None, floor_template, seed))
+
+    def delete_floor(self, level=0):
+        entry = self._stack.pop(level)
+        if entry.floor is not None:
+            self._destroyed.append(entry.floor)
+
+    def move_floor(self, level=0, new_level=1):
+        self._stack.insert(new_level, self._stack.pop(level))
+
+    # changes the template of a floor, the floor is regenerated with the seed
+    def set_floor_template(self, level=0, floor_template=FloorTemplate(), seed=None):
+        entry = self._stack[level]
+        entry.template = floor_template
+        entry.seed = seed
+
+    # applies the queued changes as one operation of the generator, returns False if it has been cancelled
+    def commit(self):
+        building = self._building
+        self._error = None
+        self._generator.get_context().run("floor_transaction", building, self._apply)
+
+        # the transaction can be used again
+        self._stack = [_StackEntry(building.get_floor_at_level(level)) for level in range(building.get_floor_count())]
+        self._destroyed = []
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error[0], error[1], error[2]
+
+        return not self._generator.get_context().was_cancelled()
+
+    def _apply(self):
+        try:
+            self._apply_changes()
+        except GenerationCancelled:
+            raise
+        except Exception:
+            # roll back the changes made so far
+            self._error = sys.exc_info()
+            raise GenerationCancelled()
+
+    def _apply_changes(self):
+        building = self._building
+        building_template = self._building_template
+
+        # heights before the changes
+        old_heights = {}
+        for entry in self._stack:
+            if entry.floor is not None:
+                old_heights[entry.floor] = building.get_level_height(entry.floor.get_level(), building_template)
+        old_roof_height = building.get_level_height(building.get_floor_count(), building_template)
+
+        # floors with a template of another height are recreated
+        for entry in self._stack:
+            if entry.floor is not None and entry.template is not None \
+                    and entry.template.unit[1] != building.get_floor_height(entry.floor.get_level(), building_template):
+                self._destroyed.append(entry.floor)
+                entry.floor = None
+
+        # destroy
+        for floor in self._destroyed:
+            floor.destroy()
+
+        # group the remaining floors and the roof by the distance they have to move
+        moves = {}
+        kept_floors = {}
+        level_height = 0
+        for level in range(len(self._stack)):
+            entry = self._stack[level]
+
+            if entry.floor is not None:
+                kept_floors[level] = entry.floor
+                moves.setdefault(level_height - old_heights[entry.floor], []).append(entry.floor.get_object())
+                level_height += building.get_floor_height(entry.floor.get_level(), building_template)
+            else:
+                level_height += entry.template.unit[1]
+
+        if building.get_roof() is not None:
+            moves.setdefault(level_height - old_roof_height, []).append(building.get_roof().get_object())
+
+        # move
+        for distance in moves.keys():
+            if distance != 0:
+                mc.move(0, distance, 0, moves[distance], relative=True, localSpace=True)
+
+        # new levels
+        building.set_floors(kept_floors)
+
+        # create new floors from the bottom up, so the heights below are known
+        for level in range(len(self._stack)):
+            entry = self._stack[level]
+            if entry.floor is None:
+                floor_plan = self._generator.plan_floor(building, building_template, entry.template, level, entry.seed)
+                self._generator.apply_floor_plan(building, floor_plan)
+
+        # regenerate floors with a new template
+        for level in range(len(self._stack)):
+            entry = self._stack[level]
+            if entry.floor is not None and entry.template is not None:
+                self._generator.regenerate_floor(building, building_template, entry.template, level, entry.seed)
@@ -0,0 +1,350 @@
+from functools import wraps
+import maya.cmds as mc
+from models.Building import *
+from undo_recorder import *
+
+# the api is optional, without it only the created buildings are known to the roll back
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+
+# raised between two elements when the running operation has been cancelled
+class GenerationCancelled(Exception):
+    pass
+
+
+# reports the progress of the operations of a generator, the base class reports nothing
+# part() is called before a floor or roof is created, element() after each of its elements
+# the operation is cancelled at the next element when is_cancelled() returns True
+class ProgressReporter(object):
+
+    def begin(self, operation="operation"):
+        pass
+
+    def part(self, part="floor", element_count=0):
+        pass
+
+    def element(self):
+        pass
+
+    def end(self, cancelled=False):
+        pass
+
+    def is_cancelled(self):
+        return False
+
+
+# prints the parts, e.g. for the batch generation
+class ConsoleProgressReporter(ProgressReporter):
+
+    def __init__(self):
+        self._operation = None
+
+    def begin(self, operation="operation"):
+        self._operation = operation
+
+    def part(self, part="floor", element_count=0):
+        print "{}: {} ({} elements)".format(self._operation, part, element_count)
+
+    def end(self, cancelled=False):
+        if cancelled:
+            print "{}: cancelled".format(self._operation)
+
+
+# shows the progress in the main progress bar of maya, the operation is cancelled with escape
+# the bar is only updated every interval elements, since every update is a command
+class MainProgressBarReporter(ProgressReporter):
+
+    def __init__(self, interval=10):
+        self._interval = interval
+        self._progress_bar = None
+        self._element_count = 0
+        self._cancelled = False
+
+    def begin(self, operation="operation"):
+        import maya.mel as mel
+        self._progress_bar = mel.eval("$tmp = $gMainProgressBar")
+        self._cancelled = False
+
+        mc.progressBar(self._progress_bar, edit=True, beginProgress=True, isInterruptable=True, status=operation)
+
+    def part(self, part="floor", element_count=0):
+        self._element_count = 0
+        mc.progressBar(self._progress_bar, edit=True, status="Creating " + part, progress=0, maxValue=max(element_count, 1))
+        self._cancelled = mc.progressBar(self._progress_bar, query=True, isCancelled=True)
+
+    def element(self):
+        self._element_count += 1
+        if self._element_count % self._interval != 0:
+            return
+
+        mc.progressBar(self._progress_bar, edit=True, step=self._interval)
+        self._cancelled = mc.progressBar(self._progress_bar, query=True, isCancelled=True)
+
+    def end(self, cancelled=False):
+        mc.progressBar(self._progress_bar, edit=True, endProgress=True)
+
+    def is_cancelled(self):
+        return self._cancelled
+
+
+# records the reported progress, cancels after cancel_after elements if it is given
+class RecordingProgressReporter(ProgressReporter):
+
+    def __init__(self, cancel_after=None):
+        self.records = []
+        self._cancel_after = cancel_after
+        self._element_count = 0
+
+    def begin(self, operation="operation"):
+        self.records.append(("begin", operation))
+
+    def part(self, part="floor", element_count=0):
+        self.records.append(("part", part, element_count))
+
+    def element(self):
+        self._element_count += 1
+        self.records.append(("element",))
+
+    def end(self, cancelled=False):
+        self.records.append(("end", cancelled))
+
+    def is_cancelled(self):
+        return self._cancel_after is not None and self._element_count >= self._cancel_after
+
+    def get_element_count(self):
+        return self._element_count
+
+
+# context of the operations of a generator
+# the outermost operation is recorded as one undo chunk, suspends the refresh of the viewport and reports its progress
+# a cancelled operation is rolled back: its undo chunk is undone and the building is restored to its previous state
+# if the operation is not recorded by undo, the nodes it created are tracked and deleted instead (without the api only
+# the created buildings), other changes of existing buildings can not be rolled back
+class GenerationContext:
+
+    def __init__(self, undo_recorder=None, reporter=None, suspend_refresh=True):
+        if undo_recorder is None:
+            undo_recorder = UndoRecorder()
+        if reporter is None:
+            reporter = ProgressReporter()
+
+        self._undo_recorder = undo_recorder
+        self._reporter = reporter
+        self._suspend_refresh = suspend_refresh
+
+        # nesting of the running operations
+        self._depth = 0
+        self._cancel_requested = False
+        self._cancelled = False
+        self._refresh_suspended = False
+        self._rolling_back = False
+
+        # state of the changed building and the roots of the created buildings, for the roll back
+        self._building = None
+        self._building_state = None
+        self._created_buildings = []
+
+        # handles of the nodes created by an operation which is not recorded by undo
+        self._recorded = False
+        self._created_nodes = []
+        self._node_callback_id = None
+
+    def get_undo_recorder(self):
+        return self._undo_recorder
+
+    def get_reporter(self):
+        return self._reporter
+
+    def set_reporter(self, reporter=ProgressReporter()):
+        self._reporter = reporter
+
+    def set_suspend_refresh(self, suspend_refresh=True):
+        self._suspend_refresh = suspend_refresh
+
+    def is_running(self):
+        return self._depth > 0
+
+    # cancels the running operation at the next element
+    def cancel(self):
+        self._cancel_requested = True
+
+    # whether the last operation has been cancelled
+    def was_cancelled(self):
+        return self._cancelled
+
+    # whether a cancelled operation is being undone
+    def is_rolling_back(self):
+        return self._rolling_back
+
+    # region Operations
+    # runs the function as one operation, a cancelled operation is rolled back and returns None
+    def run(self, operation="operation", building=None, function=None, *args, **kwargs):
+        self.begin(operation, building)
+
+        cancelled = False
+        try:
+            return function(*args, **kwargs)
+        except GenerationCancelled:
+            cancelled = True
+
+            # only the outermost operation stops the cancellation
+            if self._depth > 1:
+                raise
+        finally:
+            self.end(cancelled)
+
+    # if the outermost operation fails to begin, its completed steps are reverted before the error is raised
+    def begin(self, operation="operation", building=None):
+        if self._depth == 0:
+            self._undo_recorder.begin(operation)
+
+            started = False
+            try:
+                self._cancel_requested = False
+                self._cancelled = False
+                self._building = building
+                self._building_state = building.get_state() if building is not None else None
+                self._created_buildings = []
+
+                self._recorded = self._undo_recorder.is_recording()
+                self._created_nodes = []
+                if not self._recorded and om is not None:
+                    self._node_callback_id = om.MDGMessage.addNodeAddedCallback(self._node_added, "dependNode")
+
+                if self._suspend_refresh and can_suspend_refresh():
+                    mc.refresh(suspend=True)
+                    self._refresh_suspended = True
+
+                self._reporter.begin(operation)
+                started = True
+            finally:
+                if not started:
+                    self._abort_begin()
+
+        self._depth += 1
+
+    def _abort_begin(self):
+        self._remove_node_callback()
+
+        try:
+            if self._refresh_suspended:
+                mc.refresh(suspend=False)
+                self._refresh_suspended = False
+        finally:
+            self._undo_recorder.end()
+
+            self._building = None
+            self._building_state = None
+
+    def end(self, cancelled=False):
+        self._depth -= 1
+        if self._depth > 0:
+            return
+
+        try:
+            self._remove_node_callback()
+
+            # created nodes are deleted before undo recording is restored
+            if cancelled and not self._recorded:
+                self._delete_created_nodes()
+
+            self._undo_recorder.end()
+
+            if cancelled:
+                self._roll_back()
+        finally:
+            if self._refresh_suspended:
+                mc.refresh(suspend=False)
+                self._refresh_suspended = False
+
+            self._cancelled = cancelled
+            self._reporter.end(cancelled)
+
+            self._building = None
+            self._building_state = None
+            self._created_buildings = []
+            self._created_nodes = []
+
+    def _roll_back(self):
+        if self._recorded:
+            # nothing recorded? -> undo would revert the previous operation of the user
+            if self._undo_recorder.get_last_report()["undo_steps"] > 0:
+                self._rolling_back = True
+                try:
+                    mc.undo()
+                finally:
+                    self._rolling_back = False
+        elif self._building is not None:
+            mc.warning("Only the nodes created for building \"{}\" are removed without undo, "
+                       "its other changes can not be rolled back.".format(self._building.get_object()))
+
+        if self._building is not None:
+            self._building.set_state(self._building_state)
+
+    def _delete_created_nodes(self):
+        # without the api only the created buildings are known
+        if om is None:
+            existing = [root for root in self._created_buildings if mc.objExists(root)]
+            if len(existing) > 0:
+                mc.delete(existing)
+            return
+
+        # children before their parents, nodes which have been deleted with others are skipped
+        for handle in reversed(self._created_nodes):
+            if handle.isValid():
+                mc.delete(self._get_node_name(handle.object()))
+
+    @staticmethod
+    def _get_node_name(node=None):
+        if node.hasFn(om.MFn.kDagNode):
+            return om.MDagPath.getAPathTo(node).fullPathName()
+
+        return om.MFnDependencyNode(node).name()
+
+    def _node_added(self, node, client_data=None):
+        self._created_nodes.append(om.MObjectHandle(node))
+
+    def _remove_node_callback(self):
+        if self._node_callback_id is not None:
+            om.MMessage.removeCallback(self._node_callback_id)
+            self._node_callback_id = None
+    # endregion
+
+    # region Progress
+    def part_started(self, part="floor", element_count=0):
+        self._reporter.part(part, element_count)
+        self._check_cancelled()
+
+    def element_created(self, element_object=None):
+        self._reporter.element()
+        self._check_cancelled()
+
+    def building_created(self, building_root="building"):
+        self._created_buildings.append(building_root)
+
+    def _check_cancelled(self):
+        if self._cancel_requested or self._reporter.is_cancelled():
+            raise GenerationCancelled()
+    # endregion
+
+
+# the viewport is only refreshed in interactive sessions, stand-ins for maya.cmds may have neither about nor refresh
+def can_suspend_refresh():
+    return hasattr(mc, "about") and hasattr(mc, "refresh") and not mc.about(batch=True)
+
+
+# runs a method of a class with a _context as one operation named after the method
+# the building of the operation is the argument building (or the first argument), if it is a Building
+def generator_operation(method):
+    @wraps(method)
+    def run_operation(self, *args, **kwargs):
+        building = kwargs.get("building", args[0] if len(args) > 0 else None)
+        if not isinstance(building, Building):
+            building = None
+
+        return self._context.run(method.__name__, building, method, self, *args, **kwargs)
+
+    return run_operation
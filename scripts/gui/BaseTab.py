@@ -12,4 +12,8 @@ class BaseTab(QtWidgets.QWidget):
         self._main_layout.setAlignment(Qt.AlignTop)
         self.setLayout(self._main_layout)
         self._generator = generator
-        self._window = window
\ No newline at end of file
+        self._window = window
+
+    # called when the editor window is closed, the callbacks of the window have already been removed
+    def on_close(self):
+        pass
@@ -1,16 +1,10 @@
-import inspect
-import json
-import os
 import random
-from functools import partial
 from PySide2.QtCore import Qt, Signal
-from PySide2 import QtGui
-from maya.OpenMaya import MEventMessage
 
 from BaseTab import *
-
-# floor types
-floor, highest_floor, lowes_floor, ground, roof = range(5)
+from CallbackManager import callback_manager
+from FloorStackView import *
+from MetadataSaveQueue import MetadataSaveQueue
 
 
 # tab for editing the bulding
@@ -18,14 +12,6 @@ class BuildingEditorTab(BaseTab):
     # sizes
     top_height = 90
 
-    floor_height = 100
-    floor_width = 250
-    floor_spacing = 5
-
-    roof_height = 50
-    ground_height = 100
-    add_button_size = (25, 25)
-
     # currently edited building
     _current_building = None
     _selected_floor_level = None
@@ -44,29 +30,26 @@ class BuildingEditorTab(BaseTab):
         # for helper
         self._helper_layout = None
 
-        # widget for scroll area
-        self._scroll_area = None
-        # layout of scroll area
-        self._scroll_layout = None
-        # widget to be scrolled
-        self._scroll_widget = None
+        # floor stack
+        self._floor_model = None
+        self._floor_delegate = None
+        self._floor_view = None
 
-        # number next to floor
-        self._floor_level_layout = None
-        # floor
-        self._floor_layout = None
-        # buttons to add new floors
-        self._floor_add_btn_layout = None
+        # edits are saved to the meta data of the building deferred
+        self._save_queue = MetadataSaveQueue(context=self._generator.get_context())
+        self._save_queue.add_callbacks()
 
         self._try_load_cur_building()
         self._create_ui()
 
-        # subscribe to event
-        MEventMessage.addEventCallback("SelectionChanged", self._selection_changed)
+        # subscribe to event, removed with the window
+        callback_manager.add_event_callback(self._window, "SelectionChanged", self._selection_changed)
+        callback_manager.add_event_callback(self._window, "Undo", self._undo_redo_called)
+        callback_manager.add_event_callback(self._window, "Redo", self._undo_redo_called)
 
-    def __del__(self):
-        # unsubscribe
-        MEventMessage.removeCallback("SelectionChanged", self._selection_changed)
+    def on_close(self):
+        # write pending edits
+        self._save_queue.close()
 
     # region UI Creation
     def _create_ui(self):
@@ -150,43 +133,19 @@ class BuildingEditorTab(BaseTab):
         layout.addWidget(create_button, 2, 2)
 
     def _create_editor_ui(self):
-        # layout for floor numbers
-        self._floor_level_layout = QtWidgets.QVBoxLayout()
-        self._floor_level_layout.setAlignment(Qt.AlignBottom | Qt.AlignRight)
-        self._floor_level_layout.setSpacing(0)
-        self._floor_level_layout.setMargin(0)
-
-        # layout for floors
-        self._floor_layout = QtWidgets.QVBoxLayout()
-        self._floor_layout.setAlignment(Qt.AlignBottom | Qt.AlignCenter)
-        self._floor_layout.setSpacing(0)
-        self._floor_layout.setMargin(0)
-
-        # layout for floor buttons
-        self._floor_add_btn_layout = QtWidgets.QVBoxLayout()
-        self._floor_add_btn_layout.setAlignment(Qt.AlignBottom | Qt.AlignLeft)
-        self._floor_add_btn_layout.setSpacing(0)
-        self._floor_add_btn_layout.setMargin(0)
-
-        # widget for scroll area
-        self._scroll_area = QtWidgets.QScrollArea()
-        self._scroll_area.setWidgetResizable(True)
-        self._editor_layout.addWidget(self._scroll_area)
-
-        # layout of scroll are
-        self._scroll_layout = QtWidgets.QHBoxLayout()
-
-        # scrollable widget
-        self._scroll_widget = QtWidgets.QWidget()
-        self._scroll_widget.setLayout(self._scroll_layout)
-
-        # add to scroll layout
-        self._scroll_layout.addLayout(self._floor_level_layout)
-        self._scroll_layout.addLayout(self._floor_layout)
-        self._scroll_layout.addLayout(self._floor_add_btn_layout)
-
-        # set scrollable widget to area
-        self._scroll_area.setWidget(self._scroll_widget)
+        # model of the floors, only the visible floors are painted
+        self._floor_model = FloorStackModel()
+        self._floor_delegate = FloorStackDelegate(self._get_valid_templates)
+        self._floor_view = FloorStackView(self._floor_model, self._floor_delegate)
+        self._editor_layout.addWidget(self._floor_view)
+
+        # connect signals
+        self._floor_delegate.on_move_up_pressed.connect(self._move_floor_up)
+        self._floor_delegate.on_recreate_pressed.connect(self._recreate_floor)
+        self._floor_delegate.on_move_down_pressed.connect(self._move_floor_down)
+        self._floor_delegate.on_delete_pressed.connect(self._delete_floor)
+        self._floor_delegate.on_select_pressed.connect(self._select_floor)
+        self._floor_delegate.on_add_pressed.connect(self._add_floor)
 
     def _create_helper_ui(self):
         # refresh button
@@ -205,150 +164,16 @@ class BuildingEditorTab(BaseTab):
     # endregion
 
     # region Editor
+    # shows the current building, starting at the ground floor
     def _refresh_editor(self):
-        self._clear_editor_layout()
-
-        # create floors
-        floor_amount = self._current_building.get_floor_count()
-
-        for i in range(0, floor_amount + 1):
-            # floor
-            if i == floor_amount:
-                self._add_floor_widget(floor_amount - i,
-                                       self._current_building.get_floor_at_level(floor_amount - i).get_template_id(),
-                                       self.ground_height,
-                                       ground,
-                                       floor_amount - i == self._selected_floor_level)
-
-                # number
-                self._add_floor_number(str(floor_amount - i), self.ground_height)
-
-                # empty space
-                self._add_button_spacing(self.ground_height + (self.floor_spacing * 0.75))
-
-            # roof
-            elif i == 0:
-                # widget
-                self._add_floor_widget(floor_amount - i,
-                                       self._current_building.get_roof().get_template_id(),
-                                       self.roof_height,
-                                       roof,
-                                       floor_amount - i == self._selected_floor_level)
-
-                # number
-                self._add_floor_number(str(floor_amount - i), self.roof_height)
-
-                # empty space
-                self._add_button_spacing(self.roof_height + (self.floor_spacing * 0.5))
-
-            # floor
-            else:
-                # widget
-                if i == 1:
-                    floor_type = highest_floor
-                elif i == floor_amount - 1:
-                    floor_type = lowes_floor
-                else:
-                    floor_type = floor
-                self._add_floor_widget(floor_amount - i,
-                                       self._current_building.get_floor_at_level(floor_amount - i).get_template_id(),
-                                       self.floor_height,
-                                       floor_type,
-                                       floor_amount - i == self._selected_floor_level)
-
-                # number
-                self._add_floor_number(str(floor_amount - i), self.floor_height)
-
-                # empty space
-                self._add_button_spacing(self.floor_height + (self.floor_spacing * 0.5))
-
-            # add "add" button
-            if i != floor_amount:
-                self._add_floor_button(floor_amount - i)
-
-    def _clear_editor_layout(self):
-        # clear floors
-        while self._floor_layout.count():
-            child = self._floor_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # clear add buttons
-        while self._floor_add_btn_layout.count():
-            child = self._floor_add_btn_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # clear floor level
-        while self._floor_level_layout.count():
-            child = self._floor_level_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-    def _add_floor_widget(self, level, template_id="my_template", height=100, floor_type=floor, is_selected=False):
-        # roof
-        if floor_type == roof:
-            new_floor = FloorWidget(level,
-                                    self._current_building.get_floor_count(),
-                                    floor_type,
-                                    template_id,
-                                    self._window.user_profile.get_cur_template().get_valid_roof_templates(),
-                                    self.floor_width,
-                                    height,
-                                    self.floor_spacing,
-                                    is_selected)
-        # floor
-        else:
-            new_floor = FloorWidget(level,
-                                    self._current_building.get_floor_count(),
-                                    floor_type,
-                                    template_id,
-                                    self._window.user_profile.get_cur_template().get_valid_floor_templates(),
-                                    self.floor_width,
-                                    height,
-                                    self.floor_spacing,
-                                    is_selected)
-
-        # connect signals
-        new_floor.on_move_up_pressed.connect(self._move_floor_up)
-        new_floor.on_recreate_pressed.connect(self._recreate_floor)
-        new_floor.on_move_down_pressed.connect(self._move_floor_down)
-        new_floor.on_delete_pressed.connect(self._delete_floor)
-        new_floor.on_select_pressed.connect(self._select_floor)
-
-        # add to layout
-        self._floor_layout.addWidget(new_floor)
+        self._floor_model.set_building(self._current_building, self._selected_floor_level)
+        self._floor_view.scrollToBottom()
 
-    def _add_floor_number(self, level, height):
-        # label
-        level = QtWidgets.QLabel(str(level))
-        level.setFixedWidth(20)
-        level.setFixedHeight(height)
-
-        font = QtGui.QFont("Calibri", 12, QtGui.QFont.Bold)
-        level.setFont(font)
-
-        # add to layout
-        self._floor_level_layout.addWidget(level)
-
-    def _add_button_spacing(self, height):
-        space = QtWidgets.QLabel()
-        space.setFixedHeight(height - self.add_button_size[1])
-        self._floor_add_btn_layout.addWidget(space)
-
-    def _add_floor_button(self, level):
-        # create button
-        button = QtWidgets.QPushButton("+")
-        button.setToolTip("Add a new floor with the template of the one below.")
-        button.clicked.connect(partial(self._add_floor, level))
-        button.setFixedSize(self.add_button_size[0], self.add_button_size[1])
-
-        font = QtGui.QFont("Calibri", 15, QtGui.QFont.Bold)
-        button.setFont(font)
-
-        # add to layout
-        self._floor_add_btn_layout.addWidget(button)
+    def _get_valid_templates(self, floor_type=floor):
+        if floor_type == roof:
+            return self._window.user_profile.get_cur_template().get_valid_roof_templates()
 
+        return self._window.user_profile.get_cur_template().get_valid_floor_templates()
     # endregion
 
     # region Signals
@@ -379,7 +204,7 @@ class BuildingEditorTab(BaseTab):
         building_template = self._window.user_profile.get_cur_template()
 
         # create empty building
-        self._current_building = self._generator.create_empty_building(building_id, building_template)
+        self._set_current_building(self._generator.create_empty_building(building_id, building_template))
 
         # set cur building in profile
         self._window.user_profile.set_cur_building(self._current_building.get_object())
@@ -398,6 +223,10 @@ class BuildingEditorTab(BaseTab):
                                              building_template,
                                              random_template,
                                              i)
+
+                # cancelled? -> keep the floors created so far
+                if self._generator.get_context().was_cancelled():
+                    break
         # given floor template
         else:
             for i in range(floor_amount + 1):
@@ -406,6 +235,10 @@ class BuildingEditorTab(BaseTab):
                                              building_template.get_floor_template(floor_template_id),
                                              i)
 
+                # cancelled? -> keep the floors created so far
+                if self._generator.get_context().was_cancelled():
+                    break
+
         # add roof
         # random template?
         if roof_template_id == "":
@@ -424,19 +257,18 @@ class BuildingEditorTab(BaseTab):
 
         # refresh
         self._refresh_editor()
-        self._save_current_building()
 
     def _open_selected_building(self):
+        # meta data has to be up to date
+        self._save_queue.flush()
+
         selections = mc.ls(sl=True)
         for cur_selected in selections:
-            key = Element.get_meta_data_key()
-
-            # has meta data?
-            if mc.attributeQuery(key, node=cur_selected, exists=True):
+            # is it a building?
+            if building_registry.has_building(cur_selected):
                 # deserialize
-                attr_value = mc.getAttr(cur_selected + '.' + key)
-                serializable = json.loads(attr_value)
-                self._current_building = Building.get_from_serializable(serializable)
+                serializable = building_registry.get_metadata(cur_selected)
+                self._set_current_building(Building.get_from_serializable(serializable))
                 self._selected_floor_level = None
 
                 # refresh
@@ -454,13 +286,9 @@ class BuildingEditorTab(BaseTab):
         if self._current_building is None:
             return
 
-        # loop floors
-        for level in range(self._current_building.get_floor_count()):
-            floor_at_level = self._current_building.get_floor_at_level(level)
-            template_id = floor_at_level.get_template_id()
-
-            # recreate with same seed
-            self._recreate_floor(level, floor, template_id, floor_at_level.get_seed())
+        # recreate all floors with the same seed at once
+        if not self._recreate_all_floors(True):
+            return
 
         # recreate roof
         current_roof = self._current_building.get_roof()
@@ -481,13 +309,9 @@ class BuildingEditorTab(BaseTab):
         if result == "Abort":
             return
 
-        # loop floors
-        for level in range(self._current_building.get_floor_count()):
-            floor_at_level = self._current_building.get_floor_at_level(level)
-            template_id = floor_at_level.get_template_id()
-
-            # recreate with random seed
-            self._recreate_floor(level, floor, template_id, None)
+        # recreate all floors with random seeds at once
+        if not self._recreate_all_floors(False):
+            return
 
         # recreate roof
         current_roof = self._current_building.get_roof()
@@ -495,6 +319,19 @@ class BuildingEditorTab(BaseTab):
 
         self._recreate_floor(0, roof, template_id, None)
 
+    # returns False if it has been cancelled
+    def _recreate_all_floors(self, keep_seeds=True):
+        building_template = self._window.user_profile.get_cur_template()
+        transaction = self._generator.begin_floor_transaction(self._current_building, building_template)
+
+        for level in range(self._current_building.get_floor_count()):
+            floor_at_level = self._current_building.get_floor_at_level(level)
+            seed = floor_at_level.get_seed() if keep_seeds else None
+
+            transaction.set_floor_template(level, building_template.get_floor_template(floor_at_level.get_template_id()), seed)
+
+        return transaction.commit()
+
     def _move_floor_up(self, level=0):
         self._generator.swap_floors(self._current_building,
                                     self._window.user_profile.get_cur_template(),
@@ -510,30 +347,25 @@ class BuildingEditorTab(BaseTab):
             self._selected_floor_level -= 1
 
         # refresh
-        self._refresh_editor()
-        self._save_current_building()
+        self._floor_model.set_selected_level(self._selected_floor_level)
 
     def _recreate_floor(self, level=0, floor_type=0, template="my_template", seed=None):
         # block deselection
         self._block_floor_deselection = True
 
-        # recreate roof
+        # recreate roof (only the changed elements are recreated)
         if floor_type is roof:
-            self._generator.create_roof(self._current_building,
-                                        self._window.user_profile.get_cur_template(),
-                                        self._window.user_profile.get_cur_template().get_roof_template(template),
-                                        seed)
+            self._generator.regenerate_roof(self._current_building,
+                                            self._window.user_profile.get_cur_template(),
+                                            self._window.user_profile.get_cur_template().get_roof_template(template),
+                                            seed)
         # recreate floor
         else:
-            self._generator.create_floor(self._current_building,
-                                         self._window.user_profile.get_cur_template(),
-                                         self._window.user_profile.get_cur_template().get_floor_template(template),
-                                         level,
-                                         seed)
-
-        # refresh
-        self._refresh_editor()
-        self._save_current_building()
+            self._generator.regenerate_floor(self._current_building,
+                                             self._window.user_profile.get_cur_template(),
+                                             self._window.user_profile.get_cur_template().get_floor_template(template),
+                                             level,
+                                             seed)
 
         # select again
         if self._selected_floor_level is not None:
@@ -560,8 +392,7 @@ class BuildingEditorTab(BaseTab):
             self._selected_floor_level += 1
 
         # refresh
-        self._refresh_editor()
-        self._save_current_building()
+        self._floor_model.set_selected_level(self._selected_floor_level)
 
     def _add_floor(self, level=0):
         # block deselection
@@ -576,13 +407,10 @@ class BuildingEditorTab(BaseTab):
                                      floor_template,
                                      level)
 
-        # refresh
-        self._refresh_editor()
-        self._save_current_building()
-
         # move selected up?
         if level <= self._selected_floor_level:
             self._selected_floor_level += 1
+            self._floor_model.set_selected_level(self._selected_floor_level)
 
         # select again
         if self._selected_floor_level is not None:
@@ -608,8 +436,7 @@ class BuildingEditorTab(BaseTab):
             self._selected_floor_level -= 1
 
         # refresh
-        self._refresh_editor()
-        self._save_current_building()
+        self._floor_model.set_selected_level(self._selected_floor_level)
 
     def _select_floor(self, level=0, auto_unselect=True):
         # block deselection
@@ -619,7 +446,7 @@ class BuildingEditorTab(BaseTab):
         if auto_unselect and level == self._selected_floor_level:
             mc.select(cl=True)
             self._selected_floor_level = None
-            self._refresh_editor()
+            self._floor_model.set_selected_level(None)
             return
 
         # select roof
@@ -631,7 +458,7 @@ class BuildingEditorTab(BaseTab):
 
         mc.select(floor_root)
         self._selected_floor_level = level
-        self._refresh_editor()
+        self._floor_model.set_selected_level(level)
 
         # unblock deselection
         self._block_floor_deselection = False
@@ -650,278 +477,63 @@ class BuildingEditorTab(BaseTab):
         # nothing selected?
         if len(selections) == 0:
             self._selected_floor_level = None
-            self._refresh_editor()
+            self._floor_model.set_selected_level(None)
             return
 
         # another object selected?
         if selections[0] != self._current_building.get_floor_at_level (self._selected_floor_level).get_object():
             self._selected_floor_level = None
-            self._refresh_editor()
-    # endregion
+            self._floor_model.set_selected_level(None)
 
-    # region Helper
-    def _try_load_cur_building(self):
-        id = self._window.user_profile.get_cur_building()
-        key = Element.get_meta_data_key()
-
-        # add selected
-        all_objects = mc.ls(sl=False)
-        for cur_object in all_objects:
-            if cur_object == id:
-                if mc.attributeQuery(key, node=cur_object, exists=True):
-                    attr_value = mc.getAttr(cur_object + '.' + key)
-                    serializable = json.loads(attr_value)
-                    self._current_building = Building.get_from_serializable(serializable)
-                    return
+    def _undo_redo_called(self, client_data=None):
+        # cancelled operations restore the building themselves
+        if self._generator.get_context().is_rolling_back():
+            return
 
-    def _save_current_building(self):
+        # no building?
         if self._current_building is None:
             return
 
-        serializable = self._current_building.get_serializable()
-        self._current_building.write_metadata(json.dumps(serializable))
-    # endregion
-
-
-class FloorWidget(QtWidgets.QWidget):
-    # signals
-    on_move_up_pressed = Signal(int)
-    on_recreate_pressed = Signal(int, int, str)
-    on_move_down_pressed = Signal(int)
-    on_delete_pressed = Signal(int)
-    on_select_pressed = Signal(int)
-
-    # sizes
-    _button_size = (25, 25)
-    _template_dropdown_width = 125
-
-    def __init__(self, level=1, floor_count=1, floor_type=floor, template_id="floor_template",
-                 templates=[], width=100, height=100, spacing=10, is_selected=False):
-        QtWidgets.QWidget.__init__(self)
-
-        # store values
-        self._level = level
-        self._floor_count = floor_count
-        self._floor_type = floor_type
-        self._template_id = template_id
-        self._templates = templates
-        self.height = height
-        self.width = width
-        self.spacing = spacing
-        self._is_selected = is_selected
-
-        # main layout
-        self._main_layout = None
-        # for widgets
-        self._box_layout = None
-
-        # widget of the floor
-        self._floor_widget = None
-        # layout of the floor
-        self._floor_layout = None
-        # dropdown for templates
-        self._template_dropdown = None
-
-        # set icon directory
-        self._icon_dir = ""
-        file_name = inspect.getfile(inspect.currentframe())
-        dir_name = os.path.dirname(file_name)
-        self._icon_dir = dir_name + "/../icons/"
-
-        self.setMaximumHeight(self.height)
-
-        self._create_ui()
-
-    def _create_ui(self):
-        # main layout
-        self._main_layout = QtWidgets.QHBoxLayout()
-        self._main_layout.setSpacing(0)
-        self._main_layout.setMargin(0)
-        self.setLayout(self._main_layout)
-
-        self._create_basic_layout()
-
-        # create edit ui depending on the floor type
-        if self._floor_type is ground:
-            self._create_edit_ui(True, False, False)
-        elif self._floor_type is lowes_floor:
-            self._create_edit_ui(True, True, True)
-        elif self._floor_type is floor:
-            self._create_edit_ui(True, True, True)
-        elif self._floor_type is highest_floor:
-            self._create_edit_ui(False, True, True)
-        elif self._floor_type is roof:
-            self._create_edit_ui(False, False, False)
-
-    def _create_basic_layout(self):
-        # main layout
-        self._box_layout = QtWidgets.QVBoxLayout()
-        self._box_layout.setSpacing(0)
-        self._box_layout.setMargin(0)
-
-        self._box_layout.setAlignment(Qt.AlignCenter)
-        self._main_layout.addLayout(self._box_layout)
-
-        # center
-        self._floor_widget = QtWidgets.QLabel()
-        if self._floor_type != roof:
-            self._floor_widget.setFixedSize(self.width, self.height - self.spacing)
+        # reload the undone or redone state from the meta data
+        building_id = self._current_building.get_object()
+        if building_registry.has_building(building_id):
+            self._set_current_building(Building.get_from_serializable(building_registry.get_metadata(building_id)))
         else:
-            self._floor_widget.setFixedSize(self.width, self.height)
-
-        if self._is_selected:
-            self._floor_widget.setStyleSheet("QLabel {"
-                                             "background-color: grey;"
-                                             "border: 2px solid #29ff6d;"
-                                             "border-radius: 4;"
-                                             "}")
-        else:
-            self._floor_widget.setStyleSheet("QLabel {"
-                                             "background-color: grey;"
-                                             "border: 2px solid #2e2e2e;"
-                                             "border-radius: 4;"
-                                             "}")
-
-        # spacing
-        space = QtWidgets.QLabel()
-        space.setFixedHeight(self.spacing)
-
-        # add widgets to layouts
-        if self._floor_type != roof:
-            self._box_layout.addWidget(space)
-        self._box_layout.addWidget(self._floor_widget)
-
-        # floor layout
-        self._floor_layout = QtWidgets.QGridLayout()
-        self._floor_widget.setLayout(self._floor_layout)
-
-    def _create_edit_ui(self, move_up=True, move_down=True, delete=True):
-        # up button
-        if move_up and self._floor_count > 1:
-            up_button = QtWidgets.QPushButton("")
-            up_button.setToolTip("Move the floor one level up.")
-            up_button.setFixedSize(self._button_size[0], self._button_size[1])
-            up_button.clicked.connect(self._up_pressed)
-
-            # icon
-            icon = QtGui.QIcon()
-            icon.addPixmap(QtGui.QPixmap(self._icon_dir + "arrow_up.png"))
-            up_button.setIcon(icon)
-
-            self._floor_layout.addWidget(up_button, 1, 1)
-
-        # recreate button
-        recreate_button = QtWidgets.QPushButton("")
-        recreate_button.setToolTip("Recreate the floor with the given template and random seed.")
-        recreate_button.setFixedSize(self._button_size[0], self._button_size[1])
-        recreate_button.clicked.connect(self._recreated_pressed)
-
-        # icon
-        icon = QtGui.QIcon()
-        icon.addPixmap(QtGui.QPixmap(self._icon_dir + "refresh.png"))
-        recreate_button.setIcon(icon)
-
-        # add to layout
-        self._floor_layout.addWidget(recreate_button, 2, 1)
-
-        # template dropdown
-        self._template_dropdown = QtWidgets.QComboBox()
-        self._template_dropdown.setFixedSize(self._template_dropdown_width, self._button_size[1])
-        for i in range(len(self._templates)):
-            template_id = self._templates[i].id
-            self._template_dropdown.addItem(template_id)
-
-            if template_id == self._template_id:
-                self._template_dropdown.setCurrentIndex(i)
-        self._floor_layout.addWidget(self._template_dropdown, 2, 2, Qt.AlignLeft | Qt.AlignCenter)
-
-        # down button
-        if move_down:
-            # button
-            down_button = QtWidgets.QPushButton("")
-            down_button.setToolTip("Move the floor one level down.")
-            down_button.setFixedSize(self._button_size[0], self._button_size[1])
-            down_button.clicked.connect(self._down_pressed)
-
-            # icon
-            icon = QtGui.QIcon()
-            icon.addPixmap(QtGui.QPixmap(self._icon_dir + "arrow_down.png"))
-            down_button.setIcon(icon)
-
-            self._floor_layout.addWidget(down_button, 3, 1)
-        elif self._floor_type is ground:
-            empty = QtWidgets.QWidget()
-            empty.setFixedSize(self._button_size[0], self._button_size[1])
-
-            self._floor_layout.addWidget(empty, 3, 1)
-
-        # delete button
-        if delete:
-            delete_button = QtWidgets.QPushButton("")
-            delete_button.setToolTip("Delete the floor.")
-            delete_button.setFixedSize(self._button_size[0], self._button_size[1])
-            delete_button.clicked.connect(self._delete_pressed)
-
-            # set icon
-            icon = QtGui.QIcon()
-            icon.addPixmap(QtGui.QPixmap(self._icon_dir + "delete.png"))
-            delete_button.setIcon(icon)
-
-            self._floor_layout.addWidget(delete_button, 1, 3, Qt.AlignRight | Qt.AlignTop)
-        elif self._floor_type is ground:
-            empty = QtWidgets.QWidget()
-            empty.setFixedSize(self._button_size[0], self._button_size[1])
-
-            self._floor_layout.addWidget(empty, 1, 3, Qt.AlignRight | Qt.AlignTop)
-        elif self._floor_type is roof:
-            empty = QtWidgets.QWidget()
-            empty.setFixedSize(self._button_size[0], self._button_size[1])
-
-            self._floor_layout.addWidget(empty, 2, 3, Qt.AlignRight | Qt.AlignTop)
-
-        # select button
-        select_button = QtWidgets.QPushButton("")
-        select_button.setToolTip("Select the floor.")
-        select_button.setFixedSize(self._button_size[0], self._button_size[1])
-        select_button.clicked.connect(self._select_pressed)
-
-        # icon
-        icon = QtGui.QIcon()
-        icon.addPixmap(QtGui.QPixmap(self._icon_dir + "select.png"))
-        select_button.setIcon(icon)
+            self._set_current_building(None)
+            self._building_name_label.setText("No building selected.")
 
-        # add to layout
-        if self._floor_type is roof:
-            self._floor_layout.addWidget(select_button, 2, 3, Qt.AlignRight | Qt.AlignTop)
-        else:
-            self._floor_layout.addWidget(select_button, 3, 3, Qt.AlignRight | Qt.AlignBottom)
+        # floors may have been removed
+        self._selected_floor_level = None
+        self._refresh_editor()
+    # endregion
 
-    # region Signals
-    def _up_pressed(self):
-        self.on_move_up_pressed.emit(self._level)
+    # region Helper
+    def _try_load_cur_building(self):
+        id = self._window.user_profile.get_cur_building()
 
-    def _recreated_pressed(self):
-        self.on_recreate_pressed.emit(self._level, self._floor_type, self._template_dropdown.currentText())
+        # building still in the scene?
+        if building_registry.has_building(id):
+            serializable = building_registry.get_metadata(id)
+            self._set_current_building(Building.get_from_serializable(serializable))
 
-    def _down_pressed(self):
-        self.on_move_down_pressed.emit(self._level)
+    # the floor stack model updates itself, the editor only listens to save the changes
+    def _set_current_building(self, building=None):
+        if self._current_building is not None:
+            self._current_building.remove_listener(self._building_changed)
 
-    def _delete_pressed(self):
-        self.on_delete_pressed.emit(self._level)
+        self._current_building = building
+        if building is not None:
+            building.add_listener(self._building_changed)
 
-    def _select_pressed(self):
-        self.on_select_pressed.emit(self._level)
+    def _building_changed(self, event=None):
+        if isinstance(event, MetadataDirty):
+            self._save_current_building()
 
-    # endregion
+    def _save_current_building(self):
+        if self._current_building is None:
+            return
 
-    # region Helper
-    def _get_part_name(self, part=floor):
-        if part == floor:
-            return "floor"
-        elif part == roof:
-            return "roof"
-        elif part == ground:
-            return "ground"
+        self._save_queue.add(self._current_building, self._generator.get_metadata_compression())
     # endregion
 
 
@@ -0,0 +1,47 @@
+from maya.OpenMaya import MEventMessage, MSceneMessage, MCommandMessage, MMessage
+
+
+# keeps track of the maya callbacks of the editor windows, their tabs and helpers
+# callbacks are registered for an owner and removed together when the owner is closed
+# callbacks which are still registered are removed when the plugin is unloaded
+class CallbackManager:
+
+    def __init__(self):
+        # owner -> ids of its callbacks
+        self._callback_ids = {}
+
+    def add_event_callback(self, owner=None, event="SelectionChanged", function=None):
+        return self.add(owner, MEventMessage.addEventCallback(event, function))
+
+    def add_scene_callback(self, owner=None, message=MSceneMessage.kAfterOpen, function=None):
+        return self.add(owner, MSceneMessage.addCallback(message, function))
+
+    def add_command_callback(self, owner=None, function=None):
+        return self.add(owner, MCommandMessage.addCommandCallback(function))
+
+    # tracks the id of a callback which has been registered elsewhere
+    def add(self, owner=None, callback_id=None):
+        self._callback_ids.setdefault(owner, []).append(callback_id)
+        return callback_id
+
+    def remove_callbacks(self, owner=None):
+        for callback_id in self._callback_ids.pop(owner, []):
+            MMessage.removeCallback(callback_id)
+
+    def remove_all(self):
+        for owner in self._callback_ids.keys():
+            self.remove_callbacks(owner)
+
+    # number of live callbacks of the owner, or of all owners if no owner is given
+    def get_callback_count(self, owner=None):
+        if owner is not None:
+            return len(self._callback_ids.get(owner, []))
+
+        return sum([len(callback_ids) for callback_ids in self._callback_ids.values()])
+
+    def get_owner_count(self):
+        return len(self._callback_ids)
+
+
+# callbacks of the plugin
+callback_manager = CallbackManager()
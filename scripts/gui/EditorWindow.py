@@ -1,4 +1,5 @@
 from PySide2 import QtWidgets
+from PySide2.QtCore import Qt
 import maya.OpenMayaUI as mui
 import shiboken2
 import maya.cmds as mc
@@ -6,6 +7,19 @@ from building_generator import *
 from models.UserProfile import *
 from TemplateTab import TemplateTab
 from BuildingEditorTab import BuildingEditorTab
+from CallbackManager import callback_manager
+
+
+# main window widget of the editor, closes the editor while its tabs still exist
+class EditorMainWindow(QtWidgets.QMainWindow):
+
+    def __init__(self, editor=None, parent=None):
+        QtWidgets.QMainWindow.__init__(self, parent)
+        self._editor = editor
+
+    def closeEvent(self, event):
+        self._editor.close()
+        QtWidgets.QMainWindow.closeEvent(self, event)
 
 
 # main window of the editor
@@ -27,6 +41,7 @@ class EditorWindow():
 
     def __init__(self):
         self.user_profile = UserProfile.load()
+        self._tabs = []
         self.create_ui()
 
     # region UI Creation
@@ -42,7 +57,7 @@ class EditorWindow():
         self.delete_ui()
 
         # create the main window widget
-        self._window = QtWidgets.QMainWindow(maya_ui)
+        self._window = EditorMainWindow(self, maya_ui)
 
         # set title
         self._window.setWindowTitle("Building Generator")
@@ -58,17 +73,41 @@ class EditorWindow():
         self._central_layout = QtWidgets.QVBoxLayout( self._central_widget )
         self._window.setCentralWidget(self._central_widget)
 
-        # create generator
-        self._generator = BuildingGenerator()
+        # create generator, the progress is shown in the main progress bar and can be cancelled with escape
+        self._generator = BuildingGenerator(progress_reporter=MainProgressBarReporter())
 
         # add tabs
-        self._central_widget.addTab(BuildingEditorTab(self._generator, self), "Editor")
-        self._central_widget.addTab(TemplateTab(self._generator, self), "Templates")
+        self._tabs = [BuildingEditorTab(self._generator, self), TemplateTab(self._generator, self)]
+        self._central_widget.addTab(self._tabs[0], "Editor")
+        self._central_widget.addTab(self._tabs[1], "Templates")
+
+        # closing the window closes the editor, when it is destroyed its tabs are already deleted by qt
+        self._window.setAttribute(Qt.WA_DeleteOnClose)
+        self._window.destroyed.connect(self._window_destroyed)
 
         # show
         self._window.show()
 
     def delete_ui(self):
         if mc.window(self._window_name, exists=True):
+            # close the tabs before they are deleted
+            self.close()
             mc.deleteUI(self._window_name)
-    # endregion
\ No newline at end of file
+    # endregion
+
+    # removes the callbacks of the window and its tabs, can be called more than once
+    def close(self):
+        callback_manager.remove_callbacks(self)
+
+        for tab in self._tabs:
+            tab.on_close()
+        self._tabs = []
+
+    # only drops the references, the tabs can not be closed anymore
+    def _window_destroyed(self, window=None):
+        callback_manager.remove_callbacks(self)
+
+        self._tabs = []
+        self._central_widget = None
+        self._central_layout = None
+        self._window = None
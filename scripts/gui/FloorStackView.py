@@ -0,0 +1,427 @@
+import inspect
+import os
+from functools import partial
+from PySide2 import QtCore, QtGui, QtWidgets
+from PySide2.QtCore import Qt, Signal
+from models.Events import *
+
+# floor types
+floor, highest_floor, lowes_floor, ground, roof = range(5)
+
+
+# model of the floor stack of a building, the first row is the roof and the last one the ground floor
+# the model listens to the change events of the building, so only the rows of changed floors are updated
+class FloorStackModel(QtCore.QAbstractListModel):
+    # roles
+    LevelRole = Qt.UserRole + 1
+    FloorTypeRole = Qt.UserRole + 2
+    SelectedRole = Qt.UserRole + 3
+    TemplateRole = Qt.UserRole + 4
+
+    def __init__(self, parent=None):
+        QtCore.QAbstractListModel.__init__(self, parent)
+
+        self._building = None
+        self._selected_level = None
+
+        # templates chosen in the dropdowns by level, used when the floor is recreated
+        self._chosen_templates = {}
+
+    def set_building(self, building=None, selected_level=None):
+        if self._building is not None:
+            self._building.remove_listener(self._building_changed)
+        if building is not None:
+            building.add_listener(self._building_changed)
+
+        self.beginResetModel()
+        self._building = building
+        self._selected_level = selected_level
+        self._chosen_templates = {}
+        self.endResetModel()
+
+    def get_level(self, row=0):
+        return self._building.get_floor_count() - row
+
+    def get_row(self, level=0):
+        return self._building.get_floor_count() - level
+
+    def get_floor_type(self, level=0):
+        if level == self._building.get_floor_count():
+            return roof
+        if level == 0:
+            return ground
+        if level == self._building.get_floor_count() - 1:
+            return highest_floor
+        if level == 1:
+            return lowes_floor
+        return floor
+
+    def get_floor_count(self):
+        return self._building.get_floor_count()
+
+    # region Model
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or self._building is None:
+            return 0
+
+        return self._building.get_floor_count() + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self._building is None:
+            return None
+
+        level = self.get_level(index.row())
+
+        if role == Qt.DisplayRole:
+            return self._get_part(level).get_template_id()
+        if role == self.LevelRole:
+            return level
+        if role == self.FloorTypeRole:
+            return self.get_floor_type(level)
+        if role == self.SelectedRole:
+            return level == self._selected_level
+        if role == self.TemplateRole:
+            return self._chosen_templates.get(level, self._get_part(level).get_template_id())
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != self.TemplateRole:
+            return False
+
+        self._chosen_templates[self.get_level(index.row())] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def _get_part(self, level=0):
+        if level == self._building.get_floor_count():
+            return self._building.get_roof()
+
+        return self._building.get_floor_at_level(level)
+    # endregion
+
+    # region Changes
+    def _building_changed(self, event=None):
+        if isinstance(event, FloorAboutToBeInserted):
+            self.floor_about_to_be_inserted(event.level)
+        elif isinstance(event, FloorInserted):
+            self.floor_inserted(event.level)
+        elif isinstance(event, FloorAboutToBeRemoved):
+            self.floor_about_to_be_removed(event.level)
+        elif isinstance(event, FloorRemoved):
+            self.floor_removed(event.level)
+        elif isinstance(event, FloorsMoved):
+            self.floors_moved(event.levels)
+        elif isinstance(event, FloorRegenerated):
+            self.floor_changed(event.level)
+        elif isinstance(event, RoofReplaced) and event.roof is not None:
+            self.floor_changed(self._building.get_floor_count())
+        elif isinstance(event, FloorsAboutToBeReset):
+            self.beginResetModel()
+        elif isinstance(event, FloorsReset):
+            self._chosen_templates = {}
+            self.endResetModel()
+
+    # all rows, e.g. after the whole building has been recreated
+    def refresh(self):
+        self._chosen_templates = {}
+        self._rows_changed(0, self.rowCount() - 1)
+
+    def floor_changed(self, level=0):
+        self._chosen_templates.pop(level, None)
+
+        row = self.get_row(level)
+        self._rows_changed(row, row)
+
+    # levels is a dict of old level -> new level
+    def floors_moved(self, levels={}):
+        moved_templates = {}
+        for level in levels.keys():
+            if level in self._chosen_templates:
+                moved_templates[levels[level]] = self._chosen_templates.pop(level)
+        self._chosen_templates.update(moved_templates)
+
+        # the moved floors and the floors in between changed
+        lowest_level = min(min(levels), min(levels.values()))
+        self._rows_changed(0, self.get_row(lowest_level))
+
+    # called before the floor is added to the empty level
+    def floor_about_to_be_inserted(self, level=0):
+        # the rows above keep their index, the rows below move down
+        row = self.get_row(level) + 1
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+
+    # called after the floor has been added to the empty level
+    def floor_inserted(self, level=0):
+        self.endInsertRows()
+
+        # levels above and the types of the neighbours changed
+        row = self.get_row(level)
+        self._rows_changed(0, row + 1)
+
+    # called before the floor is removed from the building
+    def floor_about_to_be_removed(self, level=0):
+        row = self.get_row(level)
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+
+        self._chosen_templates.pop(level, None)
+
+    # called after the floor has been removed from the building, before the floors above are moved down
+    def floor_removed(self, level=0):
+        self.endRemoveRows()
+
+        # levels above and the types of the neighbours changed
+        row = self.get_row(level) + 1
+        self._rows_changed(0, row)
+
+    def set_selected_level(self, level=None):
+        previous_level = self._selected_level
+        self._selected_level = level
+
+        for changed_level in [previous_level, level]:
+            if changed_level is not None and changed_level <= self._building.get_floor_count():
+                self._rows_changed(self.get_row(changed_level), self.get_row(changed_level))
+
+    def _rows_changed(self, first_row=0, last_row=0):
+        first_row = max(first_row, 0)
+        last_row = min(last_row, self.rowCount() - 1)
+        if first_row > last_row:
+            return
+
+        self.dataChanged.emit(self.index(first_row), self.index(last_row))
+    # endregion
+
+
+# paints the floors of a FloorStackModel and handles the clicks on their buttons
+# buttons are only painted, the template dropdown is the only widget and only exists while it is open
+class FloorStackDelegate(QtWidgets.QStyledItemDelegate):
+    # signals
+    on_move_up_pressed = Signal(int)
+    on_recreate_pressed = Signal(int, int, str)
+    on_move_down_pressed = Signal(int)
+    on_delete_pressed = Signal(int)
+    on_select_pressed = Signal(int)
+    on_add_pressed = Signal(int)
+
+    # sizes
+    floor_height = 100
+    floor_width = 250
+    floor_spacing = 5
+
+    roof_height = 50
+    ground_height = 100
+
+    level_width = 20
+    margin = 6
+    button_size = (25, 25)
+    add_button_size = (25, 25)
+    template_dropdown_width = 125
+
+    # colors
+    floor_color = QtGui.QColor("grey")
+    border_color = QtGui.QColor("#2e2e2e")
+    selected_border_color = QtGui.QColor("#29ff6d")
+
+    # get_templates(floor_type) returns the templates of the dropdown
+    def __init__(self, get_templates=None, parent=None):
+        QtWidgets.QStyledItemDelegate.__init__(self, parent)
+        self._get_templates = get_templates
+
+        # icons are loaded once for all floors
+        file_name = inspect.getfile(inspect.currentframe())
+        icon_dir = os.path.dirname(file_name) + "/../icons/"
+
+        self._icons = {}
+        for name, file_name in [("up", "arrow_up.png"), ("recreate", "refresh.png"), ("down", "arrow_down.png"),
+                                ("delete", "delete.png"), ("select", "select.png")]:
+            self._icons[name] = QtGui.QIcon(icon_dir + file_name)
+
+        self._level_font = QtGui.QFont("Calibri", 12, QtGui.QFont.Bold)
+        self._add_font = QtGui.QFont("Calibri", 15, QtGui.QFont.Bold)
+
+    # region Painting
+    def sizeHint(self, option, index):
+        return QtCore.QSize(self.level_width + self.floor_width + self.add_button_size[0] + 4 * self.margin,
+                            self._get_height(index.data(FloorStackModel.FloorTypeRole)))
+
+    def paint(self, painter, option, index):
+        floor_type = index.data(FloorStackModel.FloorTypeRole)
+        floor_rect = self._get_floor_rect(option.rect, floor_type)
+
+        painter.save()
+
+        # level
+        painter.setFont(self._level_font)
+        painter.setPen(option.palette.color(QtGui.QPalette.Text))
+        level_rect = QtCore.QRect(option.rect.left(), floor_rect.top(), self.level_width, floor_rect.height())
+        painter.drawText(level_rect, Qt.AlignRight | Qt.AlignVCenter, str(index.data(FloorStackModel.LevelRole)))
+
+        # floor
+        border_color = self.selected_border_color if index.data(FloorStackModel.SelectedRole) else self.border_color
+        painter.setPen(QtGui.QPen(border_color, 2))
+        painter.setBrush(self.floor_color)
+        painter.drawRoundedRect(floor_rect.adjusted(1, 1, -1, -1), 4, 4)
+
+        painter.restore()
+
+        # buttons
+        rects = self._get_button_rects(option.rect, floor_type, index.model().get_floor_count())
+        for name in rects.keys():
+            if name == "template":
+                self._paint_dropdown(painter, rects[name], index.data(FloorStackModel.TemplateRole))
+            elif name == "add":
+                self._paint_button(painter, rects[name], None, "+", self._add_font)
+            else:
+                self._paint_button(painter, rects[name], self._icons[name])
+
+    def _paint_button(self, painter, rect, icon=None, text="", font=None):
+        button = QtWidgets.QStyleOptionButton()
+        button.rect = rect
+        button.state = QtWidgets.QStyle.State_Enabled
+        button.text = text
+        if icon is not None:
+            button.icon = icon
+            button.iconSize = QtCore.QSize(16, 16)
+
+        painter.save()
+        if font is not None:
+            painter.setFont(font)
+        QtWidgets.QApplication.style().drawControl(QtWidgets.QStyle.CE_PushButton, button, painter)
+        painter.restore()
+
+    def _paint_dropdown(self, painter, rect, text=""):
+        dropdown = QtWidgets.QStyleOptionComboBox()
+        dropdown.rect = rect
+        dropdown.state = QtWidgets.QStyle.State_Enabled
+        dropdown.currentText = text
+
+        style = QtWidgets.QApplication.style()
+        style.drawComplexControl(QtWidgets.QStyle.CC_ComboBox, dropdown, painter)
+        style.drawControl(QtWidgets.QStyle.CE_ComboBoxLabel, dropdown, painter)
+    # endregion
+
+    # region Layout
+    def _get_height(self, floor_type=floor):
+        if floor_type == roof:
+            return self.roof_height
+        if floor_type == ground:
+            return self.ground_height
+        return self.floor_height
+
+    def _get_floor_rect(self, rect, floor_type=floor):
+        # floors have a spacing to the floor above
+        top = rect.top() if floor_type == roof else rect.top() + self.floor_spacing
+        return QtCore.QRect(rect.left() + self.level_width + self.margin, top, self.floor_width, rect.bottom() - top + 1)
+
+    def _get_button_rects(self, rect, floor_type=floor, floor_count=1):
+        floor_rect = self._get_floor_rect(rect, floor_type)
+        width, height = self.button_size
+
+        left = floor_rect.left() + self.margin
+        right = floor_rect.right() - self.margin - width
+        top = floor_rect.top() + self.margin
+        center = floor_rect.center().y() - height // 2
+        bottom = floor_rect.bottom() - self.margin - height
+
+        result = {
+            "recreate": QtCore.QRect(left, center, width, height),
+            "template": QtCore.QRect(left + width + self.margin, center, self.template_dropdown_width, height),
+        }
+
+        if floor_type in [ground, lowes_floor, floor] and floor_count > 1:
+            result["up"] = QtCore.QRect(left, top, width, height)
+
+        if floor_type in [lowes_floor, floor, highest_floor]:
+            result["down"] = QtCore.QRect(left, bottom, width, height)
+            result["delete"] = QtCore.QRect(right, top, width, height)
+
+        if floor_type == roof:
+            result["select"] = QtCore.QRect(right, center, width, height)
+        else:
+            result["select"] = QtCore.QRect(right, bottom, width, height)
+
+        # add a floor below, next to the bottom of the floor
+        if floor_type != ground:
+            result["add"] = QtCore.QRect(floor_rect.right() + self.margin, rect.bottom() - self.add_button_size[1] + 1,
+                                         self.add_button_size[0], self.add_button_size[1])
+
+        return result
+    # endregion
+
+    # region Events
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QtCore.QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+
+        level = index.data(FloorStackModel.LevelRole)
+        floor_type = index.data(FloorStackModel.FloorTypeRole)
+        rects = self._get_button_rects(option.rect, floor_type, model.get_floor_count())
+
+        for name in rects.keys():
+            if not rects[name].contains(event.pos()):
+                continue
+
+            if name == "template":
+                self.parent().edit(index)
+            elif name == "up":
+                self.on_move_up_pressed.emit(level)
+            elif name == "recreate":
+                self.on_recreate_pressed.emit(level, floor_type, index.data(FloorStackModel.TemplateRole))
+            elif name == "down":
+                self.on_move_down_pressed.emit(level)
+            elif name == "delete":
+                self.on_delete_pressed.emit(level)
+            elif name == "select":
+                self.on_select_pressed.emit(level)
+            elif name == "add":
+                self.on_add_pressed.emit(level)
+            return True
+
+        return False
+
+    # template dropdown
+    def createEditor(self, parent, option, index):
+        dropdown = QtWidgets.QComboBox(parent)
+        for template in self._get_templates(index.data(FloorStackModel.FloorTypeRole)):
+            dropdown.addItem(template.id)
+
+        # close with the choice
+        dropdown.activated.connect(partial(self._close_dropdown, dropdown))
+        QtCore.QTimer.singleShot(0, dropdown.showPopup)
+
+        return dropdown
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentIndex(max(editor.findText(index.data(FloorStackModel.TemplateRole)), 0))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), FloorStackModel.TemplateRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        rects = self._get_button_rects(option.rect, index.data(FloorStackModel.FloorTypeRole),
+                                       index.model().get_floor_count())
+        editor.setGeometry(rects["template"])
+
+    def _close_dropdown(self, dropdown, index=0):
+        self.commitData.emit(dropdown)
+        self.closeEditor.emit(dropdown)
+    # endregion
+
+
+# list of the floors of a building, only the visible floors are painted
+class FloorStackView(QtWidgets.QListView):
+
+    def __init__(self, model=None, delegate=None, parent=None):
+        QtWidgets.QListView.__init__(self, parent)
+
+        self.setModel(model)
+        self.setItemDelegate(delegate)
+        delegate.setParent(self)
+
+        self.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.setFocusPolicy(Qt.NoFocus)
@@ -35,5 +35,15 @@ class MenuEntry():
         if mc.menu(self._menu_id, query=True, exists=True):
             mc.deleteUI(self._menu_id)
 
+        # close the open editor
+        if self._widget is not None:
+            self._widget.close()
+            self._widget.delete_ui()
+            self._widget = None
+
     def __open_window(self, *args):
-        _window = EditorWindow()
\ No newline at end of file
+        # close the previous editor, its callbacks are removed
+        if self._widget is not None:
+            self._widget.close()
+
+        self._widget = EditorWindow()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import maya.cmds as mc
+from maya.OpenMaya import MSceneMessage
+from PySide2.QtCore import QTimer
+from CallbackManager import callback_manager
+
+
+# queue of buildings whose meta data has to be saved
+# buildings are only marked as dirty, all edits within the delay are written with one save per building
+# the queue is flushed when the delay runs out, before the scene is saved, closed or replaced and before undo and redo
+# saves are not recorded by undo, the editor reloads its building from the meta data after undo and redo
+# nothing is written while a cancelled operation of the generation context is rolled back
+class MetadataSaveQueue:
+
+    def __init__(self, delay=1000, context=None):
+        # building object -> (building, compression)
+        self._dirty = {}
+        self._write_count = 0
+        self._context = context
+
+        # restarted with every change, the queue is flushed when it runs out
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+    def add(self, building=None, compression=None):
+        self._dirty[building.get_object()] = (building, compression)
+        self._timer.start()
+
+    def has_changes(self):
+        return len(self._dirty) > 0
+
+    # number of meta data writes since the queue was created
+    def get_write_count(self):
+        return self._write_count
+
+    def flush(self):
+        self._timer.stop()
+
+        # nothing to save?
+        if not self.has_changes():
+            return
+
+        dirty = self._dirty
+        self._dirty = {}
+
+        undo_state = mc.undoInfo(query=True, state=True)
+        mc.undoInfo(stateWithoutFlush=False)
+        try:
+            for building, compression in dirty.values():
+                # destroyed in the meantime?
+                if building.get_object() is None or not building.exists():
+                    continue
+
+                building.save_metadata(compression)
+                self._write_count += 1
+        finally:
+            mc.undoInfo(stateWithoutFlush=undo_state)
+
+    # region Callbacks
+    def add_callbacks(self):
+        if callback_manager.get_callback_count(self) > 0:
+            return
+
+        for message in [MSceneMessage.kBeforeSave, MSceneMessage.kBeforeNew, MSceneMessage.kBeforeOpen, MSceneMessage.kMayaExiting]:
+            callback_manager.add_scene_callback(self, message, self._flush_callback)
+        callback_manager.add_command_callback(self, self._command_called)
+
+    # flushes the queue and removes the callbacks
+    def close(self):
+        self.flush()
+        callback_manager.remove_callbacks(self)
+
+    def _flush_callback(self, client_data=None):
+        self.flush()
+
+    def _command_called(self, command="", client_data=None):
+        # the undo of a cancelled operation, the building is restored afterwards
+        if self._context is not None and self._context.is_rolling_back():
+            return
+
+        # undo boundary?
+        if self.has_changes() and command.strip().split(" ")[0].rstrip(";") in ("undo", "redo"):
+            self.flush()
+    # endregion
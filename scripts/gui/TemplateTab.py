@@ -2,7 +2,7 @@ from BaseTab import *
 from ListWidget import *
 from CollapsibleWidget import *
 from Vector3Widget import Vector3Widget
-from maya.OpenMaya import MEventMessage
+from CallbackManager import callback_manager
 
 
 # tab for managing the templates
@@ -29,14 +29,21 @@ class TemplateTab(BaseTab):
         self._displayed_template = None
         self._template_creation_window = None
 
+        # edits of the template are written once no edit happened for a second
+        self._save_timer = QtCore.QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(1000)
+        self._save_timer.timeout.connect(self._window.user_profile.flush)
+
         self._create_ui()
 
-        # subscribe to event
-        MEventMessage.addEventCallback("SceneOpened", self._scene_changed)
+        # subscribe to event, removed with the window
+        callback_manager.add_event_callback(self._window, "SceneOpened", self._scene_changed)
 
-    def __del__(self):
-        # unsubscribe events
-        MEventMessage.removeCallback("SceneOpened", self._scene_changed)
+    def on_close(self):
+        # write pending edits
+        self._save_timer.stop()
+        self._window.user_profile.flush()
 
     # region UI Creation
     def _create_ui(self):
@@ -298,7 +305,7 @@ class TemplateTab(BaseTab):
         self._window.user_profile.get_cur_template().add_template(template)
 
         # save
-        self._window.user_profile.save()
+        self._save_template()
 
     def _remove_template(self, template="new_item"):
         # confirm
@@ -316,7 +323,7 @@ class TemplateTab(BaseTab):
         self._select_template(self._template_list.get_selected_item())
 
         # save
-        self._window.user_profile.save()
+        self._save_template()
 
     def _select_template(self, blueprint="new_template", skip_displayed=True):
         # search selected template
@@ -349,29 +356,29 @@ class TemplateTab(BaseTab):
             return
 
         self._template_list.rename_selected_item(id)
-        self._displayed_template.id = id
-        self._window.user_profile.save()
+        self._window.user_profile.get_cur_template().rename_template(self._displayed_template, id)
+        self._save_template()
 
     def _set_template_unit(self, unit=(0, 0, 0)):
         if self._displayed_template is None:
             return
 
         self._displayed_template.unit = unit
-        self._window.user_profile.save()
+        self._save_template()
 
     def _set_template_width(self, width=0):
         if self._displayed_template is None:
             return
 
         self._displayed_template.width = width
-        self._window.user_profile.save()
+        self._save_template()
 
     def _set_template_depth(self, depth=0):
         if self._displayed_template is None:
             return
 
         self._displayed_template.depth = depth
-        self._window.user_profile.save()
+        self._save_template()
 
     # endregion
 
@@ -402,8 +409,11 @@ class TemplateTab(BaseTab):
             # add to list
             self._wall_list.add_item(cur_selected)
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _remove_wall_from_floor_template(self, wall="new_wall"):
         # skip empty
@@ -424,8 +434,11 @@ class TemplateTab(BaseTab):
         # remove from list
         self._wall_list.remove_selected_item()
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _add_corner_to_floor_template(self):
         # add selected
@@ -454,8 +467,11 @@ class TemplateTab(BaseTab):
             # add to list
             self._corner_list.add_item(cur_selected)
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _remove_corner_from_floor_template(self, corner="new_wall"):
         # skip empty
@@ -476,8 +492,11 @@ class TemplateTab(BaseTab):
         # remove from list
         self._corner_list.remove_selected_item()
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     # endregion
 
@@ -508,8 +527,11 @@ class TemplateTab(BaseTab):
             # add to list
             self._edge_list.add_item(cur_selected)
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _remove_edge_from_roof_template(self, edge="new_edge"):
         # skip empty
@@ -530,8 +552,11 @@ class TemplateTab(BaseTab):
         # remove from list
         self._edge_list.remove_selected_item()
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _add_corner_to_roof_template(self):
         # add selected
@@ -559,8 +584,11 @@ class TemplateTab(BaseTab):
             # add to list
             self._corner_list.add_item(cur_selected)
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _remove_corner_from_roof_template(self, corner="new_wall"):
         # skip empty
@@ -581,8 +609,11 @@ class TemplateTab(BaseTab):
         # remove from list
         self._corner_list.remove_selected_item()
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _add_tile_to_roof_template(self):
         # add selected
@@ -610,8 +641,11 @@ class TemplateTab(BaseTab):
             # add to list
             self._tile_list.add_item(cur_selected)
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     def _remove_tile_from_roof_template(self, tile="new_wall"):
         # skip empty
@@ -632,8 +666,11 @@ class TemplateTab(BaseTab):
         # remove from list
         self._tile_list.remove_selected_item()
 
+        # blueprints changed
+        self._window.user_profile.get_cur_template().invalidate_valid_templates()
+
         # save profile
-        self._window.user_profile.save()
+        self._save_template()
 
     # endregion
 
@@ -713,6 +750,13 @@ class TemplateTab(BaseTab):
             pass
     # endregion
 
+    # region Helper
+    # marks the current template as changed and restarts the save timer
+    def _save_template(self):
+        self._window.user_profile.save_cur_template()
+        self._save_timer.start()
+    # endregion
+
 
 class TemplateCreationWindow(QtWidgets.QMainWindow):
 
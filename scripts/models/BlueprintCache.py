@@ -0,0 +1,109 @@
+# maya is optional, templates are also used for planning outside of a maya session
+try:
+    import maya.cmds as mc
+except ImportError:
+    mc = None
+
+# the api is only needed for the scene callbacks
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+
+# caches which blueprints exist in the scene
+# the cache is only used while its scene callbacks are registered, otherwise every call queries the scene
+# added nodes can only make missing blueprints valid, removed nodes only existing ones invalid,
+# renamed nodes both. Paths ("group|blueprint") are never cached since they also change with their parents
+class BlueprintCache:
+
+    def __init__(self):
+        self._existing = set()
+        self._missing = set()
+
+        # changes whenever a cached result may have changed
+        self._version = 0
+
+        self._callback_ids = []
+
+    def exists(self, name="blueprint"):
+        # not cached?
+        if not self.has_callbacks() or "|" in name:
+            return mc.objExists(name)
+
+        if name in self._existing:
+            return True
+        if name in self._missing:
+            return False
+
+        # query and cache
+        if mc.objExists(name):
+            self._existing.add(name)
+            return True
+
+        self._missing.add(name)
+        return False
+
+    def get_version(self):
+        return self._version
+
+    def invalidate(self, name=None):
+        if name is None:
+            self._existing.clear()
+            self._missing.clear()
+        else:
+            self._existing.discard(name)
+            self._missing.discard(name)
+
+        self._version += 1
+
+    # region Callbacks
+    def add_callbacks(self):
+        if self.has_callbacks():
+            return
+
+        self.invalidate()
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(self._node_added, "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(self._node_removed, "dependNode"),
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), self._name_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._scene_changed),
+        ]
+
+    def remove_callbacks(self):
+        if not self.has_callbacks():
+            return
+
+        om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+        self.invalidate()
+
+    def has_callbacks(self):
+        return len(self._callback_ids) > 0
+
+    def _node_added(self, node, client_data=None):
+        if len(self._missing) > 0:
+            self._missing.clear()
+            self._version += 1
+
+    def _node_removed(self, node, client_data=None):
+        name = om.MFnDependencyNode(node).name()
+        if name in self._existing:
+            self._existing.discard(name)
+            self._version += 1
+
+    def _name_changed(self, node, previous_name="", client_data=None):
+        if previous_name in self._existing:
+            self._existing.discard(previous_name)
+            self._version += 1
+
+        self._node_added(node)
+
+    def _scene_changed(self, client_data=None):
+        self.invalidate()
+    # endregion
+
+
+# cache shared by all templates
+blueprint_cache = BlueprintCache()
@@ -2,85 +2,158 @@ from Element import *
 from GlobalDefinitions import *
 
 
+# the elements of floors and roofs only exist while they are used, they have slots instead of a __dict__
 # a Wall represents an Element on the side of a building (except for the corner)
 class Wall (Element):
-    def __init__(self, object="new_wall", side=kFront):
+    __slots__ = ("_side", "_blueprint", "_index")
+
+    def __init__(self, object="new_wall", side=kFront, blueprint=None, index=None):
         Element.__init__(self, object)
         self._side = side
+        self._blueprint = blueprint
+        self._index = index
 
     def get_side(self):
         return self._side
 
+    # blueprint the wall was created from and its index on the side (None for walls of old meta data)
+    def get_blueprint(self):
+        return self._blueprint
+
+    def get_index(self):
+        return self._index
+
+    # slot of the wall in its floor, like ElementPlan.get_slot
+    def get_slot(self):
+        return kWallElement, self._side, None, self._index
+
     # serialization
     def get_serializable(self):
         return {
             "object": self._object,
             "side": self._side,
+            "blueprint": self._blueprint,
+            "index": self._index,
         }
 
     @staticmethod
     def get_from_serializable(serializable={}):
-        return Wall(serializable["object"], serializable["side"])
+        return Wall(serializable["object"], serializable["side"], serializable.get("blueprint"), serializable.get("index"))
 
 
 # a Corner represents an Element on the side of a floor or roof
 class Corner (Element):
-    def __init__(self, object="new_corner", side=kFront):
+    __slots__ = ("_side", "_blueprint")
+
+    def __init__(self, object="new_corner", side=kFront, blueprint=None):
         Element.__init__(self, object)
         self._side = side
+        self._blueprint = blueprint
 
     def get_side(self):
         return self._side
 
+    def get_blueprint(self):
+        return self._blueprint
+
+    def get_slot(self):
+        return kCornerElement, self._side, None, None
+
     # serialization
     def get_serializable(self):
         return {
             "object": self._object,
             "side": self._side,
+            "blueprint": self._blueprint,
         }
 
     @staticmethod
     def get_from_serializable(serializable={}):
-        return Corner(serializable["object"], serializable["side"])
+        return Corner(serializable["object"], serializable["side"], serializable.get("blueprint"))
 
 
 # a Tile represents an Element on the middle of the roof (except for the corner and edges)
 class Tile (Element):
-    def __init__(self, object="new_tile", tile_position=(0, 0)):
+    __slots__ = ("_tile_postion", "_blueprint")
+
+    def __init__(self, object="new_tile", tile_position=(0, 0), blueprint=None):
         Element.__init__(self, object)
         self._tile_postion = tile_position
+        self._blueprint = blueprint
 
     def get_tile_position(self):
         return self._tile_postion
 
+    def get_blueprint(self):
+        return self._blueprint
+
+    def get_slot(self):
+        return kTileElement, kFront, tuple(self._tile_postion), None
+
     # serialization
     def get_serializable(self):
         return {
             "object": self._object,
             "tile_position": self._tile_postion,
+            "blueprint": self._blueprint,
         }
 
     @staticmethod
     def get_from_serializable(serializable={}):
-        return Tile(serializable["object"], serializable["tile_position"])
+        return Tile(serializable["object"], tuple(serializable["tile_position"]), serializable.get("blueprint"))
 
 
 # an Edge represents an Element on the edge of a roof between two corners
 class Edge (Element):
-    def __init__(self, object="new_wall", side=kFront):
+    __slots__ = ("_side", "_blueprint", "_index")
+
+    def __init__(self, object="new_wall", side=kFront, blueprint=None, index=None):
         Element.__init__(self, object)
         self._side = side
+        self._blueprint = blueprint
+        self._index = index
 
     def get_side(self):
         return self._side
 
+    def get_blueprint(self):
+        return self._blueprint
+
+    def get_index(self):
+        return self._index
+
+    def get_slot(self):
+        return kEdgeElement, self._side, None, self._index
+
     # serialization
     def get_serializable(self):
         return {
             "object": self._object,
             "side": self._side,
+            "blueprint": self._blueprint,
+            "index": self._index,
         }
 
     @staticmethod
     def get_from_serializable(serializable={}):
-        return Edge(serializable["object"], serializable["side"])
+        return Edge(serializable["object"], serializable["side"], serializable.get("blueprint"), serializable.get("index"))
+
+
+# palette of the blueprints of a floor or roof, their elements are stored with the index of their blueprint
+class BlueprintPalette:
+    __slots__ = ("_blueprints", "_indices")
+
+    def __init__(self):
+        self._blueprints = []
+        self._indices = {}
+
+    def get_index(self, blueprint=None):
+        # add blueprint if it is new
+        if not self._indices.has_key(blueprint):
+            self._indices[blueprint] = len(self._blueprints)
+            self._blueprints.append(blueprint)
+
+        return self._indices[blueprint]
+
+    def get_blueprint(self, index=0):
+        return self._blueprints[index]
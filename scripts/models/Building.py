@@ -1,21 +1,45 @@
+import json
 from Floor import *
 from Roof import *
+from Events import *
+from BuildingRegistry import building_registry
 
 
 # A Building represents a collection of floors and a roof
-class Building(Element):
+# listeners are notified about the changes of the floor stack, the roof and the elements of its floors and roof
+# every change is followed by a MetadataDirty event
+class Building(Element, ChangeNotifier):
     def __init__(self, object="new_building", template_id="new_building_template"):
         Element.__init__(self, object)
+        ChangeNotifier.__init__(self)
         self._floors = {}
         self._roof = None
         self._template_id = template_id
 
+        # cumulative level heights, _level_heights[level] is the sum of the floor heights below the level
+        # only the levels below a changed floor are kept, the rest is recalculated on demand
+        self._level_heights = [0]
+
     def get_template_id(self):
         return self._template_id
 
     # floors
     def add_floor(self, floor=Floor()):
-        self._floors[floor.get_level()] = floor
+        level = floor.get_level()
+        replaced_floor = self._floors.get(level)
+        if replaced_floor is not None:
+            replaced_floor.remove_listener(self._part_changed)
+        else:
+            self._notify(FloorAboutToBeInserted, level)
+
+        self._floors[level] = floor
+        floor.add_listener(self._part_changed)
+        self._invalidate_level_heights(level)
+
+        if replaced_floor is not None:
+            self._changed(FloorRegenerated, level)
+        else:
+            self._changed(FloorInserted, level)
 
     def get_floor_at_level(self, level=0):
         if not self._floors.__contains__(level):
@@ -31,26 +55,183 @@ class Building(Element):
         return self._floors.__contains__(level)
 
     def remove_floor(self, level=0):
-        self._floors.pop(level)
+        self._notify(FloorAboutToBeRemoved, level)
+
+        floor = self._floors.pop(level)
+        floor.remove_listener(self._part_changed)
+        self._invalidate_level_heights(level)
+
+        self._changed(FloorRemoved, level, floor)
+
+    def insert_floor(self, floor=Floor()):
+        level = floor.get_level()
+        self._notify(FloorAboutToBeInserted, level)
+
+        # move following floors one level up
+        moved_levels = {}
+        for cur_level in reversed(range(level, self.get_floor_count())):
+            cur_floor = self._floors.pop(cur_level)
+            cur_floor.set_level(cur_level + 1)
+            self._floors[cur_level + 1] = cur_floor
+            moved_levels[cur_level] = cur_level + 1
+
+        self._floors[level] = floor
+        floor.add_listener(self._part_changed)
+        self._invalidate_level_heights(level)
+
+        # the insertion is completed before the moved floors are reported
+        self._changed(FloorInserted, level)
+        if len(moved_levels) > 0:
+            self._notify(FloorsMoved, moved_levels)
+
+    def swap_floors(self, level_1=0, level_2=1):
+        floor_1 = self.get_floor_at_level(level_1)
+        floor_2 = self.get_floor_at_level(level_2)
+
+        # switch floor levels
+        floor_1.set_level(level_2)
+        floor_2.set_level(level_1)
+
+        self._floors[level_2] = floor_1
+        self._floors[level_1] = floor_2
+        self._invalidate_level_heights(min(level_1, level_2))
+
+        self._changed(FloorsMoved, {level_1: level_2, level_2: level_1})
+
+    # moves the floors from start to end level (and the roof) relative with a single scene call
+    # and changes their levels by level_offset in one pass
+    def move_floors(self, start_level=0, end_level=0, direction=(0, 0, 0), level_offset=0, move_roof=False):
+        floors = [self._floors[level] for level in range(start_level, end_level + 1) if self._floors.has_key(level)]
+
+        # move
+        objects = [floor.get_object() for floor in floors]
+        if move_roof and self._roof is not None:
+            objects.append(self._roof.get_object())
+
+        if len(objects) > 0 and tuple(direction) != (0, 0, 0):
+            mc.move(direction[0], direction[1], direction[2], objects, relative=True, localSpace=True)
+
+        # change levels
+        if level_offset == 0 or len(floors) == 0:
+            return
+
+        for floor in floors:
+            self._floors.pop(floor.get_level())
+
+        for floor in floors:
+            floor.set_level(floor.get_level() + level_offset)
+            self._floors[floor.get_level()] = floor
+
+        self._invalidate_level_heights(min(start_level, start_level + level_offset))
+
+        self._changed(FloorsMoved, dict((floor.get_level() - level_offset, floor.get_level()) for floor in floors))
+
+    # replaces all floors, floors_by_level is a dict of level -> floor
+    def set_floors(self, floors_by_level={}):
+        self._notify(FloorsAboutToBeReset)
+
+        for floor in self._floors.values():
+            floor.remove_listener(self._part_changed)
+
+        self._floors = {}
+        for level in floors_by_level.keys():
+            floor = floors_by_level[level]
+            floor.set_level(level)
+            floor.add_listener(self._part_changed)
+            self._floors[level] = floor
+
+        self._invalidate_level_heights(0)
+
+        self._changed(FloorsReset)
+
+    # level heights
+    def get_level_height(self, level=0, building_template=None):
+        # extend the cumulative heights up to the level
+        level_heights = self._level_heights
+        while len(level_heights) <= level:
+            cur_level = len(level_heights) - 1
+            level_heights.append(level_heights[cur_level] + self.get_floor_height(cur_level, building_template))
+
+        return level_heights[level]
+
+    def get_floor_height(self, level=0, building_template=None):
+        floor = self.get_floor_at_level(level)
+
+        # floors loaded from old meta data have no height -> take it from the template
+        if floor.get_height() is None:
+            if building_template is None:
+                mc.error("Floor at level {} has no height and no template is given.".format(level))
+                return 0
+
+            floor_template = building_template.get_floor_template(floor.get_template_id())
+            floor.set_height(floor_template.unit[1])
+
+        return floor.get_height()
+
+    def _invalidate_level_heights(self, level=0):
+        del self._level_heights[level + 1:]
+
+    # state of the floor stack and the roof, used to roll back cancelled operations
+    # floors and roofs are replaced by the generator, so only the levels and the objects of destroyed ones change
+    def get_state(self):
+        floors = [(floor, level, floor._object) for level, floor in self._floors.items()]
+        roof_object = self._roof._object if self._roof is not None else None
+
+        return floors, self._roof, roof_object
+
+    def set_state(self, state=None):
+        floors, roof, roof_object = state
+
+        floors_by_level = {}
+        for floor, level, floor_object in floors:
+            floor._object = floor_object
+            floors_by_level[level] = floor
+        self.set_floors(floors_by_level)
+
+        if roof is None:
+            self.remove_roof()
+        else:
+            roof._object = roof_object
+            self.set_roof(roof)
 
     # roof
     def set_roof(self, roof=Roof()):
+        if self._roof is not None:
+            self._roof.remove_listener(self._part_changed)
+
         self._roof = roof
+        roof.add_listener(self._part_changed)
+
+        self._changed(RoofReplaced, roof)
 
     def get_roof(self):
         return self._roof
 
     def remove_roof(self):
+        if self._roof is not None:
+            self._roof.remove_listener(self._part_changed)
+
         self._roof = None
 
+        self._changed(RoofReplaced, None)
+
     # helper
+    # notifies the listeners about the change and the outdated meta data
+    def _changed(self, event_type=ChangeEvent, *args):
+        self._notify(event_type, *args)
+        self._notify(MetadataDirty)
+
+    # forwards the changes of the floors and the roof
+    def _part_changed(self, event=None):
+        self._dispatch(event)
+        self._notify(MetadataDirty)
 
     # serialization
     def get_serializable(self):
         result = {
             "object": self.get_object(),
             "floors": self.__get_floors_serializable(),
-            "roof"  : self._roof.get_serializable(),
+            "roof"  : self._roof.get_serializable() if self._roof is not None else None,
             "template_id": self._template_id,
         }
 
@@ -63,8 +244,32 @@ class Building(Element):
 
         return result
 
+    # writes the compact serialization to the meta data of the building root
+    def save_metadata(self, compression=None):
+        self.write_metadata(json.dumps(self.get_compact_serializable(compression)))
+        building_registry.register(self.get_object(), self._template_id)
+
+    # compact, versioned serialization used for the meta data
+    # compression is None or "zlib" for the packed elements
+    def get_compact_serializable(self, compression=None):
+        building_object = self.get_object()
+
+        return {
+            "version": kMetadataVersion,
+            "compression": compression,
+            "object": building_object,
+            "template_id": self._template_id,
+            "floors": [self._floors[level].get_compact_serializable(building_object, compression)
+                       for level in range(self.get_floor_count())],
+            "roof": self._roof.get_compact_serializable(building_object, compression) if self._roof is not None else None,
+        }
+
     @staticmethod
     def get_from_serializable(serializable={}):
+        # compact format?
+        if serializable.has_key("version"):
+            return Building.get_from_compact_serializable(serializable)
+
         result = Building(serializable["object"], serializable["template_id"])
 
         # load floors
@@ -72,7 +277,25 @@ class Building(Element):
             floor = Floor.get_from_serializable(serializable["floors"][level])
             result.add_floor(floor)
 
-        # load roof
-        result.set_roof(Roof.get_from_serializable(serializable["roof"]))
+        # load roof, buildings are saved before their roof is created
+        if serializable.get("roof") is not None:
+            result.set_roof(Roof.get_from_serializable(serializable["roof"]))
+
+        return result
+
+    @staticmethod
+    def get_from_compact_serializable(serializable={}):
+        building_object = serializable["object"]
+        compression = serializable["compression"]
+        result = Building(building_object, serializable["template_id"])
+
+        # load floors
+        for level in range(len(serializable["floors"])):
+            floor = Floor.get_from_compact_serializable(serializable["floors"][level], level, building_object, compression)
+            result.add_floor(floor)
+
+        # load roof, buildings are saved before their roof is created
+        if serializable["roof"] is not None:
+            result.set_roof(Roof.get_from_compact_serializable(serializable["roof"], building_object, compression))
 
         return result
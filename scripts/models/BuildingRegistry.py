@@ -0,0 +1,127 @@
+import json
+from Element import *
+
+# maya is optional, models are also used for planning outside of a maya session
+try:
+    import maya.cmds as mc
+except ImportError:
+    mc = None
+
+# the api is only needed for the scene callbacks
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+
+# registry of the buildings in the scene, buildings are the nodes with the meta data attribute
+# all buildings are found with one query of the attribute, the scene is never iterated node by node
+# the registry is only kept while its scene callbacks are registered, otherwise every call queries the scene
+# only added transforms which already have the attribute (e.g. when a deletion is undone) are registered directly,
+# buildings created by the generator are registered by Building.save_metadata
+# removed and renamed buildings are updated directly, imported and referenced files invalidate the registry
+# buildings saved by Building.save_metadata are registered with their template id
+class BuildingRegistry:
+
+    def __init__(self):
+        # building object -> template id (None until it is read from the meta data)
+        self._buildings = None
+
+        self._callback_ids = []
+
+    def get_building_ids(self):
+        self._update()
+        return sorted(self._buildings.keys())
+
+    def has_building(self, building_id="building"):
+        self._update()
+        return self._buildings.has_key(building_id)
+
+    def get_template_id(self, building_id="building"):
+        self._update()
+
+        # read template id once
+        if self._buildings[building_id] is None:
+            self._buildings[building_id] = self.get_metadata(building_id)["template_id"]
+
+        return self._buildings[building_id]
+
+    # location of the meta data of a building
+    @staticmethod
+    def get_metadata_plug(building_id="building"):
+        return building_id + "." + Element.get_meta_data_key()
+
+    def get_metadata(self, building_id="building"):
+        if not self.has_building(building_id):
+            mc.error("There is no building " + building_id + " in the scene.")
+            return None
+
+        return json.loads(mc.getAttr(self.get_metadata_plug(building_id)))
+
+    def register(self, building_id="building", template_id=None):
+        if self._buildings is not None:
+            self._buildings[building_id] = template_id
+
+    def invalidate(self):
+        self._buildings = None
+
+    def _update(self):
+        # not cached or scene changed?
+        if not self.has_callbacks() or self._buildings is None:
+            self._buildings = dict.fromkeys(self._find_buildings())
+
+    @staticmethod
+    def _find_buildings():
+        return mc.ls("*." + Element.get_meta_data_key(), objectsOnly=True, recursive=True) or []
+
+    # region Callbacks
+    def add_callbacks(self):
+        if self.has_callbacks():
+            return
+
+        self.invalidate()
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(self._node_added, "transform"),
+            om.MDGMessage.addNodeRemovedCallback(self._node_removed, "transform"),
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), self._name_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterImport, self._scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterCreateReference, self._scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterLoadReference, self._scene_changed),
+        ]
+
+    def remove_callbacks(self):
+        if not self.has_callbacks():
+            return
+
+        om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+        self.invalidate()
+
+    def has_callbacks(self):
+        return len(self._callback_ids) > 0
+
+    def _node_added(self, node, client_data=None):
+        if self._buildings is None:
+            return
+
+        node = om.MFnDependencyNode(node)
+        if node.hasAttribute(Element.get_meta_data_key()) and not self._buildings.has_key(node.name()):
+            self._buildings[node.name()] = None
+
+    def _node_removed(self, node, client_data=None):
+        if self._buildings is not None:
+            self._buildings.pop(om.MFnDependencyNode(node).name(), None)
+
+    def _name_changed(self, node, previous_name="", client_data=None):
+        if self._buildings is not None and self._buildings.has_key(previous_name):
+            self._buildings[om.MFnDependencyNode(node).name()] = self._buildings.pop(previous_name)
+
+    def _scene_changed(self, client_data=None):
+        self.invalidate()
+    # endregion
+
+
+# registry shared by the generator and the gui
+building_registry = BuildingRegistry()
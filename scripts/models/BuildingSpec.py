@@ -0,0 +1,48 @@
+from Templates import *
+from GlobalDefinitions import *
+
+
+# a BuildingSpec describes a building to generate in a batch
+# floor_templates is a list with a template id per floor (from the ground up) or kRandomTemplate,
+# in which case floor_count floors with random valid templates are created
+# all random choices and the seeds of the floors and roof are derived from the seed of the spec
+class BuildingSpec(Object):
+    def __init__(self, id="new_building", position=(0, 0, 0), template=BuildingTemplate(), floor_templates=kRandomTemplate,
+                 roof_template=kRandomTemplate, floor_count=1, seed=None):
+        self.id = id
+        self.position = position
+        self.template = template
+        self.floor_templates = floor_templates
+        self.roof_template = roof_template
+        self.floor_count = floor_count
+        self.seed = seed
+
+    def get_floor_count(self):
+        if self.floor_templates == kRandomTemplate:
+            return self.floor_count
+
+        return len(self.floor_templates)
+
+    # serialization, the building template is referenced by its id
+    def get_serializable(self):
+        return {
+            "id": self.id,
+            "position": self.position,
+            "template_id": self.template.id,
+            "floor_templates": self.floor_templates,
+            "roof_template": self.roof_template,
+            "floor_count": self.floor_count,
+            "seed": self.seed,
+        }
+
+    @staticmethod
+    def get_from_serializable(serializable={}, templates={}):
+        template_id = serializable["template_id"]
+        if not templates.has_key(template_id):
+            mc.error("Building template \"{}\" of building \"{}\" does not exist.".format(template_id, serializable["id"]))
+            return None
+
+        return BuildingSpec(serializable["id"], tuple(serializable.get("position", (0, 0, 0))), templates[template_id],
+                            serializable.get("floor_templates", kRandomTemplate),
+                            serializable.get("roof_template", kRandomTemplate),
+                            serializable.get("floor_count", 1), serializable.get("seed"))
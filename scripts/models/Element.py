@@ -1,11 +1,17 @@
-import maya.cmds as mc
 from Object import *
 import json
 
+# maya is optional, models are also used for planning outside of a maya session
+try:
+    import maya.cmds as mc
+except ImportError:
+    mc = None
+
 
 # An Element represents an object in the scene by its name
 # Elements provide certain methods to modify the object
 class Element(Object):
+    __slots__ = ("_object",)
 
     # static definitions
     __META_KEY = 'metaData'
@@ -127,9 +133,11 @@ class Element(Object):
             mc.error("Element has been destroyed, cannot write meta data.")
             return
 
-        # replace ' with "
-        data_string = str(data_dict)
-        data_string = data_string.replace("'", '"')
+        # already serialized?
+        if isinstance(data_dict, basestring):
+            data_string = data_dict
+        else:
+            data_string = json.dumps(data_dict)
 
         # does it exist?
         if mc.objExists(self._object):
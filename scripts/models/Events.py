@@ -0,0 +1,117 @@
+# change events of buildings, floors and roofs
+# listeners are called with the event after the model has been changed,
+# only the AboutToBe events are sent before the floor stack changes (e.g. for the row changes of qt models)
+
+
+# base of all change events, source is the building, floor or roof which changed
+class ChangeEvent(object):
+    def __init__(self, source=None):
+        self.source = source
+
+
+# a floor is about to be added to the empty level, followed by FloorInserted
+class FloorAboutToBeInserted(ChangeEvent):
+    def __init__(self, source=None, level=0):
+        ChangeEvent.__init__(self, source)
+        self.level = level
+
+
+# a floor has been added to the empty level
+class FloorInserted(ChangeEvent):
+    def __init__(self, source=None, level=0):
+        ChangeEvent.__init__(self, source)
+        self.level = level
+
+
+# the floor at the level is about to be removed, followed by FloorRemoved
+class FloorAboutToBeRemoved(ChangeEvent):
+    def __init__(self, source=None, level=0):
+        ChangeEvent.__init__(self, source)
+        self.level = level
+
+
+# the floor has been removed, its level is empty until other floors are moved or inserted
+class FloorRemoved(ChangeEvent):
+    def __init__(self, source=None, level=0, floor=None):
+        ChangeEvent.__init__(self, source)
+        self.level = level
+        self.floor = floor
+
+
+# floors changed their levels, levels is a dict of old level -> new level
+class FloorsMoved(ChangeEvent):
+    def __init__(self, source=None, levels={}):
+        ChangeEvent.__init__(self, source)
+        self.levels = levels
+
+
+# the floor at the level has been replaced by a new one
+class FloorRegenerated(ChangeEvent):
+    def __init__(self, source=None, level=0):
+        ChangeEvent.__init__(self, source)
+        self.level = level
+
+
+# all floors are about to be replaced at once, followed by FloorsReset
+class FloorsAboutToBeReset(ChangeEvent):
+    pass
+
+
+# all floors have been replaced at once
+class FloorsReset(ChangeEvent):
+    pass
+
+
+# the roof has been set or removed, roof is None if it has been removed
+class RoofReplaced(ChangeEvent):
+    def __init__(self, source=None, roof=None):
+        ChangeEvent.__init__(self, source)
+        self.roof = roof
+
+
+# elements have been added to or removed from the floor or roof
+class ElementsChanged(ChangeEvent):
+    pass
+
+
+# the meta data of the building does not match the building anymore
+class MetadataDirty(ChangeEvent):
+    pass
+
+
+# base for models which report their changes to listeners
+# a listener is a callable which takes the event
+class ChangeNotifier(object):
+    __slots__ = ()
+
+    def __init__(self):
+        # created with the first listener, most models are never observed
+        self._listeners = None
+
+    def add_listener(self, listener=None):
+        if self._listeners is None:
+            self._listeners = []
+
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener=None):
+        if self._listeners is not None and listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def has_listeners(self):
+        return bool(self._listeners)
+
+    # the event is only created if there are listeners
+    def _notify(self, event_type=ChangeEvent, *args):
+        if not self._listeners:
+            return
+
+        self._dispatch(event_type(self, *args))
+
+    def _dispatch(self, event=None):
+        if not self._listeners:
+            return
+
+        # listeners may remove themselves
+        for listener in list(self._listeners):
+            listener(event)
@@ -1,18 +1,34 @@
+from array import array
 from Blueprints import *
+from Metadata import *
 from GlobalDefinitions import *
+from Events import *
 
 
 # a Floor is a collection of Walls and Corners on a certain level
-class Floor (Element):
+class Floor (Element, ChangeNotifier):
 
-    def __init__(self, object="new_floor", level=0, template_id="new_floor_template", seed=None):
+    def __init__(self, object="new_floor", level=0, template_id="new_floor_template", seed=None, height=None):
         Element.__init__(self, object)
+        ChangeNotifier.__init__(self)
 
         self._level = level
-        self._walls = {}
-        self._corners = {}
         self._template_id = template_id
         self._seed = seed
+        self._height = height
+        self._layout = None
+
+        # elements of the compact meta data (serializable, building object, compression), unpacked when they are needed
+        self._packed_elements = None
+
+        # walls and corners are stored in columns, Wall and Corner objects are only created when they are requested
+        # names are stored as None if they can be derived from the name of the floor
+        self._blueprints = BlueprintPalette()
+        self._wall_names = {}
+        self._wall_blueprints = {}
+        self._wall_indices = {}
+        self._corner_names = [None] * 4
+        self._corner_blueprints = array("i", [-1] * 4)
 
     def get_template_id(self):
         return self._template_id
@@ -26,29 +42,117 @@ class Floor (Element):
     def get_seed(self):
         return self._seed
 
+    # height of the floor (unit height of its template when it was created)
+    def get_height(self):
+        return self._height
+
+    def set_height(self, height=4):
+        self._height = height
+
+    # layout of the plan the floor was created from
+    def get_layout(self):
+        return self._layout
+
+    def set_layout(self, layout=None):
+        self._layout = layout
+
     # walls
     def add_wall(self, wall=Wall()):
+        self._load_elements()
+        side = wall.get_side()
+        index = wall.get_index()
+
         # add entry if it does not exist
-        if not self._walls.has_key(wall.get_side()):
-            self._walls[wall.get_side()] = []
+        if not self._wall_names.has_key(side):
+            self._wall_names[side] = []
+            self._wall_blueprints[side] = array("i")
+            self._wall_indices[side] = array("i")
 
-        self._walls[wall.get_side()].append(wall)
+        self._wall_names[side].append(self._get_stored_name(wall.get_object(), self._get_wall_name(side, index)))
+        self._wall_blueprints[side].append(self._blueprints.get_index(wall.get_blueprint()))
+        self._wall_indices[side].append(-1 if index is None else index)
+        self._notify(ElementsChanged)
 
     def get_walls(self, side=kFront):
-        return self._walls[side]
+        self._load_elements()
+        return [self._get_wall(side, i) for i in range(len(self._wall_names[side]))]
 
     def remove_wall(self, wall=Wall()):
-        self._walls[wall.get_side()].pop(wall)
+        self._load_elements()
+        side = wall.get_side()
+
+        for i in range(len(self._wall_names[side])):
+            if self._get_wall(side, i).get_object() == wall.get_object():
+                del self._wall_names[side][i]
+                del self._wall_blueprints[side][i]
+                del self._wall_indices[side][i]
+                self._notify(ElementsChanged)
+                return
+
+    def _get_wall(self, side=kFront, i=0):
+        index = self._wall_indices[side][i]
+        if index == -1:
+            index = None
+
+        name = self._wall_names[side][i] or self._get_wall_name(side, index)
+        return Wall(name, side, self._blueprints.get_blueprint(self._wall_blueprints[side][i]), index)
 
     # corners
     def add_corner(self,corner=Corner()):
-        self._corners[corner.get_side()] = corner
+        self._load_elements()
+        side = corner.get_side()
+
+        self._corner_names[side] = self._get_stored_name(corner.get_object(), self._get_corner_name(side))
+        self._corner_blueprints[side] = self._blueprints.get_index(corner.get_blueprint())
+        self._notify(ElementsChanged)
 
     def get_corner(self, side=kFront):
-        return self._corners[side]
+        self._load_elements()
+
+        # no corner on the side?
+        if self._corner_blueprints[side] == -1:
+            mc.error("Floor has no corner on side " + side_names[side])
+            return
+
+        name = self._corner_names[side] or self._get_corner_name(side)
+        return Corner(name, side, self._blueprints.get_blueprint(self._corner_blueprints[side]))
 
     def remove_corner(self, corner=Wall()):
-        self._corners.pop(corner.get_side())
+        self._load_elements()
+        self._corner_names[corner.get_side()] = None
+        self._corner_blueprints[corner.get_side()] = -1
+        self._notify(ElementsChanged)
+
+    def _get_corner_sides(self):
+        return [side for side in range(4) if self._corner_blueprints[side] != -1]
+
+    # all walls and corners
+    def get_elements(self):
+        self._load_elements()
+
+        result = []
+        for side in self._wall_names.keys():
+            result.extend(self.get_walls(side))
+        result.extend([self.get_corner(side) for side in self._get_corner_sides()])
+
+        return result
+
+    # names of the elements by the formats of GlobalDefinitions, the name of the floor already contains building and level
+    def _get_wall_name(self, side=kFront, index=0):
+        if self._object is None or index is None:
+            return None
+
+        return "{}_{}_wall_{}".format(self._object, side_names[side], index)
+
+    def _get_corner_name(self, side=kFront):
+        if self._object is None:
+            return None
+
+        return "{}_{}_corner".format(self._object, side_names[side])
+
+    @staticmethod
+    def _get_stored_name(name="new_wall", derived_name=None):
+        return None if name == derived_name else name
 
     # serialization
     def get_serializable(self):
@@ -58,15 +162,19 @@ class Floor (Element):
             "walls": self.__get_walls_serializable(),
             "corners": self.__get_corners_serializable(),
             "template_id": self._template_id,
-            "seed": self._seed
+            "seed": self._seed,
+            "height": self._height,
+            "layout": self._layout
         }
         return result
 
     def __get_walls_serializable(self):
+        self._load_elements()
+
         result = {}
-        for side in self._walls.keys():
+        for side in self._wall_names.keys():
             s_walls = []
-            for wall in self._walls[side]:
+            for wall in self.get_walls(side):
                 s_walls.append(wall.get_serializable())
 
             result[side] = s_walls
@@ -74,9 +182,11 @@ class Floor (Element):
         return result
 
     def __get_corners_serializable(self):
+        self._load_elements()
+
         result = {}
-        for side in self._corners.keys():
-            result[side] = self._corners[side].get_serializable()
+        for side in self._get_corner_sides():
+            result[side] = self.get_corner(side).get_serializable()
 
         return result
 
@@ -85,7 +195,9 @@ class Floor (Element):
         floor = Floor(serializable["object"],
                       int(serializable["level"]),
                       serializable["template_id"],
-                      int(serializable["seed"]))
+                      int(serializable["seed"]),
+                      serializable.get("height"))
+        floor.set_layout(serializable.get("layout"))
 
         # add walls
         for side in serializable["walls"]:
@@ -96,4 +208,64 @@ class Floor (Element):
         for side in serializable["corners"]:
             floor.add_corner(Corner.get_from_serializable(serializable["corners"][side]))
 
-        return floor
\ No newline at end of file
+        return floor
+
+    # compact serialization, the names of the elements are derived from the building
+    def get_compact_serializable(self, building_object="building", compression=None):
+        # elements have not been unpacked -> reuse them
+        if self._packed_elements is not None and self._packed_elements[1:] == (building_object, compression):
+            result = dict(self._packed_elements[0])
+        else:
+            result = pack_elements(self.get_elements(), building_object, self._get_name_level(building_object), compression)
+            result["name_level"] = self._get_name_level(building_object)
+
+        result["object"] = self._object
+        result["template_id"] = self._template_id
+        result["seed"] = self._seed
+        result["height"] = self._height
+        result["layout"] = self._layout
+        return result
+
+    # level in the names of the elements, floors keep the names of the level they were created on
+    def _get_name_level(self, building_object="building"):
+        if self._packed_elements is not None:
+            return self._packed_elements[0]["name_level"]
+
+        prefix = building_object + "_floor_"
+        for corner in [self.get_corner(side) for side in self._get_corner_sides()]:
+            if corner.get_object().startswith(prefix):
+                name_level = corner.get_object()[len(prefix):].split("_")[0]
+                if name_level.isdigit():
+                    return int(name_level)
+
+        return self._level
+
+    def _load_elements(self):
+        if self._packed_elements is None:
+            return
+
+        serializable, building_object, compression = self._packed_elements
+        self._packed_elements = None
+
+        # unpacking does not change the elements, listeners are not notified
+        listeners = self._listeners
+        self._listeners = None
+        try:
+            for element in unpack_elements(serializable, building_object, serializable["name_level"], compression):
+                if isinstance(element, Wall):
+                    self.add_wall(element)
+                else:
+                    self.add_corner(element)
+        finally:
+            self._listeners = listeners
+
+    @staticmethod
+    def get_from_compact_serializable(serializable={}, level=0, building_object="building", compression=None):
+        floor = Floor(serializable["object"], level, serializable["template_id"], serializable["seed"],
+                      serializable["height"])
+        floor.set_layout(serializable["layout"])
+
+        # elements are unpacked when they are needed
+        floor._packed_elements = (serializable, building_object, compression)
+
+        return floor
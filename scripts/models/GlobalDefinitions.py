@@ -1,6 +1,8 @@
 # enums
 kFront, kBack, kLeft, kRight = range(4)
 side_names = ['front', 'back', 'left', 'right']
+kWallElement, kCornerElement, kTileElement, kEdgeElement = range(4)
+kDuplicateCopy, kDuplicateInstance, kDuplicateLean = range(3)
 
 # formatting of building parts
 building_root_format        = "{}"                   # NewBuilding_grp
@@ -21,3 +23,6 @@ roof_edges_root_format       = "{}_edges_{}"         # NewBuilding_floor_1_right
 roof_tile_format    = "{}_roof_tile_{}_{}"           # NewBuilding_roof_tile_1_1
 roof_corner_format  = "{}_roof_{}_corner"            # NewBuilding_roof_right_corner
 roof_edge_format    = "{}_roof_{}_edge_{}"           # NewBuilding_roof_right_edge_1
+
+# template id of building specs for a random valid template
+kRandomTemplate = "random"
@@ -0,0 +1,94 @@
+import base64
+import struct
+import zlib
+from Blueprints import *
+from GlobalDefinitions import *
+
+# version of the compact meta data format, meta data without a version is the original format
+kMetadataVersion = 2
+
+
+# name an element gets by the formats of GlobalDefinitions
+def get_element_name(building_object="building", name_level=0, kind=kWallElement, side=kFront, index=0, tile_position=None):
+    if kind == kWallElement:
+        return floor_wall_format.format(building_object, str(name_level), side_names[side], index)
+    if kind == kCornerElement and name_level is not None:
+        return floor_corner_format.format(building_object, str(name_level), side_names[side])
+    if kind == kCornerElement:
+        return roof_corner_format.format(building_object, side_names[side])
+    if kind == kTileElement:
+        return roof_tile_format.format(building_object, str(tile_position[0]), str(tile_position[1]))
+    return roof_edge_format.format(building_object, side, str(index))
+
+
+# packs the elements of a floor or roof, name_level is the level in the names of floor elements (None for roofs)
+# each element is packed as five little endian ints: kind, side, index (or tile x), tile y and the index of its blueprint
+# only names which differ from the formats are stored
+def pack_elements(elements=[], building_object="building", name_level=None, compression=None):
+    blueprints = []
+    blueprint_indices = {}
+    names = {}
+    values = []
+
+    for i in range(len(elements)):
+        element = elements[i]
+        kind, side, tile_position, index = element.get_slot()
+
+        # blueprint palette
+        blueprint = element.get_blueprint()
+        if not blueprint_indices.has_key(blueprint):
+            blueprint_indices[blueprint] = len(blueprints)
+            blueprints.append(blueprint)
+
+        if tile_position is not None:
+            values.extend([kind, side, tile_position[0], tile_position[1], blueprint_indices[blueprint]])
+        else:
+            values.extend([kind, side, -1 if index is None else index, 0, blueprint_indices[blueprint]])
+
+        # name which can not be derived?
+        if element.get_object() != get_element_name(building_object, name_level, kind, side, index, tile_position):
+            names[str(i)] = element.get_object()
+
+    data = struct.pack("<{}i".format(len(values)), *values)
+    if compression == "zlib":
+        data = zlib.compress(data)
+
+    return {
+        "blueprints": blueprints,
+        "elements": base64.b64encode(data),
+        "names": names,
+    }
+
+
+def unpack_elements(serializable={}, building_object="building", name_level=None, compression=None):
+    data = base64.b64decode(serializable["elements"])
+    if compression == "zlib":
+        data = zlib.decompress(data)
+
+    blueprints = serializable["blueprints"]
+    names = serializable["names"]
+
+    values = struct.unpack("<{}i".format(len(data) // 4), data)
+    result = []
+    for i in range(len(values) // 5):
+        kind, side, index, tile_y, blueprint_index = values[i * 5:i * 5 + 5]
+        blueprint = blueprints[blueprint_index]
+
+        if kind == kTileElement:
+            tile_position = (index, tile_y)
+            name = names.get(str(i)) or get_element_name(building_object, name_level, kind, side, None, tile_position)
+            result.append(Tile(name, tile_position, blueprint))
+            continue
+
+        if index == -1:
+            index = None
+        name = names.get(str(i)) or get_element_name(building_object, name_level, kind, side, index)
+
+        if kind == kWallElement:
+            result.append(Wall(name, side, blueprint, index))
+        elif kind == kCornerElement:
+            result.append(Corner(name, side, blueprint))
+        else:
+            result.append(Edge(name, side, blueprint, index))
+
+    return result
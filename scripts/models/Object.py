@@ -1,6 +1,7 @@
 # Object is the base class for most types
 # Objects can be converted into a serialized and deserialized
 class Object(object):
+    __slots__ = ()
 
     # serialization
     def get_serializable(self):
@@ -0,0 +1,210 @@
+import copy
+from Object import Object
+from GlobalDefinitions import *
+
+
+# an ElementPlan describes a single element to place, without touching the scene
+class ElementPlan(Object):
+    def __init__(self, kind=kWallElement, blueprint="new_blueprint", name="new_element", position=(0, 0, 0),
+                 rotation=(0, 0, 0), parent="parent_object", side=kFront, tile_position=None, index=None):
+        self.kind = kind
+        self.blueprint = blueprint
+        self.name = name
+        self.position = position
+        self.rotation = rotation
+        self.parent = parent
+        self.side = side
+        self.tile_position = tile_position
+        self.index = index
+
+    # slot of the element in its floor or roof
+    def get_slot(self):
+        return self.kind, self.side, self.tile_position, self.index
+
+    # serialization
+    def get_serializable(self):
+        return {
+            "kind": self.kind,
+            "blueprint": self.blueprint,
+            "name": self.name,
+            "position": self.position,
+            "rotation": self.rotation,
+            "parent": self.parent,
+            "side": self.side,
+            "tile_position": self.tile_position,
+            "index": self.index,
+        }
+
+    @staticmethod
+    def get_from_serializable(serializable={}):
+        rotation = serializable["rotation"]
+        if rotation is not None:
+            rotation = tuple(rotation)
+
+        tile_position = serializable["tile_position"]
+        if tile_position is not None:
+            tile_position = tuple(tile_position)
+
+        return ElementPlan(serializable["kind"], serializable["blueprint"], serializable["name"],
+                           tuple(serializable["position"]), rotation,
+                           serializable["parent"], serializable["side"], tile_position, serializable.get("index"))
+
+
+# a GroupPlan describes a transform which groups elements (created only if it does not exist yet)
+class GroupPlan(Object):
+    def __init__(self, name="new_group", parent="parent_object", position=None):
+        self.name = name
+        self.parent = parent
+        self.position = position
+
+    # serialization
+    def get_serializable(self):
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "position": self.position,
+        }
+
+    @staticmethod
+    def get_from_serializable(serializable={}):
+        position = serializable["position"]
+        if position is not None:
+            position = tuple(position)
+
+        return GroupPlan(serializable["name"], serializable["parent"], position)
+
+
+# base class for the plans of a floor or roof: an ordered list of groups and elements
+class PartPlan(Object):
+    def __init__(self, object="new_part", template_id="new_template", seed=None):
+        self.object = object
+        self.template_id = template_id
+        self.seed = seed
+        self.groups = []
+        self.elements = []
+
+        # everything the positions of the elements depend on besides their slot
+        self.layout = None
+
+    def add_group(self, group=GroupPlan()):
+        self.groups.append(group)
+
+    def has_group(self, name="new_group"):
+        for group in self.groups:
+            if group.name == name:
+                return True
+        return False
+
+    def add_element(self, element=ElementPlan()):
+        self.elements.append(element)
+
+    def get_elements(self, kind=None):
+        if kind is None:
+            return self.elements
+
+        return [element for element in self.elements if element.kind == kind]
+
+    # copy of the plan with all groups and only the given elements
+    def get_partial_plan(self, elements=[]):
+        plan = copy.copy(self)
+        plan.elements = list(elements)
+        return plan
+
+    # serialization
+    def _get_base_serializable(self):
+        return {
+            "object": self.object,
+            "template_id": self.template_id,
+            "seed": self.seed,
+            "layout": self.layout,
+            "groups": [group.get_serializable() for group in self.groups],
+            "elements": [element.get_serializable() for element in self.elements],
+        }
+
+    def _load_base_serializable(self, serializable={}):
+        self.layout = serializable.get("layout")
+
+        for s_group in serializable["groups"]:
+            self.add_group(GroupPlan.get_from_serializable(s_group))
+
+        for s_element in serializable["elements"]:
+            self.add_element(ElementPlan.get_from_serializable(s_element))
+
+
+# plan of a single floor
+class FloorPlan(PartPlan):
+    def __init__(self, object="new_floor", level=0, template_id="new_floor_template", seed=None, height=4):
+        PartPlan.__init__(self, object, template_id, seed)
+        self.level = level
+        self.height = height
+
+    # serialization
+    def get_serializable(self):
+        result = self._get_base_serializable()
+        result["level"] = self.level
+        result["height"] = self.height
+        return result
+
+    @staticmethod
+    def get_from_serializable(serializable={}):
+        plan = FloorPlan(serializable["object"], serializable["level"], serializable["template_id"], serializable["seed"],
+                         serializable["height"])
+        plan._load_base_serializable(serializable)
+        return plan
+
+
+# plan of a roof
+class RoofPlan(PartPlan):
+    def __init__(self, object="new_roof", template_id="new_roof_template", seed=None):
+        PartPlan.__init__(self, object, template_id, seed)
+
+    # serialization
+    def get_serializable(self):
+        return self._get_base_serializable()
+
+    @staticmethod
+    def get_from_serializable(serializable={}):
+        plan = RoofPlan(serializable["object"], serializable["template_id"], serializable["seed"])
+        plan._load_base_serializable(serializable)
+        return plan
+
+
+# plans of all floors and the roof of a building
+class BuildingPlan(Object):
+    def __init__(self, id="new_building", template_id="new_building_template", position=(0, 0, 0), seed=None):
+        self.id = id
+        self.template_id = template_id
+        self.position = position
+        self.seed = seed
+        self.floor_plans = []
+        self.roof_plan = None
+
+    def add_floor_plan(self, floor_plan=FloorPlan()):
+        self.floor_plans.append(floor_plan)
+
+    def set_roof_plan(self, roof_plan=RoofPlan()):
+        self.roof_plan = roof_plan
+
+    # serialization
+    def get_serializable(self):
+        return {
+            "id": self.id,
+            "template_id": self.template_id,
+            "position": self.position,
+            "seed": self.seed,
+            "floor_plans": [floor_plan.get_serializable() for floor_plan in self.floor_plans],
+            "roof_plan": self.roof_plan.get_serializable() if self.roof_plan is not None else None,
+        }
+
+    @staticmethod
+    def get_from_serializable(serializable={}):
+        plan = BuildingPlan(serializable["id"], serializable["template_id"], tuple(serializable["position"]),
+                            serializable["seed"])
+
+        for s_floor_plan in serializable["floor_plans"]:
+            plan.add_floor_plan(FloorPlan.get_from_serializable(s_floor_plan))
+
+        if serializable["roof_plan"] is not None:
+            plan.set_roof_plan(RoofPlan.get_from_serializable(serializable["roof_plan"]))
+
+        return plan
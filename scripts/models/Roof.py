@@ -1,17 +1,36 @@
+from array import array
 from Blueprints import *
+from Metadata import *
 from GlobalDefinitions import *
+from Events import *
 
 
 # a Roof is a collection of Tile and Corners
-class Roof (Element):
+class Roof (Element, ChangeNotifier):
     def __init__(self, object="new_roof", template_id="new_roof_template", seed=None):
         Element.__init__(self, object)
+        ChangeNotifier.__init__(self)
 
-        self._tiles = {}
-        self._corners = {}
-        self._edges = {}
         self._template_id = template_id
         self._seed = seed
+        self._layout = None
+
+        # elements of the compact meta data (serializable, building object, compression), unpacked when they are needed
+        self._packed_elements = None
+
+        # tiles, edges and corners are stored in columns, their objects are only created when they are requested
+        # tiles are stored in a grid (x * depth + y, -1 for positions without a tile) which grows with the added tiles
+        # names are stored as None if they can be derived from the name of the roof
+        self._blueprints = BlueprintPalette()
+        self._tile_width = 0
+        self._tile_depth = 0
+        self._tile_names = []
+        self._tile_blueprints = array("i")
+        self._edge_names = {}
+        self._edge_blueprints = {}
+        self._edge_indices = {}
+        self._corner_names = [None] * 4
+        self._corner_blueprints = array("i", [-1] * 4)
 
     def get_template_id(self):
         return self._template_id
@@ -19,94 +38,289 @@ class Roof (Element):
     def get_seed(self):
         return self._seed
 
+    # layout of the plan the roof was created from
+    def get_layout(self):
+        return self._layout
+
+    def set_layout(self, layout=None):
+        self._layout = layout
+
     # tiles
     def add_tile(self, tile=Tile()):
+        self._load_elements()
+
         tile_pos_x = tile.get_tile_position()[0]
         tile_pos_y = tile.get_tile_position()[1]
 
-        # add x entry if it does not exist
-        if not self._tiles.has_key(tile_pos_x):
-            self._tiles[tile_pos_x] = {}
+        # grow the grid, doubled to avoid a resize per row
+        if tile_pos_x >= self._tile_width or tile_pos_y >= self._tile_depth:
+            width = self._tile_width if tile_pos_x < self._tile_width else max(tile_pos_x + 1, self._tile_width * 2)
+            depth = self._tile_depth if tile_pos_y < self._tile_depth else max(tile_pos_y + 1, self._tile_depth * 2)
+            self._resize_tiles(width, depth)
 
-        self._tiles[tile_pos_x][tile_pos_y] = tile
+        i = tile_pos_x * self._tile_depth + tile_pos_y
+        self._tile_names[i] = self._get_stored_name(tile.get_object(), self._get_tile_name(tile_pos_x, tile_pos_y))
+        self._tile_blueprints[i] = self._blueprints.get_index(tile.get_blueprint())
+        self._notify(ElementsChanged)
 
     def get_tile(self, tile_position=(0, 0)):
+        self._load_elements()
+
         tile_pos_x = tile_position[0]
         tile_pos_y = tile_position[1]
 
         # no tile at position?
-        if not self._tiles.has_key(tile_pos_x) or not self._tiles[tile_pos_x].has_key(tile_pos_y) :
+        if not self._has_tile(tile_pos_x, tile_pos_y):
             mc.error("Roof has no tile at position " + str(tile_position))
             return
 
-        return self._tiles[tile_pos_x][tile_pos_y]
+        i = tile_pos_x * self._tile_depth + tile_pos_y
+        name = self._tile_names[i] or self._get_tile_name(tile_pos_x, tile_pos_y)
+        return Tile(name, (tile_pos_x, tile_pos_y), self._blueprints.get_blueprint(self._tile_blueprints[i]))
 
     def remove_tile(self, tile=Tile()):
+        self._load_elements()
+
         tile_pos_x = tile.get_tile_position()[0]
         tile_pos_y = tile.get_tile_position()[1]
 
-        self._tiles[tile_pos_x].pop(tile_pos_y)
+        i = tile_pos_x * self._tile_depth + tile_pos_y
+        self._tile_names[i] = None
+        self._tile_blueprints[i] = -1
+        self._notify(ElementsChanged)
+
+    def _has_tile(self, tile_pos_x=0, tile_pos_y=0):
+        if not 0 <= tile_pos_x < self._tile_width or not 0 <= tile_pos_y < self._tile_depth:
+            return False
+
+        return self._tile_blueprints[tile_pos_x * self._tile_depth + tile_pos_y] != -1
+
+    def _resize_tiles(self, width=1, depth=1):
+        names = [None] * (width * depth)
+        blueprints = array("i", [-1]) * (width * depth)
+
+        # copy the tiles to their index in the new grid
+        for x in range(self._tile_width):
+            for y in range(self._tile_depth):
+                names[x * depth + y] = self._tile_names[x * self._tile_depth + y]
+                blueprints[x * depth + y] = self._tile_blueprints[x * self._tile_depth + y]
+
+        self._tile_width = width
+        self._tile_depth = depth
+        self._tile_names = names
+        self._tile_blueprints = blueprints
 
     # edges
     def add_edge(self, edge=Edge()):
+        self._load_elements()
+        side = edge.get_side()
+        index = edge.get_index()
+
         # add entry if it does not exist
-        if not self._edges.has_key(edge.get_side()):
-            self._edges[edge.get_side()] = []
+        if not self._edge_names.has_key(side):
+            self._edge_names[side] = []
+            self._edge_blueprints[side] = array("i")
+            self._edge_indices[side] = array("i")
 
-        self._edges[edge.get_side()].append(edge)
+        self._edge_names[side].append(self._get_stored_name(edge.get_object(), self._get_edge_name(side, index)))
+        self._edge_blueprints[side].append(self._blueprints.get_index(edge.get_blueprint()))
+        self._edge_indices[side].append(-1 if index is None else index)
+        self._notify(ElementsChanged)
 
     def get_edges(self, side=kFront):
-        return self._edges[side]
+        self._load_elements()
+        return [self._get_edge(side, i) for i in range(len(self._edge_names[side]))]
 
     def remove_edge(self, edge=Edge()):
-        self._edges[edge.get_side()].pop(edge)
+        self._load_elements()
+        side = edge.get_side()
+
+        for i in range(len(self._edge_names[side])):
+            if self._get_edge(side, i).get_object() == edge.get_object():
+                del self._edge_names[side][i]
+                del self._edge_blueprints[side][i]
+                del self._edge_indices[side][i]
+                self._notify(ElementsChanged)
+                return
+
+    def _get_edge(self, side=kFront, i=0):
+        index = self._edge_indices[side][i]
+        if index == -1:
+            index = None
+
+        name = self._edge_names[side][i] or self._get_edge_name(side, index)
+        return Edge(name, side, self._blueprints.get_blueprint(self._edge_blueprints[side][i]), index)
 
     # corners
     def add_corner(self,corner=Corner()):
-        self._corners[corner.get_side()] = corner
+        self._load_elements()
+        side = corner.get_side()
+
+        self._corner_names[side] = self._get_stored_name(corner.get_object(), self._get_corner_name(side))
+        self._corner_blueprints[side] = self._blueprints.get_index(corner.get_blueprint())
+        self._notify(ElementsChanged)
 
     def get_corner(self, side=kFront):
-        return self._corners[side]
+        self._load_elements()
+
+        # no corner on the side?
+        if self._corner_blueprints[side] == -1:
+            mc.error("Roof has no corner on side " + side_names[side])
+            return
+
+        name = self._corner_names[side] or self._get_corner_name(side)
+        return Corner(name, side, self._blueprints.get_blueprint(self._corner_blueprints[side]))
 
     def remove_corner(self, corner=Wall()):
-        self._corners.pop(corner.get_side())
+        self._load_elements()
+        self._corner_names[corner.get_side()] = None
+        self._corner_blueprints[corner.get_side()] = -1
+        self._notify(ElementsChanged)
+
+    def _get_corner_sides(self):
+        return [side for side in range(4) if self._corner_blueprints[side] != -1]
+
+    # all tiles, edges and corners
+    def get_elements(self):
+        self._load_elements()
+
+        result = []
+        for x in range(self._tile_width):
+            for y in range(self._tile_depth):
+                if self._has_tile(x, y):
+                    result.append(self.get_tile((x, y)))
+        for side in self._edge_names.keys():
+            result.extend(self.get_edges(side))
+        result.extend([self.get_corner(side) for side in self._get_corner_sides()])
+
+        return result
+
+    # names of the elements by the formats of GlobalDefinitions, the name of the roof already contains the building
+    def _get_tile_name(self, tile_pos_x=0, tile_pos_y=0):
+        if self._object is None:
+            return None
+
+        return "{}_tile_{}_{}".format(self._object, tile_pos_x, tile_pos_y)
+
+    def _get_edge_name(self, side=kFront, index=0):
+        if self._object is None or index is None:
+            return None
+
+        return "{}_{}_edge_{}".format(self._object, side, index)
+
+    def _get_corner_name(self, side=kFront):
+        if self._object is None:
+            return None
+
+        return "{}_{}_corner".format(self._object, side_names[side])
+
+    @staticmethod
+    def _get_stored_name(name="new_tile", derived_name=None):
+        return None if name == derived_name else name
 
     # serialization
     def get_serializable(self):
         result = {
             "object" : self._object,
             "tiles": self.__get_tiles_serializable(),
+            "edges": self.__get_edges_serializable(),
             "corners": self.__get_corners_serializable(),
             "template_id": self._template_id,
-            "seed": self._seed
+            "seed": self._seed,
+            "layout": self._layout
         }
         return result
 
     def __get_tiles_serializable(self):
+        self._load_elements()
+
         result = []
-        for x in self._tiles.keys():
-            for y in self._tiles[x ]:
-                result.append(self._tiles[x][y].get_serializable())
+        for x in range(self._tile_width):
+            for y in range(self._tile_depth):
+                if self._has_tile(x, y):
+                    result.append(self.get_tile((x, y)).get_serializable())
+
+        return result
+
+    def __get_edges_serializable(self):
+        self._load_elements()
+
+        result = {}
+        for side in self._edge_names.keys():
+            result[side] = [edge.get_serializable() for edge in self.get_edges(side)]
 
         return result
 
     def __get_corners_serializable(self):
+        self._load_elements()
+
         result = {}
-        for side in self._corners.keys():
-            result[side] = self._corners[side].get_serializable()
+        for side in self._get_corner_sides():
+            result[side] = self.get_corner(side).get_serializable()
 
         return result
 
     @staticmethod
     def get_from_serializable(serializable={}):
         roof = Roof(serializable["object"], serializable["template_id"], int(serializable["seed"]))
+        roof.set_layout(serializable.get("layout"))
 
         # add tiles
         for tile in serializable["tiles"]:
             roof.add_tile(Tile.get_from_serializable(tile))
 
+        # add edges (not saved by older versions)
+        for side in serializable.get("edges", {}):
+            for s_edge in serializable["edges"][side]:
+                roof.add_edge(Edge.get_from_serializable(s_edge))
+
         # add corners
         for side in serializable["corners"]:
             roof.add_corner(Corner.get_from_serializable(serializable["corners"][side]))
 
-        return roof
\ No newline at end of file
+        return roof
+
+    # compact serialization, the names of the elements are derived from the building
+    def get_compact_serializable(self, building_object="building", compression=None):
+        # elements have not been unpacked -> reuse them
+        if self._packed_elements is not None and self._packed_elements[1:] == (building_object, compression):
+            result = dict(self._packed_elements[0])
+        else:
+            result = pack_elements(self.get_elements(), building_object, None, compression)
+
+        result["object"] = self._object
+        result["template_id"] = self._template_id
+        result["seed"] = self._seed
+        result["layout"] = self._layout
+        return result
+
+    def _load_elements(self):
+        if self._packed_elements is None:
+            return
+
+        serializable, building_object, compression = self._packed_elements
+        self._packed_elements = None
+
+        # unpacking does not change the elements, listeners are not notified
+        listeners = self._listeners
+        self._listeners = None
+        try:
+            for element in unpack_elements(serializable, building_object, None, compression):
+                if isinstance(element, Tile):
+                    self.add_tile(element)
+                elif isinstance(element, Edge):
+                    self.add_edge(element)
+                else:
+                    self.add_corner(element)
+        finally:
+            self._listeners = listeners
+
+    @staticmethod
+    def get_from_compact_serializable(serializable={}, building_object="building", compression=None):
+        roof = Roof(serializable["object"], serializable["template_id"], serializable["seed"])
+        roof.set_layout(serializable["layout"])
+
+        # elements are unpacked when they are needed
+        roof._packed_elements = (serializable, building_object, compression)
+
+        return roof
@@ -0,0 +1,89 @@
+import json
+import os
+import urllib
+from Templates import *
+
+
+# library of building templates, stored as one json file per template in a directory
+# templates are only loaded when they are requested by their id
+# changed templates are marked as dirty and written with flush(), so many edits result in one write per template
+class TemplateLibrary:
+
+    __extension = ".json"
+
+    def __init__(self, directory="templates"):
+        self._directory = directory
+
+        # loaded templates by id
+        self._templates = {}
+        self._dirty = set()
+
+    def get_directory(self):
+        return self._directory
+
+    # ids of all templates in the library, no template is loaded
+    def get_template_ids(self):
+        if not os.path.isdir(self._directory):
+            return sorted(self._templates.keys())
+
+        ids = set(self._templates.keys())
+        for file_name in os.listdir(self._directory):
+            if file_name.endswith(self.__extension):
+                ids.add(urllib.unquote(file_name[:-len(self.__extension)]))
+
+        return sorted(ids)
+
+    def has_template(self, id="new_building_template"):
+        return self._templates.has_key(id) or os.path.isfile(self._get_path(id))
+
+    def get_template(self, id="new_building_template"):
+        # load once
+        if not self._templates.has_key(id):
+            if not os.path.isfile(self._get_path(id)):
+                return None
+
+            with open(self._get_path(id), "r") as template_file:
+                self._templates[id] = BuildingTemplate.get_from_serializable(json.load(template_file))
+
+        return self._templates[id]
+
+    def add_template(self, template=BuildingTemplate()):
+        self._templates[template.id] = template
+        self.mark_dirty(template)
+
+    def remove_template(self, template=BuildingTemplate()):
+        self._templates.pop(template.id, None)
+        self._dirty.discard(template.id)
+
+        if os.path.isfile(self._get_path(template.id)):
+            os.remove(self._get_path(template.id))
+
+    # saving
+    def mark_dirty(self, template=BuildingTemplate()):
+        self._templates[template.id] = template
+        self._dirty.add(template.id)
+
+    def has_changes(self):
+        return len(self._dirty) > 0
+
+    def flush(self):
+        for id in self._dirty:
+            self.save_template(self._templates[id])
+
+        self._dirty.clear()
+
+    def save_template(self, template=BuildingTemplate()):
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+
+        # write next to the file and replace it, a failed write keeps the last saved template
+        path = self._get_path(template.id)
+        with open(path + ".tmp", "w") as template_file:
+            json.dump(template.get_serializable(), template_file, indent=2)
+
+        if os.path.isfile(path):
+            os.remove(path)
+        os.rename(path + ".tmp", path)
+
+    def _get_path(self, id="new_building_template"):
+        return os.path.join(self._directory, urllib.quote(id, safe="") + self.__extension)
@@ -1,5 +1,11 @@
 from Object import Object
-import maya.cmds as mc
+from BlueprintCache import blueprint_cache
+
+# maya is optional, templates are also used for planning outside of a maya session
+try:
+    import maya.cmds as mc
+except ImportError:
+    mc = None
 
 
 # Base class for all templates
@@ -69,15 +75,28 @@ class BuildingTemplate(Object):
         self.floor_templates = floor_templates
         self.roof_templates = roof_templates
 
+        # templates by id, the first template with an id is found like in the lists
+        self._floor_templates_by_id = {}
+        self._roof_templates_by_id = {}
+
+        for template in self.floor_templates:
+            self._add_to_index(self._floor_templates_by_id, template)
+        for template in self.roof_templates:
+            self._add_to_index(self._roof_templates_by_id, template)
+
+        # valid templates and the version of the blueprint cache they were validated with
+        self._valid_floor_templates = None
+        self._valid_roof_templates = None
+        self._valid_version = None
+
     # floor templates
     def add_floor_template(self, template=FloorTemplate()):
         self.floor_templates.append(template)
+        self._add_to_index(self._floor_templates_by_id, template)
+        self.invalidate_valid_templates()
 
     def get_floor_template(self, id="new_floor_template"):
-        for template in self.floor_templates:
-            if template.id == id:
-                return template
-        return None
+        return self._floor_templates_by_id.get(id)
 
     def get_all_floor_templates(self):
         return self.floor_templates
@@ -85,12 +104,11 @@ class BuildingTemplate(Object):
     # roof templates
     def add_roof_templates(self, template=RoofTemplate()):
         self.roof_templates.append(template)
+        self._add_to_index(self._roof_templates_by_id, template)
+        self.invalidate_valid_templates()
 
     def get_roof_template(self, name="new_roof_template"):
-        for template in self.roof_templates:
-            if template.id == name:
-                return template
-        return None
+        return self._roof_templates_by_id.get(name)
 
     def get_all_roof_templates(self):
         return self.roof_templates
@@ -98,9 +116,9 @@ class BuildingTemplate(Object):
     # general
     def add_template(self, template=BaseTemplate()):
         if isinstance(template, FloorTemplate):
-            self.floor_templates.append(template)
+            self.add_floor_template(template)
         elif isinstance(template, RoofTemplate):
-            self.roof_templates.append(template)
+            self.add_roof_templates(template)
 
     def get_template_by_id(self, id="my_template"):
         template = self.get_roof_template(id)
@@ -114,8 +132,41 @@ class BuildingTemplate(Object):
 
         if isinstance(template, FloorTemplate):
             self.floor_templates.remove(template)
+            self._remove_from_index(self._floor_templates_by_id, self.floor_templates, template)
         elif isinstance(template, RoofTemplate):
             self.roof_templates.remove(template)
+            self._remove_from_index(self._roof_templates_by_id, self.roof_templates, template)
+
+        self.invalidate_valid_templates()
+
+    def rename_template(self, template=BaseTemplate(), id="new_id"):
+        if isinstance(template, FloorTemplate):
+            index, templates = self._floor_templates_by_id, self.floor_templates
+        elif isinstance(template, RoofTemplate):
+            index, templates = self._roof_templates_by_id, self.roof_templates
+        else:
+            return
+
+        self._remove_from_index(index, templates, template)
+        template.id = id
+        self._add_to_index(index, template)
+        self.invalidate_valid_templates()
+
+    def _add_to_index(self, index={}, template=BaseTemplate()):
+        if not index.has_key(template.id):
+            index[template.id] = template
+
+    def _remove_from_index(self, index={}, templates=[], template=BaseTemplate()):
+        if index.get(template.id) is not template:
+            return
+
+        index.pop(template.id)
+
+        # another template with the same id?
+        for other in templates:
+            if other is not template and other.id == template.id:
+                index[template.id] = other
+                break
 
     # is the template valid? -> are all objects in the scene?
     # 1 = is valid
@@ -154,80 +205,60 @@ class BuildingTemplate(Object):
 
     # only return valid templates
     def get_valid_floor_templates(self, id_only=False):
-        result = []
+        self._update_valid_templates()
 
-        for floor_template in self.floor_templates:
-            # no blueprints?
-            if len(floor_template.walls) == 0 or len(floor_template.corners) == 0:
-                continue
+        if id_only:
+            return [floor_template.id for floor_template in self._valid_floor_templates]
+        return list(self._valid_floor_templates)
 
-            # validate blueprints
-            blueprints_valid = True
+    def get_valid_roof_templates(self, id_only=False):
+        self._update_valid_templates()
 
-            # walls valid?
-            for wall in floor_template.walls:
-                if not mc.objExists(wall):
-                    blueprints_valid = False
-                    break
+        if id_only:
+            return [roof_template.id for roof_template in self._valid_roof_templates]
+        return list(self._valid_roof_templates)
 
-            # corners valid?
-            for corner in floor_template.corners:
-                if not mc.objExists(corner):
-                    blueprints_valid = False
-                    break
+    # has to be called when the blueprints of a template changed
+    def invalidate_valid_templates(self):
+        self._valid_version = None
 
-            # blueprints not valid?
-            if not blueprints_valid:
-                continue
+    def _update_valid_templates(self):
+        # still up to date? (only if the scene is watched by the blueprint cache)
+        if blueprint_cache.has_callbacks() and self._valid_version == blueprint_cache.get_version():
+            return
 
-            # add to result
-            if id_only:
-                result.append(floor_template.id)
-            else:
-                result.append(floor_template)
+        self._valid_floor_templates = []
+        for floor_template in self.floor_templates:
+            # no blueprints?
+            if len(floor_template.walls) == 0 or len(floor_template.corners) == 0:
+                continue
 
-        return result
+            # walls and corners valid?
+            if not self._blueprints_exist(floor_template.walls) or not self._blueprints_exist(floor_template.corners):
+                continue
 
-    def get_valid_roof_templates(self, id_only=False):
-        result = []
+            self._valid_floor_templates.append(floor_template)
 
+        self._valid_roof_templates = []
         for roof_template in self.roof_templates:
             # no blueprints?
             if len(roof_template.tiles) == 0 or len(roof_template.edges) == 0 or len(roof_template.corners) == 0:
                 continue
 
-            # validate blueprints
-            blueprints_valid = True
-
-            # tiles valid?
-            for tile in roof_template.tiles:
-                if not mc.objExists(tile):
-                    blueprints_valid = False
-                    break
-
-            # corners valid?
-            for edge in roof_template.edges:
-                if not mc.objExists(edge):
-                    blueprints_valid = False
-                    break
-
-            # corners valid?
-            for corner in roof_template.corners:
-                if not mc.objExists(corner):
-                    blueprints_valid = False
-                    break
-
-            # blueprints not valid?
-            if not blueprints_valid:
+            # tiles, edges and corners valid?
+            if not self._blueprints_exist(roof_template.tiles) or not self._blueprints_exist(roof_template.edges) \
+                    or not self._blueprints_exist(roof_template.corners):
                 continue
 
-            # add to result
-            if id_only:
-                result.append(roof_template.id)
-            else:
-                result.append(roof_template)
+            self._valid_roof_templates.append(roof_template)
 
-        return result
+        self._valid_version = blueprint_cache.get_version()
+
+    def _blueprints_exist(self, blueprints=[]):
+        for blueprint in blueprints:
+            if not blueprint_cache.exists(blueprint):
+                return False
+        return True
 
     # serialization
     def get_serializable(self):
@@ -1,37 +1,50 @@
 import json
-from Templates import *
+import os
+from TemplateLibrary import *
 
 
 # user profile with information about the current user
 # Can be saved and loaded from the maya prefs (using option vars)
+# the building templates are stored in a TemplateLibrary, the profile only keeps the ids and the library directory
 class UserProfile():
 
     __option_var_key = "bg_profile"
 
-    def __init__(self):
-        self._templates = {}
+    def __init__(self, library_directory=None):
+        self._library = TemplateLibrary(library_directory or UserProfile.get_default_library_directory())
         self._cur_template = None
         self._cur_building = None
 
     # templates
     def add_template(self, template=BuildingTemplate()):
-        self._templates[template.id] = template
+        self._library.add_template(template)
 
     def remove_template(self, template=BuildingTemplate()):
-        self._templates.pop(template.id)
+        self._library.remove_template(template)
 
     def get_cur_template(self):
         if self._cur_template is None:
             return None
 
-        return self._templates[self._cur_template]
+        return self._library.get_template(self._cur_template)
 
+    # loads all templates of the library
     def get_all_templates(self):
-        return self._templates.values()
+        return [self._library.get_template(id) for id in self._library.get_template_ids()]
+
+    def get_template_ids(self):
+        return self._library.get_template_ids()
 
     def set_cur_template(self, template=BuildingTemplate()):
         self._cur_template = template.id
 
+    def get_library(self):
+        return self._library
+
+    @staticmethod
+    def get_default_library_directory():
+        return os.path.join(mc.internalVar(userAppDir=True), "building_generator", "templates")
+
     # last edit building
     def get_cur_building(self):
         return self._cur_building
@@ -43,23 +56,46 @@ class UserProfile():
     def save(self):
         mc.optionVar(sv=(self.__option_var_key, json.dumps(self.get_serializable())))
 
+    # marks the current template as changed, it is written by flush()
+    def save_cur_template(self):
+        self._library.mark_dirty(self.get_cur_template())
+
+    def flush(self):
+        self._library.flush()
+
     @staticmethod
     def load():
         # no profile? -> create new one
         if mc.optionVar(exists=UserProfile.__option_var_key) == 0:
             profile = UserProfile()
-
-            # add default building template
-            default_template = BuildingTemplate()
-            profile.add_template(default_template)
-            profile.set_cur_template(default_template)
+            profile._add_default_template()
+            profile.save()
+            profile.flush()
 
             return profile
 
         # load profile from option vars
         serialized = mc.optionVar(query=UserProfile.__option_var_key)
         serializable = json.loads(serialized)
-        return UserProfile.get_from_serializable(serializable)
+        profile = UserProfile.get_from_serializable(serializable)
+
+        # current template has been removed from the library?
+        if profile.get_cur_template() is None:
+            profile._add_default_template()
+            profile.save()
+            profile.flush()
+
+        return profile
+
+    def _add_default_template(self):
+        default_template = self._library.get_template(BuildingTemplate().id)
+
+        # not in the library yet?
+        if default_template is None:
+            default_template = BuildingTemplate(BuildingTemplate().id, [], [])
+            self.add_template(default_template)
+
+        self.set_cur_template(default_template)
 
     # region Serialization
     def get_serializable(self):
@@ -67,24 +103,25 @@ class UserProfile():
         result = {}
         result["cur_template"] = self._cur_template
         result["cur_building"] = self._cur_building
-
-        # templates
-        templates = {}
-        for template in self._templates.values():
-            templates[template.id] = template.get_serializable()
-        result["templates"] = templates
+        result["library"] = self._library.get_directory()
 
         return result
 
     @staticmethod
     def get_from_serializable(serializable={}):
-        profile = UserProfile()
+        profile = UserProfile(serializable.get("library"))
         profile._cur_template = serializable["cur_template"]
         profile._cur_building = serializable["cur_building"]
 
-        for serializable_template in serializable["templates"].values():
-            template = BuildingTemplate.get_from_serializable(serializable_template)
-            profile.add_template(template)
+        # templates of older versions were stored in the profile -> move them to the library
+        if serializable.has_key("templates"):
+            for serializable_template in serializable["templates"].values():
+                template = BuildingTemplate.get_from_serializable(serializable_template)
+                if not profile._library.has_template(template.id):
+                    profile.add_template(template)
+
+            profile.flush()
+            profile.save()
 
         return profile
-    # endregion
\ No newline at end of file
+    # endregion
@@ -0,0 +1,466 @@
+import math
+import maya.cmds as mc
+from models.Element import Element
+from models.Plans import *
+
+
+# applies floor and roof plans to the scene with maya.cmds, one command per step
+# element_callback is called with each created element, e.g. to report the progress or to cancel by raising
+class CmdsPlanApplier:
+
+    def __init__(self):
+        # shading groups and intermediate shapes of the blueprints, used by the lean duplication
+        self._lean_blueprints = {}
+
+    def apply(self, part_plan=FloorPlan(), mode=kDuplicateCopy, element_callback=None):
+        # blueprints may have changed since the last plan
+        self._lean_blueprints = {}
+
+        # create roots
+        self.apply_groups(part_plan)
+
+        # create elements
+        result = []
+        for element_plan in part_plan.elements:
+            result.append(self.apply_element(element_plan, mode, self._instances_leaf_shapes(part_plan, element_plan)))
+
+            if element_callback is not None:
+                element_callback(result[-1])
+
+        return result
+
+    def apply_groups(self, part_plan=FloorPlan()):
+        for group in part_plan.groups:
+            # already exists?
+            if mc.objExists(group.name):
+                continue
+
+            mc.createNode('transform', name=group.name)
+            mc.parent(group.name, group.parent)
+
+            if group.position is not None:
+                mc.setAttr(group.name + '.translate', group.position[0], group.position[1], group.position[2])
+
+    def apply_element(self, element_plan=ElementPlan(), mode=kDuplicateCopy, instance_leaf=True):
+        # create mesh and rename
+        if mode == kDuplicateInstance:
+            element_object = mc.instance(element_plan.blueprint)[0]
+        elif mode == kDuplicateLean:
+            element_object = self._duplicate_lean(element_plan.blueprint)
+        else:
+            element_object = mc.duplicate(element_plan.blueprint, ilf=instance_leaf)[0]
+        element_object = mc.rename(element_object, element_plan.name)
+
+        # set position and rotation
+        element = Element(element_object)
+        element.set_position(element_plan.position)
+        if element_plan.rotation is not None:
+            element.set_rotation(element_plan.rotation)
+
+        # parent to its root
+        element.set_parent(element_plan.parent)
+
+        return element_object
+
+    # moves existing elements to the world positions of their plans
+    def move_elements(self, element_objects=[], element_plans=[]):
+        for element_object, element_plan in zip(element_objects, element_plans):
+            mc.xform(element_object, worldSpace=True, translation=element_plan.position)
+
+    # copies instance the leaf shapes of their blueprint (ilf), except for floor corners which get their own shapes
+    def _instances_leaf_shapes(self, part_plan=FloorPlan(), element_plan=ElementPlan()):
+        return not (isinstance(part_plan, FloorPlan) and element_plan.kind == kCornerElement)
+
+    # region Lean Duplication
+    def _duplicate_lean(self, blueprint="blueprint"):
+        lean_blueprint = self._get_lean_blueprint(blueprint)
+
+        # own copies of the transform and shapes, no instanced leaf shapes
+        element_object = mc.duplicate(blueprint, rr=True)[0]
+
+        # remove copied intermediate shapes (e.g. the original shape of a deformer)
+        if lean_blueprint["intermediate"]:
+            shapes = mc.listRelatives(element_object, shapes=True, fullPath=True)
+            mc.delete([shapes[i] for i in lean_blueprint["intermediate"]])
+
+        # reconnect to the shared shading group
+        if lean_blueprint["shading_group"] is not None:
+            mc.sets(element_object, edit=True, forceElement=lean_blueprint["shading_group"])
+
+        return element_object
+
+    def _get_lean_blueprint(self, blueprint="blueprint"):
+        if self._lean_blueprints.has_key(blueprint):
+            return self._lean_blueprints[blueprint]
+
+        shapes = mc.listRelatives(blueprint, shapes=True, fullPath=True) or []
+
+        # indices of the intermediate shapes
+        intermediate = []
+        for i in range(len(shapes)):
+            if mc.getAttr(shapes[i] + '.intermediateObject'):
+                intermediate.append(i)
+
+        # shading group of the whole object, per face assignments are kept by the duplication
+        shading_group = None
+        visible_shapes = [shapes[i] for i in range(len(shapes)) if i not in intermediate]
+        if len(visible_shapes) > 0:
+            shading_groups = list(set(mc.listConnections(visible_shapes, type='shadingEngine') or []))
+            if len(shading_groups) == 1:
+                shading_group = shading_groups[0]
+
+        lean_blueprint = {
+            "intermediate": intermediate,
+            "shading_group": shading_group,
+        }
+
+        self._lean_blueprints[blueprint] = lean_blueprint
+        return lean_blueprint
+    # endregion
+
+
+# name of the plugin command which applies the edits of the ApiPlanApplier, so they are one step on the undo queue
+kApplyPlanCommand = "buildingGeneratorApplyPlan"
+
+# edit handed over to the plugin command, python objects can not be passed as command arguments
+_pending_edit = None
+
+
+def take_pending_edit():
+    global _pending_edit
+    edit = _pending_edit
+    _pending_edit = None
+    return edit
+
+
+# applies floor and roof plans through the OpenMaya API 2.0
+# the groups, elements and meshes of a plan are created, named, transformed and parented by a single DAG modifier,
+# the instances and shading group assignments by a second modifier once the paths of the elements are known
+# both are run by the plugin command kApplyPlanCommand, so the plan is undone and redone as a whole.
+# Without the plugin the plan is only applied if undo is disabled
+# copies get their own meshes without intermediate shapes, so copy and lean duplication are the same here
+# (unlike the CmdsPlanApplier, copies do not instance the leaf shapes of their blueprint)
+# element_callback is called with the name of each element before the modifiers run, so a cancelled plan creates nothing
+# the api module can be replaced by an in-memory stand-in
+class ApiPlanApplier:
+
+    def __init__(self, api=None):
+        self._api = api
+
+        # blueprints which can not be copied through the api are duplicated with maya.cmds
+        self._fallback = CmdsPlanApplier()
+
+    def get_api(self):
+        if self._api is None:
+            import maya.api.OpenMaya as om
+            self._api = om
+
+        return self._api
+
+    def apply(self, part_plan=FloorPlan(), mode=kDuplicateCopy, element_callback=None):
+        edit = ApiPlanEdit(self.get_api(), part_plan, mode, element_callback)
+        self.run_edit(edit)
+
+        # fallback for unsupported blueprints, their parents have been created by the edit
+        result = edit.get_element_names()
+        for i in range(len(result)):
+            if result[i] is None:
+                element_plan = part_plan.elements[i]
+                result[i] = self._fallback.apply_element(element_plan, mode, self._fallback._instances_leaf_shapes(part_plan, element_plan))
+
+        return result
+
+    def move_elements(self, element_objects=[], element_plans=[]):
+        self._fallback.move_elements(element_objects, element_plans)
+
+    @staticmethod
+    def run_edit(edit=None):
+        global _pending_edit
+
+        if edit.is_empty():
+            return
+
+        # recorded on the undo queue by the plugin command
+        if hasattr(mc, kApplyPlanCommand):
+            _pending_edit = edit
+            getattr(mc, kApplyPlanCommand)()
+            return
+
+        # could not be undone
+        if mc.undoInfo(query=True, state=True):
+            mc.error("The Building Generator plugin has to be loaded to apply plans through the api while undo is enabled.")
+            return
+
+        edit.do_it()
+
+
+# the changes of the scene for one plan of the ApiPlanApplier, can be undone and redone
+class ApiPlanEdit:
+
+    def __init__(self, api=None, part_plan=FloorPlan(), mode=kDuplicateCopy, element_callback=None):
+        self._api = api
+        self._mode = mode
+
+        # creates, names, transforms and parents the groups, elements and meshes
+        self._dag_modifier = api.MDagModifier()
+
+        # instances the shapes and assigns the shading groups, queued when the edit is done the first time
+        self._dg_modifier = None
+
+        # per element: (transform, blueprint, meshes) or None if the blueprint is not supported
+        self._elements = []
+        self._group_count = 0
+
+        self._queue(part_plan, element_callback)
+
+    def is_empty(self):
+        return len(self._elements) == 0 and self._group_count == 0
+
+    # names of the elements, None for unsupported blueprints
+    def get_element_names(self):
+        om = self._api
+        return [om.MFnDependencyNode(element[0]).name() if element is not None else None for element in self._elements]
+
+    # region Edit
+    def do_it(self):
+        om = self._api
+        self._dag_modifier.doIt()
+
+        # geometry of the copies, it is part of the meshes and removed with them
+        for element in self._elements:
+            if element is None:
+                continue
+
+            element_object, blueprint, meshes = element
+            for mesh, shape in zip(meshes, blueprint["shapes"]):
+                om.MFnMesh(mesh).copyInPlace(shape)
+
+        if self._dg_modifier is None:
+            self._dg_modifier = self._queue_shading()
+        self._dg_modifier.doIt()
+
+    def undo_it(self):
+        if self._dg_modifier is not None:
+            self._dg_modifier.undoIt()
+        self._dag_modifier.undoIt()
+
+    def redo_it(self):
+        self.do_it()
+    # endregion
+
+    # region Queue
+    def _queue(self, part_plan=FloorPlan(), element_callback=None):
+        om = self._api
+        modifier = self._dag_modifier
+
+        # nodes and world matrices by name
+        nodes = {}
+        world_matrices = {}
+        blueprints = {}
+
+        # create roots
+        for group in part_plan.groups:
+            # already exists?
+            if self._cache_existing(group.name, nodes, world_matrices):
+                continue
+
+            parent_object, parent_matrix = self._get_parent(group.parent, nodes, world_matrices)
+
+            group_object = modifier.createNode("transform", parent_object)
+            modifier.renameNode(group_object, group.name)
+            self._group_count += 1
+
+            # like maya.cmds: the new group keeps its world position when parented, then its translation is set
+            local_matrix = om.MTransformationMatrix(parent_matrix.inverse())
+            if group.position is not None:
+                local_matrix.setTranslation(om.MVector(group.position), om.MSpace.kTransform)
+            self._set_transform(group_object, local_matrix)
+
+            nodes[group.name] = group_object
+            world_matrices[group.name] = local_matrix.asMatrix() * parent_matrix
+
+        # create elements
+        for element_plan in part_plan.elements:
+            if element_callback is not None:
+                element_callback(element_plan.name)
+
+            blueprint = self._get_blueprint(element_plan.blueprint, blueprints)
+
+            # not supported by the api?
+            if blueprint is None:
+                self._elements.append(None)
+                continue
+
+            parent_object, parent_matrix = self._get_parent(element_plan.parent, nodes, world_matrices)
+
+            element_object = modifier.createNode("transform", parent_object)
+            modifier.renameNode(element_object, element_plan.name)
+
+            # world transformation of the element, elements keep the scale of their blueprint
+            world_matrix = om.MTransformationMatrix()
+            world_matrix.setTranslation(om.MVector(element_plan.position), om.MSpace.kTransform)
+            if element_plan.rotation is not None:
+                world_matrix.setRotation(om.MEulerRotation([math.radians(angle) for angle in element_plan.rotation]))
+            else:
+                world_matrix.setRotation(blueprint["rotation"])
+            world_matrix.setScale(blueprint["scale"], om.MSpace.kTransform)
+
+            local_matrix = om.MTransformationMatrix(world_matrix.asMatrix() * parent_matrix.inverse())
+            self._set_transform(element_object, local_matrix)
+
+            # meshes of the copy, instances share the shapes of the blueprint
+            meshes = []
+            if self._mode != kDuplicateInstance:
+                for i in range(len(blueprint["shapes"])):
+                    mesh = modifier.createNode("mesh", element_object)
+                    modifier.renameNode(mesh, element_plan.name + "Shape" + (str(i) if i > 0 else ""))
+                    meshes.append(mesh)
+
+            self._elements.append((element_object, blueprint, meshes))
+
+    # instances and shading groups are assigned by mel commands on the full paths of the new elements
+    def _queue_shading(self):
+        om = self._api
+        modifier = om.MDGModifier()
+
+        # shading group -> members
+        shading_members = {}
+
+        for element in self._elements:
+            if element is None:
+                continue
+
+            element_object, blueprint, meshes = element
+            element_path = om.MDagPath.getAPathTo(element_object).fullPathName()
+
+            if self._mode == kDuplicateInstance:
+                shape_paths = []
+                for shape in blueprint["shapes"]:
+                    modifier.commandToExecute('parent -add -shape "{}" "{}"'.format(om.MDagPath.getAPathTo(shape).fullPathName(), element_path))
+                    shape_paths.append(element_path + "|" + om.MFnDependencyNode(shape).name())
+            else:
+                shape_paths = [om.MDagPath.getAPathTo(mesh).fullPathName() for mesh in meshes]
+
+            for shape_path, shaders in zip(shape_paths, blueprint["shaders"]):
+                self._add_shading_members(shape_path, shaders, shading_members)
+
+        # once per shading group
+        for shading_group in sorted(shading_members.keys()):
+            members = " ".join('"{}"'.format(member) for member in shading_members[shading_group])
+            modifier.commandToExecute('sets -edit -forceElement "{}" {}'.format(shading_group, members))
+
+        return modifier
+
+    @staticmethod
+    def _add_shading_members(shape_path="shape", shaders=(), shading_members={}):
+        shading_groups, face_indices = shaders
+
+        for i in range(len(shading_groups)):
+            members = shading_members.setdefault(shading_groups[i], [])
+
+            # whole object
+            if len(shading_groups) == 1:
+                members.append(shape_path)
+                continue
+
+            # ranges of the faces of the shading group
+            ranges = []
+            for face in range(len(face_indices)):
+                if face_indices[face] != i:
+                    continue
+
+                if len(ranges) > 0 and ranges[-1][1] == face - 1:
+                    ranges[-1][1] = face
+                else:
+                    ranges.append([face, face])
+
+            members.extend(["{}.f[{}:{}]".format(shape_path, first, last) for first, last in ranges])
+    # endregion
+
+    # region Helper
+    def _get_dag_path(self, name="object"):
+        om = self._api
+
+        selection = om.MSelectionList()
+        try:
+            selection.add(name)
+        except RuntimeError:
+            return None
+
+        return selection.getDagPath(0)
+
+    def _cache_existing(self, name="object", nodes={}, world_matrices={}):
+        if nodes.has_key(name):
+            return True
+
+        dag_path = self._get_dag_path(name)
+        if dag_path is None:
+            return False
+
+        nodes[name] = dag_path.node()
+        world_matrices[name] = dag_path.inclusiveMatrix()
+        return True
+
+    def _get_parent(self, name="parent_object", nodes={}, world_matrices={}):
+        if not self._cache_existing(name, nodes, world_matrices):
+            mc.error("Can not find parent: " + name)
+            return None, None
+
+        return nodes[name], world_matrices[name]
+
+    def _get_blueprint(self, name="blueprint", blueprints={}):
+        if blueprints.has_key(name):
+            return blueprints[name]
+
+        om = self._api
+        blueprint = None
+        dag_path = self._get_dag_path(name)
+
+        if dag_path is not None:
+            # only transforms with mesh shapes are supported, intermediate shapes are skipped
+            shapes = []
+            for i in range(dag_path.childCount()):
+                child = dag_path.child(i)
+                if not child.hasFn(om.MFn.kMesh):
+                    shapes = []
+                    break
+                if not om.MFnDagNode(child).isIntermediateObject:
+                    shapes.append(child)
+
+            if len(shapes) > 0:
+                transform = om.MFnTransform(dag_path)
+                blueprint = {
+                    "shapes": shapes,
+                    "shaders": [self._get_shaders(om.MDagPath.getAPathTo(shape)) for shape in shapes],
+                    "rotation": transform.rotation(om.MSpace.kTransform),
+                    "scale": transform.scale(),
+                }
+
+        blueprints[name] = blueprint
+        return blueprint
+
+    # names of the shading groups of the shape and the index of the shading group of each face
+    def _get_shaders(self, shape_path=None):
+        om = self._api
+        shading_groups, face_indices = om.MFnMesh(shape_path).getConnectedShaders(shape_path.instanceNumber())
+
+        return [om.MFnDependencyNode(shading_group).name() for shading_group in shading_groups], list(face_indices)
+
+    def _set_transform(self, node=None, matrix=None):
+        om = self._api
+        modifier = self._dag_modifier
+        node_fn = om.MFnDependencyNode(node)
+
+        translation = matrix.translation(om.MSpace.kTransform)
+        rotation = matrix.rotation()
+        scale = matrix.scale(om.MSpace.kTransform)
+
+        for axis, value in zip("XYZ", [translation.x, translation.y, translation.z]):
+            modifier.newPlugValueDouble(node_fn.findPlug("translate" + axis, False), value)
+
+        for axis, value in zip("XYZ", [rotation.x, rotation.y, rotation.z]):
+            modifier.newPlugValueMAngle(node_fn.findPlug("rotate" + axis, False), om.MAngle(value))
+
+        for axis, value in zip("XYZ", scale):
+            modifier.newPlugValueDouble(node_fn.findPlug("scale" + axis, False), value)
+    # endregion
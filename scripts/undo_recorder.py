@@ -0,0 +1,124 @@
+import collections
+import maya.cmds as mc
+
+# the api is optional, without it the commands of an operation are not counted (e.g. with stand-ins for maya.cmds)
+try:
+    import maya.api.OpenMaya as om
+except ImportError:
+    om = None
+
+
+# records the operations of a generator on the undo queue
+# every operation is one named undo chunk, so a single undo reverts the whole operation
+# operations called by other operations are part of the chunk of the outermost operation
+# without undo the recording is suspended during the operation (e.g. for batch generation) and restored afterwards,
+# also if the operation fails. The undo queue is not flushed, but the operation itself cannot be undone
+class UndoRecorder:
+
+    def __init__(self, enabled=True, report_size=100):
+        self._enabled = enabled
+
+        # nesting of the running operations
+        self._depth = 0
+        self._operation = None
+        self._undo_state = None
+
+        # commands of the running operation, counted by a command callback if the api is available
+        self._command_count = 0
+        self._callback_id = None
+
+        # growth of the undo queue by the last operations
+        self._report = collections.deque(maxlen=report_size)
+
+    def is_enabled(self):
+        return self._enabled
+
+    # whether the running operation is recorded on the undo queue, undo may also have been disabled by the user
+    def is_recording(self):
+        return self._depth > 0 and self._enabled and bool(self._undo_state)
+
+    def set_enabled(self, enabled=True):
+        if self._depth > 0:
+            mc.error("Undo recording cannot be changed during the operation \"{}\".".format(self._operation))
+            return
+
+        self._enabled = enabled
+
+    # region Operations
+    # if the outermost operation fails to begin, the chunk is closed or the recording restored before the error is raised
+    def begin(self, operation="operation"):
+        if self._depth == 0:
+            self._undo_state = mc.undoInfo(query=True, state=True)
+            if self._enabled:
+                mc.undoInfo(openChunk=True, chunkName=operation)
+            else:
+                mc.undoInfo(stateWithoutFlush=False)
+
+            started = False
+            try:
+                self._operation = operation
+                self._command_count = 0
+                if om is not None:
+                    self._callback_id = om.MCommandMessage.addCommandCallback(self._command_called)
+                started = True
+            finally:
+                if not started:
+                    self._restore_undo()
+                    self._operation = None
+
+        self._depth += 1
+
+    def end(self):
+        self._depth -= 1
+        if self._depth > 0:
+            return
+
+        try:
+            self._restore_undo()
+        finally:
+            if self._callback_id is not None:
+                om.MMessage.removeCallback(self._callback_id)
+                self._callback_id = None
+
+        recorded = self._enabled and self._undo_state
+        command_count = self._command_count if om is not None else None
+
+        # the chunk is on top of the undo queue if anything has been recorded
+        # (the counted commands include queries and other commands which are not undoable)
+        undo_steps = 1 if recorded and mc.undoInfo(query=True, undoName=True) == self._operation else 0
+
+        self._report.append({
+            "operation": self._operation,
+            "commands": command_count,
+            "undo_steps": undo_steps,
+            "recorded_commands": command_count if recorded else 0,
+        })
+        self._operation = None
+
+    def _restore_undo(self):
+        if self._enabled:
+            mc.undoInfo(closeChunk=True)
+        else:
+            mc.undoInfo(stateWithoutFlush=self._undo_state)
+
+    def _command_called(self, command="", client_data=None):
+        self._command_count += 1
+    # endregion
+
+    # region Report
+    # growth of the undo queue by the last operations, oldest first
+    # commands: commands run by the operation, undo_steps and recorded_commands: what has been added to the undo queue
+    # commands and recorded_commands are None if the commands could not be counted
+    def get_report(self):
+        return list(self._report)
+
+    def get_last_report(self):
+        if len(self._report) == 0:
+            return None
+
+        return self._report[-1]
+
+    def clear_report(self):
+        self._report.clear()
+    # endregion
+
@@ -0,0 +1,37 @@
+# stand-in for the QtCore classes used by the editor helpers, there is no event loop:
+# timers only run out when timeout is emitted by the test
+
+
+class Signal(object):
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot=None):
+        self._slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class QTimer(object):
+    def __init__(self):
+        self.timeout = Signal()
+        self._single_shot = False
+        self._interval = 0
+        self._active = False
+
+    def setSingleShot(self, single_shot=True):
+        self._single_shot = single_shot
+
+    def setInterval(self, interval=0):
+        self._interval = interval
+
+    def start(self):
+        self._active = True
+
+    def stop(self):
+        self._active = False
+
+    def isActive(self):
+        return self._active
@@ -0,0 +1,10 @@
+# stand-in for the OpenMaya API 1.0 messages used by the editor, the same callbacks as the API 2.0 stand-in
+from maya import _scene
+from maya.api.OpenMaya import MMessage, MCommandMessage, MDGMessage, MNodeMessage, MSceneMessage
+
+
+# events are never sent
+class MEventMessage(MMessage):
+    @staticmethod
+    def addEventCallback(event="SelectionChanged", function=None, client_data=None):
+        return _scene.add_callback({}, function)
@@ -0,0 +1,292 @@
+# in-memory scene shared by the maya.cmds and OpenMaya stand-ins
+# only what the generator uses is modelled: a dag of named nodes with translate, rotate and scale,
+# dynamic attributes, shading group membership, an undo queue with chunks and the scene callbacks
+# world transformations only add up the translations of the parents
+
+
+class Node(object):
+
+    # nodes without a type are null objects
+    def __init__(self, type=None, name=None):
+        self.type = type
+        self.name = name
+        # more than one parent for instanced shapes
+        self.parents = []
+        self.translate = [0.0, 0.0, 0.0]
+        self.rotate = [0.0, 0.0, 0.0]
+        self.scale = [1.0, 1.0, 1.0]
+        self.attributes = {}
+        # members of shading groups: (node, (first face, last face)) or (node, None) for the whole object
+        self.members = []
+
+    def parent(self):
+        return self.parents[0] if len(self.parents) > 0 else None
+
+    def children(self):
+        return [node for node in nodes if self in node.parents]
+
+    def path(self):
+        parent = self.parent()
+        return (parent.path() if parent is not None else "") + "|" + self.name
+
+    # paths of all instances
+    def paths(self):
+        if len(self.parents) == 0:
+            return ["|" + self.name]
+
+        return [path + "|" + self.name for parent in self.parents for path in parent.paths()]
+
+    def world_translation(self):
+        parent = self.parent()
+        if parent is None:
+            return list(self.translate)
+
+        parent_translation = parent.world_translation()
+        return [parent_translation[i] + self.translate[i] for i in range(3)]
+
+    def isNull(self):
+        return self.type is None
+
+    def hasFn(self, fn="transform"):
+        if fn == "dagNode":
+            return self.type in ("transform", "mesh")
+
+        return self.type == fn
+
+
+# nodes in the order of their creation
+nodes = []
+selection = []
+warnings = []
+scene = {"name": ""}
+saved_scenes = []
+
+
+# region Nodes
+def find(name="node"):
+    if isinstance(name, Node):
+        return name if name in nodes else None
+
+    for node in nodes:
+        if name.startswith("|"):
+            if name in node.paths():
+                return node
+        elif "|" in name:
+            if any(path.endswith("|" + name) for path in node.paths()):
+                return node
+        elif node.name == name:
+            return node
+
+    return None
+
+
+def resolve(name="node"):
+    node = find(name)
+    if node is None:
+        raise RuntimeError("No object matches name: {}".format(name))
+
+    return node
+
+
+def unique_name(name="node", parent=None, ignore=None):
+    def taken(candidate):
+        return any(node is not ignore and node.name == candidate and node.parent() is parent for node in nodes)
+
+    if not taken(name):
+        return name
+
+    base = name.rstrip("0123456789")
+    number = 1
+    while taken(base + str(number)):
+        number += 1
+
+    return base + str(number)
+
+
+def add_node(node=None):
+    nodes.append(node)
+    for function in list(node_added_callbacks.values()):
+        function(node, None)
+
+
+def remove_node(node=None):
+    if node not in nodes:
+        return
+
+    # children without another parent are removed with the node
+    for child in node.children():
+        if len(child.parents) > 1:
+            child.parents.remove(node)
+        else:
+            remove_node(child)
+
+    for function in list(node_removed_callbacks.values()):
+        function(node, None)
+
+    nodes.remove(node)
+    for shading_group in nodes:
+        shading_group.members = [member for member in shading_group.members if member[0] is not node]
+    if node in selection:
+        selection.remove(node)
+
+
+def rename_node(node=None, name="node"):
+    previous_name = node.name
+    node.name = name
+    for function in list(name_changed_callbacks.values()):
+        function(node, previous_name, None)
+
+
+def get_shading_groups(node=None):
+    return [shading_group for shading_group in nodes
+            if any(member[0] is node for member in shading_group.members)]
+
+
+def new_scene():
+    del nodes[:]
+    del selection[:]
+    del warnings[:]
+    del saved_scenes[:]
+    scene["name"] = ""
+    del undo_queue[:]
+    del redo_queue[:]
+    chunk["depth"] = 0
+    chunk["before"] = None
+    chunk["changed"] = False
+    chunk["name"] = ""
+
+    for function in list(new_scene_callbacks.values()):
+        function(None)
+# endregion
+
+
+# region Undo
+# steps of the undo queue: {"before": snapshot} for commands and chunks, {"command": command} for plugin commands
+undo_queue = []
+redo_queue = []
+undo_state = {"enabled": True}
+# plugin commands which are running, the commands they run are not recorded
+running_commands = [0]
+chunk = {"depth": 0, "before": None, "changed": False, "name": ""}
+
+
+def snapshot():
+    return [(node, (node.name, list(node.parents), list(node.translate), list(node.rotate), list(node.scale),
+                    dict(node.attributes), list(node.members))) for node in nodes]
+
+
+def restore(state=None):
+    del nodes[:]
+    for node, (name, parents, translate, rotate, scale, attributes, members) in state:
+        node.name, node.parents, node.translate, node.rotate, node.scale = name, list(parents), list(translate), list(rotate), list(scale)
+        node.attributes, node.members = dict(attributes), list(members)
+        nodes.append(node)
+
+    selection[:] = [node for node in selection if node in nodes]
+
+
+def is_recording():
+    return undo_state["enabled"] and running_commands[0] == 0
+
+
+def open_chunk(name=""):
+    if chunk["depth"] == 0:
+        chunk["before"] = snapshot()
+        chunk["changed"] = False
+        chunk["name"] = name or ""
+    chunk["depth"] += 1
+
+
+def close_chunk():
+    chunk["depth"] -= 1
+    if chunk["depth"] == 0 and chunk["changed"]:
+        push_step({"before": chunk["before"], "name": chunk["name"]})
+
+
+# name of the step which is undone next
+def get_undo_name():
+    return undo_queue[-1].get("name", "") if len(undo_queue) > 0 else ""
+
+
+def push_step(step=None):
+    undo_queue.append(step)
+    del redo_queue[:]
+
+
+# runs a command which changes the scene and records it on the undo queue
+def record(function=None, *args, **kwargs):
+    if not is_recording():
+        return function(*args, **kwargs)
+
+    if chunk["depth"] > 0:
+        chunk["changed"] = True
+        return function(*args, **kwargs)
+
+    before = snapshot()
+    result = function(*args, **kwargs)
+    push_step({"before": before})
+    return result
+
+
+def record_command(command=None):
+    if not is_recording() or not command.isUndoable():
+        return
+
+    if chunk["depth"] > 0:
+        chunk["changed"] = True
+    else:
+        push_step({"command": command})
+
+
+def undo():
+    if len(undo_queue) == 0:
+        warnings.append("There are no more commands to undo.")
+        return
+
+    step = undo_queue.pop()
+    if step.has_key("command"):
+        step["command"].undoIt()
+    else:
+        step["after"] = snapshot()
+        restore(step["before"])
+    redo_queue.append(step)
+
+
+def redo():
+    if len(redo_queue) == 0:
+        warnings.append("There are no more commands to redo.")
+        return
+
+    step = redo_queue.pop()
+    if step.has_key("command"):
+        step["command"].redoIt()
+    else:
+        restore(step["after"])
+    undo_queue.append(step)
+# endregion
+
+
+# region Callbacks
+command_callbacks = {}
+node_added_callbacks = {}
+node_removed_callbacks = {}
+name_changed_callbacks = {}
+new_scene_callbacks = {}
+_next_callback_id = [0]
+
+
+def add_callback(callbacks={}, function=None):
+    _next_callback_id[0] += 1
+    callbacks[_next_callback_id[0]] = function
+    return _next_callback_id[0]
+
+
+def remove_callback(callback_id=0):
+    for callbacks in (command_callbacks, node_added_callbacks, node_removed_callbacks, name_changed_callbacks, new_scene_callbacks):
+        callbacks.pop(callback_id, None)
+
+
+def command_called(command="command"):
+    for function in list(command_callbacks.values()):
+        function(command, None)
+# endregion
@@ -0,0 +1,412 @@
+# stand-in for the OpenMaya API 2.0 classes used by the generator, works on the in-memory scene of _scene
+# matrices only keep a translation, a rotation and a scale, only translations are combined by multiplication
+import math
+from maya import _scene
+from maya import cmds
+
+MObject = _scene.Node
+
+
+class MFn(object):
+    kDagNode = "dagNode"
+    kTransform = "transform"
+    kMesh = "mesh"
+    kShadingEngine = "shadingEngine"
+    kMeshPolygonComponent = "meshPolygonComponent"
+
+
+class MSpace(object):
+    kTransform, kWorld, kObject = range(3)
+
+
+# region Math
+class MVector(object):
+    def __init__(self, values=(0, 0, 0)):
+        self.x, self.y, self.z = [float(value) for value in values]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+
+class MAngle(object):
+    def __init__(self, value=0.0):
+        self._value = value
+
+    def asRadians(self):
+        return self._value
+
+    def asDegrees(self):
+        return math.degrees(self._value)
+
+
+class MEulerRotation(object):
+    def __init__(self, values=(0, 0, 0)):
+        self.x, self.y, self.z = [float(value) for value in values]
+
+
+class MMatrix(object):
+    def __init__(self, translation=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1)):
+        self.translation = list(translation)
+        self.rotation = list(rotation)
+        self.scale = list(scale)
+
+    def inverse(self):
+        return MMatrix([-value for value in self.translation])
+
+    def __mul__(self, other):
+        return MMatrix([self.translation[i] + other.translation[i] for i in range(3)], self.rotation, self.scale)
+
+
+class MTransformationMatrix(object):
+    def __init__(self, matrix=None):
+        if matrix is None:
+            matrix = MMatrix()
+        self._matrix = MMatrix(matrix.translation, matrix.rotation, matrix.scale)
+
+    def setTranslation(self, vector=None, space=MSpace.kTransform):
+        self._matrix.translation = list(vector)
+        return self
+
+    def translation(self, space=MSpace.kTransform):
+        return MVector(self._matrix.translation)
+
+    def setRotation(self, rotation=None):
+        self._matrix.rotation = [rotation.x, rotation.y, rotation.z]
+        return self
+
+    def rotation(self):
+        return MEulerRotation(self._matrix.rotation)
+
+    def setScale(self, scale=(1, 1, 1), space=MSpace.kTransform):
+        self._matrix.scale = list(scale)
+        return self
+
+    def scale(self, space=MSpace.kTransform):
+        return list(self._matrix.scale)
+
+    def asMatrix(self):
+        return MMatrix(self._matrix.translation, self._matrix.rotation, self._matrix.scale)
+# endregion
+
+
+# region Selection
+class MDagPath(object):
+    def __init__(self, nodes=()):
+        self._nodes = list(nodes)
+
+    @staticmethod
+    def getAPathTo(node=None):
+        path = []
+        while node is not None:
+            path.insert(0, node)
+            node = node.parent()
+        return MDagPath(path)
+
+    def node(self):
+        return self._nodes[-1]
+
+    def push(self, node=None):
+        self._nodes.append(node)
+
+    def childCount(self):
+        return len(self.node().children())
+
+    def child(self, index=0):
+        return self.node().children()[index]
+
+    def instanceNumber(self):
+        return 0
+
+    def fullPathName(self):
+        return "".join("|" + node.name for node in self._nodes)
+
+    def inclusiveMatrix(self):
+        return MMatrix(self.node().world_translation())
+
+
+class MSelectionList(object):
+    def __init__(self):
+        self._items = []
+
+    def add(self, item=None):
+        if isinstance(item, basestring):
+            node = _scene.find(item)
+            if node is None:
+                raise RuntimeError("(kInvalidParameter): Object does not exist")
+            item = MDagPath.getAPathTo(node)
+
+        self._items.append(item)
+        return self
+
+    def getDagPath(self, index=0):
+        return self._items[index]
+
+    def length(self):
+        return len(self._items)
+
+
+class MObjectHandle(object):
+    def __init__(self, node=None):
+        self._node = node
+
+    def isValid(self):
+        return self._node in _scene.nodes
+
+    def isAlive(self):
+        return self.isValid()
+
+    def object(self):
+        return self._node
+# endregion
+
+
+# region Function Sets
+class MPlug(object):
+    def __init__(self, node=None, attribute="attribute"):
+        self.node = node
+        self.attribute = attribute
+
+
+class MFnDependencyNode(object):
+    def __init__(self, node=None):
+        self._node = node
+
+    def name(self):
+        return self._node.name
+
+    def hasAttribute(self, attribute="attribute"):
+        return self._node.attributes.has_key(attribute)
+
+    def findPlug(self, attribute="attribute", want_networked=False):
+        return MPlug(self._node, attribute)
+
+
+class MFnDagNode(MFnDependencyNode):
+    kNextPos = -1
+
+    def __init__(self, node=None):
+        if isinstance(node, MDagPath):
+            node = node.node()
+        MFnDependencyNode.__init__(self, node)
+
+    @property
+    def isIntermediateObject(self):
+        return bool(self._node.attributes.get("intermediateObject", False))
+
+    def fullPathName(self):
+        return self._node.path()
+
+
+class MFnTransform(MFnDagNode):
+    def rotation(self, space=MSpace.kTransform):
+        return MEulerRotation([math.radians(angle) for angle in self._node.rotate])
+
+    def scale(self):
+        return list(self._node.scale)
+
+
+class MFnMesh(MFnDagNode):
+    # meshes only have a number of faces
+    def numPolygons(self):
+        return self._node.attributes.get("faceCount", 6)
+
+    def copyInPlace(self, source=None):
+        self._node.attributes["faceCount"] = source.attributes.get("faceCount", 6)
+        return self
+
+    def getConnectedShaders(self, instance=0):
+        shading_groups = _scene.get_shading_groups(self._node)
+        face_indices = [-1] * self.numPolygons()
+
+        for i in range(len(shading_groups)):
+            for node, faces in shading_groups[i].members:
+                if node is not self._node:
+                    continue
+                first, last = faces if faces is not None else (0, len(face_indices) - 1)
+                for face in range(first, last + 1):
+                    face_indices[face] = i
+
+        return shading_groups, face_indices
+# endregion
+
+
+# region Modifiers
+# operations are queued and run by doIt, undoIt reverts them in reverse order
+class MDGModifier(object):
+    def __init__(self):
+        self._operations = []
+
+    def commandToExecute(self, command=""):
+        def do():
+            before = _scene.snapshot()
+            _run_mel(command)
+            return before
+
+        self._operations.append((do, _scene.restore))
+
+    def doIt(self):
+        self._done = [(undo, do()) for do, undo in self._operations]
+
+    def undoIt(self):
+        for undo, data in reversed(self._done):
+            undo(data)
+        self._done = []
+
+
+class MDagModifier(MDGModifier):
+    def createNode(self, type="transform", parent=None):
+        node = _scene.Node(type, type + "1")
+        if parent is not None and not parent.isNull():
+            node.parents.append(parent)
+
+        def do():
+            _scene.add_node(node)
+
+        def undo(data=None):
+            _scene.remove_node(node)
+
+        self._operations.append((do, undo))
+        return node
+
+    def renameNode(self, node=None, name="node"):
+        def do():
+            previous_name = node.name
+            _scene.rename_node(node, name)
+            return previous_name
+
+        def undo(previous_name="node"):
+            _scene.rename_node(node, previous_name)
+
+        self._operations.append((do, undo))
+
+    def _set_plug(self, plug=None, value=0.0):
+        attribute, axis = plug.attribute[:-1], "XYZ".index(plug.attribute[-1])
+
+        def do():
+            values = getattr(plug.node, attribute)
+            previous_value = values[axis]
+            values[axis] = value
+            return previous_value
+
+        def undo(previous_value=0.0):
+            getattr(plug.node, attribute)[axis] = previous_value
+
+        self._operations.append((do, undo))
+
+    def newPlugValueDouble(self, plug=None, value=0.0):
+        self._set_plug(plug, value)
+
+    def newPlugValueMAngle(self, plug=None, angle=None):
+        self._set_plug(plug, angle.asDegrees())
+
+
+# the two mel commands run by modifiers of the generator
+def _run_mel(command=""):
+    import shlex
+    words = shlex.split(command)
+
+    if words[:4] == ["parent", "-add", "-shape", words[3]]:
+        cmds.parent(words[3], words[4], add=True, shape=True)
+    elif words[:3] == ["sets", "-edit", "-forceElement"]:
+        cmds.sets(words[4:], edit=True, forceElement=words[3])
+    else:
+        raise RuntimeError("Unknown command: " + command)
+# endregion
+
+
+# region Messages
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback_id=0):
+        _scene.remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids=()):
+        for callback_id in callback_ids:
+            _scene.remove_callback(callback_id)
+
+
+class MCommandMessage(MMessage):
+    @staticmethod
+    def addCommandCallback(function=None, client_data=None):
+        return _scene.add_callback(_scene.command_callbacks, function)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeAddedCallback(function=None, node_type="dependNode", client_data=None):
+        return _scene.add_callback(_scene.node_added_callbacks, _filter_type(function, node_type))
+
+    @staticmethod
+    def addNodeRemovedCallback(function=None, node_type="dependNode", client_data=None):
+        return _scene.add_callback(_scene.node_removed_callbacks, _filter_type(function, node_type))
+
+
+class MNodeMessage(MMessage):
+    @staticmethod
+    def addNameChangedCallback(node=None, function=None, client_data=None):
+        return _scene.add_callback(_scene.name_changed_callbacks, function)
+
+
+class MSceneMessage(MMessage):
+    kAfterNew, kAfterOpen, kBeforeSave, kBeforeNew, kBeforeOpen, kMayaExiting, kAfterImport, kAfterCreateReference, \
+        kAfterLoadReference = range(9)
+
+    # only new scenes are sent
+    @staticmethod
+    def addCallback(message=0, function=None, client_data=None):
+        if message == MSceneMessage.kAfterNew:
+            return _scene.add_callback(_scene.new_scene_callbacks, function)
+
+        return _scene.add_callback({}, function)
+
+
+def _filter_type(function=None, node_type="dependNode"):
+    def called(node, client_data=None):
+        if node_type == "dependNode" or node.type == node_type:
+            function(node, client_data)
+
+    return called
+# endregion
+
+
+# region Plugins
+class MArgList(object):
+    pass
+
+
+class MPxCommand(object):
+    def doIt(self, args=None):
+        pass
+
+    def undoIt(self):
+        pass
+
+    def redoIt(self):
+        pass
+
+    def isUndoable(self):
+        return False
+
+
+# registered commands are added to the cmds stand-in
+class MFnPlugin(object):
+    def __init__(self, plugin=None, vendor="", version="", api_version=""):
+        pass
+
+    def registerCommand(self, name="command", creator=None):
+        def run():
+            _scene.command_called(name)
+            command = creator()
+            _scene.running_commands[0] += 1
+            try:
+                command.doIt(MArgList())
+            finally:
+                _scene.running_commands[0] -= 1
+            _scene.record_command(command)
+
+        setattr(cmds, name, run)
+
+    def deregisterCommand(self, name="command"):
+        delattr(cmds, name)
+# endregion
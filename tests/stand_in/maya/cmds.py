@@ -0,0 +1,317 @@
+# stand-in for the maya.cmds used by the generator, commands work on the in-memory scene of _scene
+# commands which change the scene are recorded on its undo queue
+import fnmatch
+from functools import wraps
+import _scene
+from _scene import resolve
+
+
+def _command(function=None):
+    @wraps(function)
+    def run(*args, **kwargs):
+        _scene.command_called(function.__name__)
+        return function(*args, **kwargs)
+
+    return run
+
+
+def _undoable(function=None):
+    @wraps(function)
+    def run(*args, **kwargs):
+        _scene.command_called(function.__name__)
+        return _scene.record(function, *args, **kwargs)
+
+    return run
+
+
+def _as_list(names=None):
+    if names is None:
+        return []
+    if isinstance(names, basestring):
+        return [names]
+
+    return list(names)
+
+
+def _name(node=None, long=False):
+    return node.path() if long else node.name
+
+
+# region Messages
+@_command
+def error(message=""):
+    raise RuntimeError(message)
+
+
+@_command
+def warning(message=""):
+    _scene.warnings.append(message)
+
+
+@_command
+def about(batch=False):
+    return True
+
+
+@_command
+def refresh(suspend=False):
+    pass
+# endregion
+
+
+# region Nodes
+@_command
+def objExists(name="node"):
+    return _scene.find(name) is not None
+
+
+@_undoable
+def createNode(type="transform", name=None, parent=None, skipSelect=False):
+    parent_node = resolve(parent) if parent is not None else None
+
+    node = _scene.Node(type, _scene.unique_name(name or type + "1", parent_node))
+    if parent_node is not None:
+        node.parents.append(parent_node)
+    _scene.add_node(node)
+
+    return node.name
+
+
+@_undoable
+def rename(name="node", new_name="node"):
+    node = resolve(name)
+    _scene.rename_node(node, _scene.unique_name(new_name, node.parent(), node))
+
+    return node.name
+
+
+@_undoable
+def delete(names=None):
+    for node in [resolve(name) for name in _as_list(names)]:
+        _scene.remove_node(node)
+
+
+def _copy_node(node=None, parent=None, instance_shapes=False):
+    copy = _scene.Node(node.type, _scene.unique_name(node.name, parent))
+    copy.translate, copy.rotate, copy.scale = list(node.translate), list(node.rotate), list(node.scale)
+    copy.attributes = dict(node.attributes)
+    if parent is not None:
+        copy.parents.append(parent)
+    _scene.add_node(copy)
+
+    for child in node.children():
+        if instance_shapes and child.type != "transform":
+            child.parents.append(copy)
+        else:
+            child_copy = _copy_node(child, copy, instance_shapes)
+
+            # copies keep their shading
+            for shading_group in _scene.get_shading_groups(child):
+                shading_group.members.extend([(child_copy, member[1]) for member in shading_group.members if member[0] is child])
+
+    return copy
+
+
+@_undoable
+def duplicate(name="node", ilf=False, rr=False):
+    node = resolve(name)
+    return [_copy_node(node, node.parent(), ilf).name]
+
+
+@_undoable
+def instance(name="node"):
+    node = resolve(name)
+    return [_copy_node(node, node.parent(), True).name]
+
+
+@_undoable
+def parent(child="node", parent_name=None, world=False, add=False, shape=False):
+    node = resolve(child)
+
+    # instance of a shape
+    if add:
+        node.parents.append(resolve(parent_name))
+        return [node.name]
+
+    # keep the world position
+    translation = node.world_translation()
+    new_parent = None if world else resolve(parent_name)
+    parent_translation = new_parent.world_translation() if new_parent is not None else [0.0, 0.0, 0.0]
+
+    node.parents = [new_parent] if new_parent is not None else []
+    node.translate = [translation[i] - parent_translation[i] for i in range(3)]
+    node.name = _scene.unique_name(node.name, new_parent, node)
+
+    return [node.name]
+
+
+@_command
+def listRelatives(name="node", parent=False, shapes=False, children=False, allDescendents=False, fullPath=False):
+    node = resolve(name)
+
+    if parent:
+        result = [node.parent()] if node.parent() is not None else []
+    elif allDescendents:
+        result = []
+        pending = node.children()
+        while len(pending) > 0:
+            result.append(pending.pop(0))
+            pending.extend(result[-1].children())
+    elif shapes:
+        result = [child for child in node.children() if child.type != "transform"]
+    else:
+        result = node.children()
+
+    return [_name(relative, fullPath) for relative in result] or None
+
+
+@_command
+def ls(names=None, selection=False, sl=False, long=False, objectsOnly=False, recursive=False):
+    if selection or sl:
+        return [_name(node, long) for node in _scene.selection]
+
+    result = []
+    for name in _as_list(names):
+        # attribute pattern
+        if "." in name:
+            pattern, attribute = name.split(".", 1)
+            result.extend([_name(node, long) for node in _scene.nodes
+                           if fnmatch.fnmatch(node.name, pattern) and node.attributes.has_key(attribute)])
+        elif _scene.find(name) is not None:
+            result.append(_name(_scene.find(name), long))
+
+    return result
+
+
+@_command
+def select(names=None, clear=False, cl=False):
+    _scene.selection[:] = [] if clear or cl else [resolve(name) for name in _as_list(names)]
+
+
+@_command
+def listHistory(names=None):
+    return []
+
+
+@_command
+def listConnections(names=None, type=None):
+    shading_groups = []
+    for name in _as_list(names):
+        shading_groups.extend([shading_group.name for shading_group in _scene.get_shading_groups(resolve(name))])
+
+    return shading_groups or None
+
+
+@_undoable
+def sets(names=None, edit=False, forceElement=None):
+    shading_group = resolve(forceElement)
+
+    for name in _as_list(names):
+        # faces "shape.f[first:last]"
+        faces = None
+        if ".f[" in name:
+            name, faces = name.split(".f[")
+            first, last = faces.rstrip("]").split(":")
+            faces = (int(first), int(last))
+
+        node = resolve(name)
+        for other in _scene.get_shading_groups(node):
+            other.members = [member for member in other.members if member[0] is not node or (faces is not None and member[1] != faces)]
+        shading_group.members.append((node, faces))
+# endregion
+
+
+# region Attributes
+_transform_attributes = ("translate", "rotate", "scale")
+
+
+@_command
+def getAttr(plug="node.attribute"):
+    name, attribute = plug.split(".", 1)
+    node = resolve(name)
+
+    if attribute in _transform_attributes:
+        return [tuple(getattr(node, attribute))]
+    if attribute == "intermediateObject":
+        return node.attributes.get(attribute, False)
+    if not node.attributes.has_key(attribute):
+        raise RuntimeError("No attribute named " + plug)
+
+    return node.attributes[attribute]
+
+
+@_undoable
+def setAttr(plug="node.attribute", *values, **kwargs):
+    name, attribute = plug.split(".", 1)
+    node = resolve(name)
+
+    if attribute in _transform_attributes:
+        setattr(node, attribute, [float(value) for value in values])
+    else:
+        node.attributes[attribute] = values[0]
+
+
+@_undoable
+def addAttr(name="node", longName="attribute", dataType=None):
+    resolve(name).attributes[longName] = None
+
+
+@_command
+def attributeQuery(attribute="attribute", node="node", exists=False):
+    return resolve(node).attributes.has_key(attribute)
+
+
+@_undoable
+def xform(name="node", worldSpace=False, translation=None):
+    node = resolve(name)
+    parent_translation = node.parent().world_translation() if node.parent() is not None else [0.0, 0.0, 0.0]
+    node.translate = [translation[i] - parent_translation[i] for i in range(3)]
+
+
+@_undoable
+def move(x=0, y=0, z=0, names=None, relative=False, localSpace=False):
+    for node in [resolve(name) for name in _as_list(names)]:
+        node.translate = [node.translate[0] + x, node.translate[1] + y, node.translate[2] + z]
+# endregion
+
+
+# region Undo
+@_command
+def undoInfo(query=False, state=None, stateWithoutFlush=None, undoName=False, openChunk=False, closeChunk=False, chunkName=None):
+    if query:
+        return _scene.get_undo_name() if undoName else _scene.undo_state["enabled"]
+
+    if openChunk:
+        _scene.open_chunk(chunkName)
+    elif closeChunk:
+        _scene.close_chunk()
+    elif stateWithoutFlush is not None:
+        _scene.undo_state["enabled"] = bool(stateWithoutFlush)
+    elif state is not None:
+        _scene.undo_state["enabled"] = bool(state)
+        del _scene.undo_queue[:]
+        del _scene.redo_queue[:]
+
+
+@_command
+def undo():
+    _scene.undo()
+
+
+@_command
+def redo():
+    _scene.redo()
+# endregion
+
+
+# region Scene
+# saving only keeps the path and the type of the saved scene
+@_command
+def file(name=None, new=False, force=False, rename=None, save=False, type=None):
+    if new:
+        _scene.new_scene()
+    elif rename is not None:
+        _scene.scene["name"] = rename
+    elif save:
+        _scene.saved_scenes.append((_scene.scene["name"], type))
+# endregion
@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from StringIO import StringIO
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+from maya import _scene
+import batch_generate
+from batch_generate import *
+
+
+def create_blueprints():
+    for blueprint in ["floor_wall_01", "floor_corner_01", "roof_tile_01", "roof_edge_01", "roof_corner_01"]:
+        mc.createNode("transform", name=blueprint)
+        mc.createNode("mesh", name=blueprint + "Shape", parent=blueprint)
+
+
+def create_spec(id="building", template_id="building_template", floor_count=2, seed=1):
+    return {"id": id, "position": [0, 0, 0], "template_id": template_id, "floor_count": floor_count, "seed": seed}
+
+
+class BatchGenerateTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        create_blueprints()
+        mc.undoInfo(state=True)
+
+        self.directory = tempfile.mkdtemp()
+        self.write_json("templates.json", [
+            BuildingTemplate("building_template", [FloorTemplate("floor_template")], [RoofTemplate("roof_template")]).get_serializable(),
+            BuildingTemplate("missing_template", [FloorTemplate("floor_template", walls=["missing_wall"])],
+                             [RoofTemplate("roof_template")]).get_serializable(),
+        ])
+
+        # the progress is printed
+        self.stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        shutil.rmtree(self.directory)
+
+    def write_json(self, name="file.json", serializable=None):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as json_file:
+            json.dump(serializable, json_file)
+
+        return path
+
+    def run_main(self, specs=[], *args):
+        specs_path = self.write_json("specs.json", specs)
+        return batch_generate.main(["--templates", os.path.join(self.directory, "templates.json"), "--specs", specs_path] + list(args))
+
+    def load_building(self, id="building"):
+        return Building.get_from_serializable(Building(id).read_metadata())
+
+    def test_generates_the_specs(self):
+        result = self.run_main([create_spec("building_a", floor_count=2), create_spec("building_b", floor_count=3)],
+                               "--compress", "--output", "city.mb")
+
+        self.assertEqual(result, 0)
+        self.assertEqual(building_registry.get_building_ids(), ["building_a", "building_b"])
+        self.assertEqual(self.load_building("building_a").get_floor_count(), 2)
+        self.assertEqual(self.load_building("building_b").get_floor_count(), 3)
+        self.assertEqual(json.loads(mc.getAttr("building_a." + Element.get_meta_data_key()))["compression"], "zlib")
+
+        # one undo step, saved to the output
+        self.assertEqual(len(_scene.undo_queue), 1)
+        self.assertEqual(_scene.saved_scenes, [("city.mb", "mayaBinary")])
+        self.assertIn("Generated 2 of 2 buildings", sys.stdout.getvalue())
+
+    def test_spec_with_unknown_template(self):
+        specs = [create_spec("building_a"), create_spec("building_b", "unknown_template")]
+
+        self.assertRaises(RuntimeError, self.run_main, specs)
+        self.assertFalse(mc.objExists("building_a"))
+        self.assertEqual(_scene.saved_scenes, [])
+
+    def test_spec_with_invalid_template_is_skipped(self):
+        result = self.run_main([create_spec("building_a"), create_spec("building_b", "missing_template")], "--no-undo")
+
+        self.assertEqual(result, 1)
+        self.assertTrue(mc.objExists("building_a"))
+        self.assertFalse(mc.objExists("building_b"))
+        self.assertEqual(len(_scene.warnings), 1)
+        self.assertEqual(len(_scene.undo_queue), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+from models.Building import *
+
+
+def create_building(floor_count=3):
+    building = Building("building")
+    for level in range(floor_count):
+        building.add_floor(Floor("floor_{}".format(level), level, "floor_template", None, 3.0))
+
+    return building
+
+
+class BuildingEventsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.building = create_building()
+
+        # events of the floor stack with the floor count when they were sent
+        self.events = []
+        self.building.add_listener(self.building_changed)
+
+    def building_changed(self, event=None):
+        if not isinstance(event, MetadataDirty):
+            self.events.append((type(event), self.building.get_floor_count()))
+
+    def test_insert_is_announced_before_the_change(self):
+        self.building.insert_floor(Floor("inserted_floor", 1, "floor_template", None, 3.0))
+
+        self.assertEqual(self.events, [(FloorAboutToBeInserted, 3), (FloorInserted, 4), (FloorsMoved, 4)])
+
+    def test_add_is_announced_before_the_change(self):
+        self.building.add_floor(Floor("floor_3", 3, "floor_template", None, 3.0))
+        self.building.add_floor(Floor("regenerated_floor", 0, "floor_template", None, 3.0))
+
+        self.assertEqual(self.events, [(FloorAboutToBeInserted, 3), (FloorInserted, 4), (FloorRegenerated, 4)])
+
+    def test_remove_is_announced_before_the_change(self):
+        self.building.remove_floor(1)
+
+        self.assertEqual(self.events, [(FloorAboutToBeRemoved, 3), (FloorRemoved, 2)])
+
+    def test_reset_is_announced_before_the_change(self):
+        self.building.set_floors({0: self.building.get_floor_at_level(2)})
+
+        self.assertEqual(self.events, [(FloorsAboutToBeReset, 3), (FloorsReset, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
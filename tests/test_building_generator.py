@@ -0,0 +1,102 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+from maya import _scene
+from building_generator import *
+
+
+def create_template():
+    for blueprint in ["floor_wall_01", "floor_wall_02", "floor_corner_01", "roof_tile_01", "roof_edge_01", "roof_corner_01"]:
+        mc.createNode("transform", name=blueprint)
+        mc.createNode("mesh", name=blueprint + "Shape", parent=blueprint)
+
+    floor_templates = [FloorTemplate("floor_template", walls=["floor_wall_01", "floor_wall_02"]),
+                       FloorTemplate("high_floor_template", (4, 6, 4), walls=["floor_wall_02"])]
+    return BuildingTemplate("building_template", floor_templates, [RoofTemplate("roof_template")])
+
+
+class BuildingGeneratorTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        self.template = create_template()
+        mc.undoInfo(state=True)
+
+        self.generator = BuildingGenerator()
+
+    # region Batch
+    def create_specs(self):
+        return [BuildingSpec("building_{}".format(i), (i * 20, 0, 0), self.template, floor_count=i + 1, seed=i)
+                for i in range(4)]
+
+    # creates the buildings of the specs in a new scene, returns their meta data and the progress
+    def create_buildings(self, processes=1):
+        mc.file(new=True, force=True)
+        self.template = create_template()
+
+        progress = []
+        buildings = self.generator.create_buildings(self.create_specs(), lambda *args: progress.append(args), processes)
+
+        return [building.read_metadata() for building in buildings], progress
+
+    def test_pool_plans_like_a_single_process(self):
+        metadata, progress = self.create_buildings(1)
+        pool_metadata, pool_progress = self.create_buildings(2)
+
+        self.assertEqual(len(metadata), 4)
+        self.assertEqual(pool_metadata, metadata)
+
+        # progress in the order of the specs
+        expected_progress = [(i + 1, 4, "building_{}".format(i)) for i in range(4)]
+        self.assertEqual(progress, expected_progress)
+        self.assertEqual(pool_progress, expected_progress)
+    # endregion
+
+    # region Regenerate
+    def create_building(self):
+        spec = BuildingSpec("building", (10, 0, 0), self.template, ["floor_template", "floor_template"], "roof_template", seed=3)
+        return self.generator.create_building(spec)
+
+    def get_added_nodes(self, nodes=[]):
+        return [node.name for node in _scene.nodes if node not in nodes]
+
+    def test_unchanged_regenerate_creates_nothing(self):
+        building = self.create_building()
+        nodes = list(_scene.nodes)
+        transforms = [(node.name, list(node.translate)) for node in nodes]
+
+        self.generator.regenerate_floor(building, self.template, self.template.get_floor_template("floor_template"), 1,
+                                        building.get_floor_at_level(1).get_seed())
+        self.generator.regenerate_roof(building, self.template, self.template.get_roof_template("roof_template"),
+                                       building.get_roof().get_seed())
+
+        self.assertEqual(_scene.nodes, nodes)
+        self.assertEqual([(node.name, list(node.translate)) for node in _scene.nodes], transforms)
+
+    def test_wider_floor_only_adds_the_new_walls(self):
+        building = self.create_building()
+        nodes = list(_scene.nodes)
+        corner = building.get_floor_at_level(0).get_corner(kFront).get_object()
+        corner_position = mc.getAttr(corner + ".translate")[0]
+
+        wide_template = FloorTemplate("floor_template", width=5, walls=["floor_wall_01", "floor_wall_02"])
+        self.generator.regenerate_floor(building, self.template, wide_template, 0, building.get_floor_at_level(0).get_seed())
+
+        # two more walls at the front and the back, the other elements are kept and moved
+        self.assertEqual(sorted(self.get_added_nodes(nodes)),
+                         ["building_floor_0_back_wall_2", "building_floor_0_back_wall_3",
+                          "building_floor_0_front_wall_2", "building_floor_0_front_wall_3"])
+        self.assertEqual([node for node in nodes if node not in _scene.nodes], [])
+        self.assertNotEqual(mc.getAttr(corner + ".translate")[0], corner_position)
+        self.assertEqual(len(building.get_floor_at_level(0).get_elements()), 12)
+    # endregion
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import unittest
+
+# the planner does not need maya, the stand-in is only on the path for the other tests
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+from building_planner import *
+
+walls = ["wall_01", "wall_02", "wall_03", "wall_04"]
+tiles = ["tile_01", "tile_02", "tile_03"]
+
+
+def create_template():
+    floor_templates = [FloorTemplate("floor_template", (4, 3, 4), 5, 4, walls), FloorTemplate("wide_floor_template", (4, 3, 4), 8, 4, walls)]
+    return BuildingTemplate("building_template", floor_templates, [RoofTemplate("roof_template", (4, 3, 4), 6, 5, tiles)])
+
+
+# blueprint by slot of the elements of a plan
+def get_blueprints(plan=FloorPlan()):
+    return dict((element_plan.get_slot(), element_plan.blueprint) for element_plan in plan.elements)
+
+
+class BuildingPlannerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = BuildingPlanner()
+        self.template = create_template()
+
+    def plan_floor(self, floor_template_id="floor_template", seed=0):
+        building = Building("building")
+        return self.planner.plan_floor(building, self.template, self.template.get_floor_template(floor_template_id), 0,
+                                       seed, (0, 0, 0), "building_floor_0")
+
+    def plan_building(self, seed=0):
+        spec = BuildingSpec("building", (0, 0, 0), self.template, floor_count=4)
+        return self.planner.plan_building(spec, seed, self.template.get_all_floor_templates(),
+                                          self.template.get_all_roof_templates())
+
+    def test_same_seed_and_slot_get_the_same_blueprint(self):
+        blueprints = get_blueprints(self.plan_floor(seed=42))
+
+        # other floors planned before and the global random state do not change the choices
+        self.plan_floor(seed=7)
+        random.seed(3)
+        self.assertEqual(get_blueprints(self.plan_floor(seed=42)), blueprints)
+
+        # each slot chooses on its own
+        self.assertGreater(len(set(blueprints.values())), 1)
+        self.assertNotEqual(get_blueprints(self.plan_floor(seed=43)), blueprints)
+
+    def test_slots_keep_their_blueprint_in_a_wider_floor(self):
+        blueprints = get_blueprints(self.plan_floor("floor_template", 42))
+        wide_blueprints = get_blueprints(self.plan_floor("wide_floor_template", 42))
+
+        # walls of the slots which exist in both floors
+        for slot in blueprints.keys():
+            if slot[0] == kWallElement and slot in wide_blueprints:
+                self.assertEqual(wide_blueprints[slot], blueprints[slot])
+
+    def test_building_plans_are_deterministic(self):
+        plan = self.plan_building(5)
+        random.seed(11)
+        other_plan = self.plan_building(5)
+
+        self.assertEqual([floor_plan.template_id for floor_plan in other_plan.floor_plans],
+                         [floor_plan.template_id for floor_plan in plan.floor_plans])
+        self.assertEqual([floor_plan.seed for floor_plan in other_plan.floor_plans],
+                         [floor_plan.seed for floor_plan in plan.floor_plans])
+        for floor_plan, other_floor_plan in zip(plan.floor_plans, other_plan.floor_plans):
+            self.assertEqual(get_blueprints(other_floor_plan), get_blueprints(floor_plan))
+        self.assertEqual(get_blueprints(other_plan.roof_plan), get_blueprints(plan.roof_plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
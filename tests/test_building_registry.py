@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+from maya import _scene
+from models.BuildingRegistry import *
+
+
+def create_building(name="building"):
+    mc.createNode("transform", name=name)
+    mc.addAttr(name, longName=Element.get_meta_data_key(), dataType="string")
+    mc.setAttr(BuildingRegistry.get_metadata_plug(name), '{"template_id": "template"}', type="string")
+
+
+class BuildingRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        create_building("old_building")
+
+        self.registry = BuildingRegistry()
+        self.registry.add_callbacks()
+
+    def tearDown(self):
+        self.registry.remove_callbacks()
+
+    def test_finds_buildings_of_the_scene(self):
+        self.assertEqual(self.registry.get_building_ids(), ["old_building"])
+        self.assertEqual(self.registry.get_template_id("old_building"), "template")
+
+    def test_keeps_nothing_for_other_nodes(self):
+        self.registry.get_building_ids()
+        for i in range(10):
+            mc.createNode("transform", name="element_{}".format(i), parent="old_building")
+
+        self.assertEqual(self.registry._buildings, {"old_building": None})
+
+    def test_registers_added_nodes_with_meta_data(self):
+        self.registry.get_building_ids()
+
+        # e.g. a deleted building restored by undo
+        node = _scene.Node("transform", "restored_building")
+        node.attributes[Element.get_meta_data_key()] = '{"template_id": "template"}'
+        _scene.add_node(node)
+
+        self.assertEqual(self.registry.get_building_ids(), ["old_building", "restored_building"])
+
+    def test_removes_and_renames_buildings(self):
+        create_building("building")
+        self.registry.register("building", "template")
+
+        mc.rename("old_building", "renamed_building")
+        self.assertEqual(self.registry.get_building_ids(), ["building", "renamed_building"])
+
+        mc.delete("building")
+        self.assertEqual(self.registry.get_building_ids(), ["renamed_building"])
+
+    def test_new_scene_invalidates(self):
+        self.registry.get_building_ids()
+        mc.file(new=True, force=True)
+
+        self.assertEqual(self.registry.get_building_ids(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+from maya import _scene
+from building_generator import *
+
+
+def create_template():
+    for blueprint in ["floor_wall_01", "floor_corner_01", "roof_tile_01", "roof_edge_01", "roof_corner_01"]:
+        mc.createNode("transform", name=blueprint)
+        mc.createNode("mesh", name=blueprint + "Shape", parent=blueprint)
+
+    floor_templates = [FloorTemplate("floor_template"), FloorTemplate("high_floor_template", (4, 6, 4)),
+                       FloorTemplate("missing_floor_template", walls=["missing_wall"])]
+    return BuildingTemplate("building_template", floor_templates, [RoofTemplate("roof_template")])
+
+
+def get_height(name="node"):
+    return mc.getAttr(name + ".translate")[0][1]
+
+
+class FloorTransactionTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        self.template = create_template()
+
+        self.generator = BuildingGenerator()
+        spec = BuildingSpec("building", (0, 0, 0), self.template, ["floor_template", "high_floor_template", "floor_template"],
+                            "roof_template", seed=1)
+        self.building = self.generator.create_building(spec)
+        mc.undoInfo(state=True)
+
+        # floor roots from the ground up
+        self.floors = [self.building.get_floor_at_level(level).get_object() for level in range(3)]
+
+    def get_floors(self):
+        return [self.building.get_floor_at_level(level).get_object() for level in range(self.building.get_floor_count())]
+
+    def get_level_heights(self):
+        return [self.building.get_level_height(level, self.template) for level in range(self.building.get_floor_count() + 1)]
+
+    # moves the ground floor to the top, inserts a floor above the new ground floor and deletes the old top floor
+    def queue_changes(self, floor_template_id="high_floor_template"):
+        transaction = self.generator.begin_floor_transaction(self.building, self.template)
+        transaction.move_floor(0, 2)
+        transaction.insert_floor(1, self.template.get_floor_template(floor_template_id), 3)
+        transaction.delete_floor(2)
+
+        return transaction
+
+    def test_commit(self):
+        self.assertTrue(self.queue_changes().commit())
+
+        floors = self.get_floors()
+        self.assertEqual([floors[0], floors[2]], [self.floors[1], self.floors[0]])
+        self.assertFalse(mc.objExists(self.floors[2]))
+        self.assertEqual(self.building.get_floor_at_level(1).get_template_id(), "high_floor_template")
+
+        # levels and positions of the floors and the roof
+        self.assertEqual(self.get_level_heights(), [0, 6, 12, 16])
+        self.assertEqual([get_height(floor) for floor in floors], [0, 6, 12])
+        self.assertEqual(get_height(self.building.get_roof().get_object()), 16)
+
+        # one undo step
+        self.assertEqual(len(_scene.undo_queue), 1)
+        mc.undo()
+        self.assertEqual([get_height(floor) for floor in self.floors], [0, 4, 10])
+
+    def test_failed_commit_is_rolled_back(self):
+        level_heights = self.get_level_heights()
+        nodes = [(node.path(), list(node.translate)) for node in _scene.nodes]
+
+        # the new floor can not be created after the other floors have been destroyed and moved
+        transaction = self.queue_changes("missing_floor_template")
+        self.assertRaises(RuntimeError, transaction.commit)
+
+        self.assertEqual(self.get_floors(), self.floors)
+        self.assertEqual(self.get_level_heights(), level_heights)
+        self.assertEqual([(node.path(), list(node.translate)) for node in _scene.nodes], nodes)
+        self.assertEqual(len(_scene.undo_queue), 0)
+
+        # the transaction is reset to the building
+        self.assertEqual(transaction.get_floor_count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
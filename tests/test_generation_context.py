@@ -0,0 +1,145 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+from maya import _scene
+from generation_context import *
+
+
+# existing building with one floor, the operations add floors to it
+def create_building():
+    mc.createNode("transform", name="building")
+    building = Building("building")
+    building.add_floor(Floor("building_floor_0", 0, "floor_template", None, 3.0))
+
+    return building
+
+
+class GenerationContextTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        mc.undoInfo(state=True)
+
+        self.reporter = RecordingProgressReporter()
+        self.context = GenerationContext(UndoRecorder(), self.reporter)
+
+    # creates the elements, reporting each of them
+    def create_elements(self, names=()):
+        self.context.part_started("part", len(names))
+        for name in names:
+            mc.createNode("transform", name=name)
+            self.context.element_created(name)
+
+        return names
+
+    # adds a floor to the building and creates its elements
+    def create_floor(self, building=None, names=()):
+        floor_object = "building_floor_{}".format(building.get_floor_count())
+        mc.createNode("transform", name=floor_object, parent="building")
+        building.add_floor(Floor(floor_object, building.get_floor_count(), "floor_template", None, 3.0))
+
+        self.context.part_started(floor_object, len(names))
+        for name in names:
+            mc.createNode("transform", name=name, parent=floor_object)
+            mc.createNode("mesh", name=name + "Shape", parent=name)
+            self.context.element_created(name)
+
+        return floor_object
+
+    def run_cancelled(self, undo=True, cancel_after=2):
+        building = create_building()
+        state = building.get_state()
+        nodes = list(_scene.nodes)
+        undo_queue = list(_scene.undo_queue)
+
+        self.context = GenerationContext(UndoRecorder(undo), RecordingProgressReporter(cancel_after))
+        result = self.context.run("create_floor", building, self.create_floor, building, ["a", "b", "c"])
+
+        self.assertIsNone(result)
+        self.assertTrue(self.context.was_cancelled())
+        self.assertEqual(self.context.get_reporter().get_element_count(), cancel_after)
+        self.assertEqual(self.context.get_reporter().records[-1], ("end", True))
+
+        # scene and model are restored
+        self.assertEqual(_scene.nodes, nodes)
+        self.assertEqual(building.get_state(), state)
+        self.assertEqual(building.get_floor_count(), 1)
+        self.assertEqual(_scene.undo_queue, undo_queue)
+
+    def test_cancelled_operation_is_undone(self):
+        self.run_cancelled(True)
+        self.assertEqual(_scene.redo_queue[-1]["name"], "create_floor")
+
+    def test_cancelled_operation_without_undo_deletes_its_nodes(self):
+        self.run_cancelled(False)
+
+        self.assertTrue(mc.undoInfo(query=True, state=True))
+        self.assertEqual(len(_scene.warnings), 1)
+
+    def test_cancelled_operation_with_undo_disabled_by_the_user(self):
+        mc.undoInfo(stateWithoutFlush=False)
+        self.run_cancelled(True)
+
+        self.assertFalse(mc.undoInfo(query=True, state=True))
+
+    def test_cancelled_operation_without_changes_keeps_the_previous_undo_step(self):
+        mc.createNode("transform", name="previous")
+        self.run_cancelled(True, 0)
+
+        self.assertTrue(mc.objExists("previous"))
+
+    def test_operation_cancelled_before_any_change_keeps_the_previous_undo_step(self):
+        mc.createNode("transform", name="previous")
+        self.context.set_reporter(RecordingProgressReporter(0))
+
+        self.assertIsNone(self.context.run("operation", None, self.create_elements, ["a"]))
+        self.assertEqual(self.context.get_undo_recorder().get_last_report()["undo_steps"], 0)
+        self.assertTrue(mc.objExists("previous"))
+        self.assertEqual(len(_scene.undo_queue), 1)
+
+    def test_is_rolling_back_during_undo(self):
+        rolling_back = []
+
+        def command_called(command="", client_data=None):
+            if command == "undo":
+                rolling_back.append(self.context.is_rolling_back())
+
+        callback_id = om.MCommandMessage.addCommandCallback(command_called)
+        try:
+            self.context.set_reporter(RecordingProgressReporter(1))
+            self.context.run("operation", None, self.create_elements, ["a", "b"])
+        finally:
+            om.MMessage.removeCallback(callback_id)
+
+        self.assertEqual(rolling_back, [True])
+        self.assertFalse(self.context.is_rolling_back())
+
+    def test_failed_begin_is_reverted(self):
+        class FailingReporter(ProgressReporter):
+            def begin(self, operation="operation"):
+                raise RuntimeError("failed")
+
+        for undo in (True, False):
+            context = GenerationContext(UndoRecorder(undo), FailingReporter())
+            self.assertRaises(RuntimeError, context.run, "operation", None, self.create_elements, ["a"])
+
+            self.assertFalse(context.is_running())
+            self.assertEqual(_scene.chunk["depth"], 0)
+            self.assertTrue(mc.undoInfo(query=True, state=True))
+            self.assertEqual(_scene.nodes, [])
+
+            # the next operation is recorded as usual
+            context.set_reporter(ProgressReporter())
+            context.run("operation", None, self.create_elements, ["a"])
+            mc.delete("a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+from building_generator import *
+
+
+def create_template():
+    for blueprint in ["floor_wall_01", "floor_wall_02", "floor_corner_01", "roof_tile_01", "roof_edge_01", "roof_corner_01"]:
+        mc.createNode("transform", name=blueprint)
+        mc.createNode("mesh", name=blueprint + "Shape", parent=blueprint)
+
+    return BuildingTemplate("building_template", [FloorTemplate("floor_template", walls=["floor_wall_01", "floor_wall_02"])],
+                            [RoofTemplate("roof_template", width=4)])
+
+
+# names, blueprints and slots of the elements of the floors and the roof
+def get_elements(building=Building()):
+    parts = [building.get_floor_at_level(level) for level in range(building.get_floor_count())] + [building.get_roof()]
+    return [sorted((element.get_object(), element.get_blueprint(), element.get_slot()) for element in part.get_elements())
+            for part in parts]
+
+
+class MetadataTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        template = create_template()
+
+        generator = BuildingGenerator()
+        self.building = generator.create_building(BuildingSpec("building", (10, 0, 0), template, floor_count=3, seed=7))
+
+        # floors keep the names of the level they were created on
+        generator.swap_floors(self.building, template, 0, 2)
+
+    def load_building(self):
+        return Building.get_from_serializable(self.building.read_metadata())
+
+    def check_round_trip(self, compression=None):
+        self.building.save_metadata(compression)
+        metadata = self.building.read_metadata()
+        self.assertEqual(metadata["version"], kMetadataVersion)
+        self.assertEqual(metadata["compression"], compression)
+
+        loaded = self.load_building()
+        self.assertEqual(loaded.get_floor_count(), 3)
+        self.assertEqual(get_elements(loaded), get_elements(self.building))
+        self.assertEqual(loaded.get_compact_serializable(compression), self.building.get_compact_serializable(compression))
+
+    def test_round_trip(self):
+        self.check_round_trip()
+
+    def test_round_trip_with_zlib(self):
+        self.check_round_trip("zlib")
+
+    def test_legacy_metadata(self):
+        self.building.write_metadata(json.dumps(self.building.get_serializable()))
+
+        loaded = self.load_building()
+        self.assertEqual(loaded.get_floor_count(), 3)
+        self.assertEqual(get_elements(loaded), get_elements(self.building))
+
+    def test_elements_are_unpacked_lazily(self):
+        self.building.save_metadata("zlib")
+        loaded = self.load_building()
+
+        floor = loaded.get_floor_at_level(0)
+        self.assertIsNotNone(floor._packed_elements)
+        self.assertIsNotNone(loaded.get_roof()._packed_elements)
+
+        # unpacked to the same names
+        self.assertEqual(sorted(element.get_object() for element in floor.get_elements()),
+                         sorted(element.get_object() for element in self.building.get_floor_at_level(0).get_elements()))
+        self.assertIsNone(floor._packed_elements)
+        self.assertEqual(get_elements(loaded), get_elements(self.building))
+
+
+if __name__ == "__main__":
+    unittest.main()
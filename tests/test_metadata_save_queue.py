@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+from maya import _scene
+from building_generator import *
+from gui.MetadataSaveQueue import MetadataSaveQueue
+
+
+def create_template():
+    for blueprint in ["floor_wall_01", "floor_corner_01", "roof_tile_01", "roof_edge_01", "roof_corner_01"]:
+        mc.createNode("transform", name=blueprint)
+        mc.createNode("mesh", name=blueprint + "Shape", parent=blueprint)
+
+    return BuildingTemplate("building_template", [FloorTemplate("floor_template")], [RoofTemplate("roof_template")])
+
+
+class MetadataSaveQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        self.template = create_template()
+        mc.undoInfo(state=True)
+
+        self.generator = BuildingGenerator()
+        self.queue = MetadataSaveQueue()
+        self.queue.add_callbacks()
+
+    def tearDown(self):
+        self.queue.close()
+
+    # the building is saved like in the editor, whenever its meta data is outdated
+    def create_empty_building(self):
+        building = self.generator.create_empty_building("building", self.template)
+        building.add_listener(lambda event: isinstance(event, MetadataDirty) and self.queue.add(building))
+
+        return building
+
+    def run_out(self):
+        if self.queue._timer.isActive():
+            self.queue._timer.timeout.emit()
+
+    def load_building(self):
+        return Building.get_from_serializable(Building("building").read_metadata())
+
+    def test_create_building_sequence(self):
+        building = self.create_empty_building()
+        for level in range(3):
+            self.generator.create_floor(building, self.template, self.template.get_floor_template("floor_template"), level)
+        self.generator.create_roof(building, self.template, self.template.get_roof_template("roof_template"))
+
+        # the edits of all operations are written at once
+        self.assertEqual(self.queue.get_write_count(), 0)
+        self.run_out()
+        self.assertEqual(self.queue.get_write_count(), 1)
+        self.assertFalse(self.queue.has_changes())
+
+        loaded = self.load_building()
+        self.assertEqual(loaded.get_floor_count(), 3)
+        self.assertEqual(loaded.get_roof().get_object(), building.get_roof().get_object())
+
+        # the writes are not recorded by undo
+        self.assertEqual(len(_scene.undo_queue), 5)
+
+    def test_building_without_roof(self):
+        building = self.create_empty_building()
+        self.generator.create_floor(building, self.template, self.template.get_floor_template("floor_template"), 0)
+        self.run_out()
+
+        loaded = self.load_building()
+        self.assertEqual(loaded.get_floor_count(), 1)
+        self.assertIsNone(loaded.get_roof())
+
+    def test_flushed_before_undo(self):
+        building = self.create_empty_building()
+        self.generator.create_floor(building, self.template, self.template.get_floor_template("floor_template"), 0)
+
+        mc.undo()
+        self.assertEqual(self.queue.get_write_count(), 1)
+        self.assertFalse(self.queue.has_changes())
+
+
+if __name__ == "__main__":
+    unittest.main()
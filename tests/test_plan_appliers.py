@@ -0,0 +1,169 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+from maya import _scene
+from apply_plan_command import *
+
+
+def create_blueprint(name="blueprint", shading_group="blueprintSG"):
+    mc.createNode("transform", name=name)
+    shape = mc.createNode("mesh", name=name + "Shape", parent=name)
+
+    if not mc.objExists(shading_group):
+        mc.createNode("shadingEngine", name=shading_group)
+    mc.sets(shape, edit=True, forceElement=shading_group)
+
+
+def create_plan():
+    plan = FloorPlan("floor_0", 0, "floor_template", 1, 3)
+    plan.add_group(GroupPlan("floors", "building"))
+    plan.add_group(GroupPlan("floor_0", "floors", (0, 3, 0)))
+    plan.add_group(GroupPlan("floor_0_walls", "floor_0"))
+
+    plan.add_element(ElementPlan(kWallElement, "wall", "floor_0_wall_0", (12, 3, 0), (0, 90, 0), "floor_0_walls", kFront, None, 0))
+    plan.add_element(ElementPlan(kWallElement, "wall", "floor_0_wall_1", (14, 3, 0), (0, 90, 0), "floor_0_walls", kFront, None, 1))
+    plan.add_element(ElementPlan(kCornerElement, "corner", "floor_0_corner_0", (10, 3, 0), None, "floor_0", kFront))
+
+    return plan
+
+
+def get_transforms():
+    return dict((node.path(), (node.world_translation(), [round(angle, 6) for angle in node.rotate]))
+                for node in _scene.nodes if node.type == "transform")
+
+
+class ApiPlanApplierTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+
+        create_blueprint("wall", "wallSG")
+        create_blueprint("corner", "cornerSG")
+        mc.createNode("transform", name="building")
+        mc.setAttr("building.translate", 10, 0, 0)
+
+        # flushes the undo queue
+        mc.undoInfo(state=True)
+
+        self.scene_nodes = list(_scene.nodes)
+
+    def tearDown(self):
+        if hasattr(mc, kApplyPlanCommand):
+            om.MFnPlugin().deregisterCommand(kApplyPlanCommand)
+
+    def register_command(self):
+        om.MFnPlugin().registerCommand(kApplyPlanCommand, ApplyPlanCommand.creator)
+
+    def test_matches_cmds_applier(self):
+        CmdsPlanApplier().apply(create_plan())
+        cmds_transforms = get_transforms()
+
+        self.setUp()
+        self.register_command()
+        result = ApiPlanApplier().apply(create_plan())
+
+        self.assertEqual(result, ["floor_0_wall_0", "floor_0_wall_1", "floor_0_corner_0"])
+        self.assertEqual(get_transforms(), cmds_transforms)
+
+    def test_copies_meshes_and_shading_groups(self):
+        self.register_command()
+        ApiPlanApplier().apply(create_plan(), kDuplicateCopy)
+
+        for element, shading_group in [("floor_0_wall_0", "wallSG"), ("floor_0_corner_0", "cornerSG")]:
+            shapes = mc.listRelatives(element, shapes=True, fullPath=True)
+            self.assertEqual(len(shapes), 1)
+            self.assertNotEqual(_scene.resolve(shapes[0]), _scene.resolve("wallShape"))
+            self.assertEqual(mc.listConnections(shapes, type="shadingEngine"), [shading_group])
+
+    def test_instances_share_blueprint_shapes(self):
+        self.register_command()
+        ApiPlanApplier().apply(create_plan(), kDuplicateInstance)
+
+        shape = _scene.resolve("floor_0_wall_1|wallShape")
+        self.assertIs(shape, _scene.resolve("wall|wallShape"))
+        self.assertEqual(len(shape.parents), 3)
+        self.assertEqual(mc.listConnections("floor_0_wall_1|wallShape", type="shadingEngine"), ["wallSG"])
+
+    def test_assigns_shading_groups_per_face(self):
+        mc.createNode("shadingEngine", name="windowSG")
+        mc.sets("wallShape.f[2:3]", edit=True, forceElement="windowSG")
+
+        self.register_command()
+        ApiPlanApplier().apply(create_plan())
+
+        shape = _scene.resolve("floor_0_wall_0Shape")
+        self.assertEqual([member[1] for member in _scene.resolve("wallSG").members if member[0] is shape], [(0, 1), (4, 5)])
+        self.assertEqual([member[1] for member in _scene.resolve("windowSG").members if member[0] is shape], [(2, 3)])
+
+    def test_plan_is_one_undo_step(self):
+        self.register_command()
+        before = get_transforms()
+
+        ApiPlanApplier().apply(create_plan())
+        after = get_transforms()
+        self.assertEqual(len(_scene.undo_queue), 1)
+
+        mc.undo()
+        self.assertEqual(_scene.nodes, self.scene_nodes)
+        self.assertEqual(get_transforms(), before)
+
+        mc.redo()
+        self.assertEqual(get_transforms(), after)
+        self.assertEqual(len(mc.listRelatives("floor_0_wall_0", shapes=True)), 1)
+
+    def test_edit_is_undone_and_redone(self):
+        edit = ApiPlanEdit(om, create_plan(), kDuplicateCopy)
+        edit.do_it()
+        after = get_transforms()
+
+        edit.undo_it()
+        self.assertEqual(_scene.nodes, self.scene_nodes)
+
+        edit.redo_it()
+        self.assertEqual(get_transforms(), after)
+        self.assertEqual(edit.get_element_names(), ["floor_0_wall_0", "floor_0_wall_1", "floor_0_corner_0"])
+
+    def test_refused_without_plugin_while_undo_is_enabled(self):
+        self.assertRaises(RuntimeError, ApiPlanApplier().apply, create_plan())
+        self.assertEqual(_scene.nodes, self.scene_nodes)
+
+    def test_applied_without_plugin_while_undo_is_disabled(self):
+        mc.undoInfo(stateWithoutFlush=False)
+        ApiPlanApplier().apply(create_plan())
+
+        self.assertTrue(mc.objExists("floor_0_walls|floor_0_wall_1"))
+        self.assertEqual(len(_scene.undo_queue), 0)
+
+    def test_cancelled_plan_creates_nothing(self):
+        def cancel_at_corner(element="element"):
+            if "corner" in element:
+                raise KeyboardInterrupt()
+
+        self.register_command()
+        self.assertRaises(KeyboardInterrupt, ApiPlanApplier().apply, create_plan(), kDuplicateCopy, cancel_at_corner)
+        self.assertEqual(_scene.nodes, self.scene_nodes)
+
+    def test_cancelled_operation_removes_applied_plans(self):
+        from generation_context import GenerationContext, RecordingProgressReporter, UndoRecorder
+
+        # cancelled in the second plan
+        def apply_plans():
+            for i in range(2):
+                ApiPlanApplier().apply(create_plan(), kDuplicateCopy, context.element_created)
+
+        self.register_command()
+        context = GenerationContext(UndoRecorder(), RecordingProgressReporter(4))
+
+        self.assertIsNone(context.run("create_building", None, apply_plans))
+        self.assertEqual(_scene.nodes, self.scene_nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import sys
+import unittest
+
+# the scripts run against the in-memory stand-in for maya
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(tests_dir, "stand_in"), os.path.join(os.path.dirname(tests_dir), "scripts")]
+
+import maya.cmds as mc
+from maya import _scene
+import undo_recorder
+
+
+def create_node(name="node"):
+    mc.createNode("transform", name=name)
+
+
+class UndoRecorderTest(unittest.TestCase):
+
+    def setUp(self):
+        mc.file(new=True, force=True)
+        mc.undoInfo(state=True)
+
+    def run_operation(self, recorder=None, function=None, operation="operation"):
+        recorder.begin(operation)
+        try:
+            if function is not None:
+                function()
+        finally:
+            recorder.end()
+
+        return recorder.get_last_report()
+
+    def test_operation_is_one_undo_step(self):
+        recorder = undo_recorder.UndoRecorder()
+        report = self.run_operation(recorder, lambda: [create_node("a"), create_node("b")])
+
+        self.assertEqual(report["undo_steps"], 1)
+        self.assertEqual(len(_scene.undo_queue), 1)
+
+        mc.undo()
+        self.assertEqual(_scene.nodes, [])
+
+    def test_operation_without_undo_is_not_recorded(self):
+        create_node("previous")
+        recorder = undo_recorder.UndoRecorder(False)
+        report = self.run_operation(recorder, lambda: create_node("a"))
+
+        self.assertEqual(report["undo_steps"], 0)
+        self.assertEqual(report["recorded_commands"], 0)
+        self.assertEqual(len(_scene.undo_queue), 1)
+        self.assertTrue(mc.undoInfo(query=True, state=True))
+
+    def test_undo_recording_is_restored_after_failure(self):
+        def fail():
+            create_node("a")
+            raise RuntimeError("failed")
+
+        recorder = undo_recorder.UndoRecorder(False)
+        self.assertRaises(RuntimeError, self.run_operation, recorder, fail)
+        self.assertTrue(mc.undoInfo(query=True, state=True))
+
+
+# maya.cmds without the api, e.g. a stand-in for the batch generation
+class CmdsOnlyUndoRecorderTest(UndoRecorderTest):
+
+    def setUp(self):
+        UndoRecorderTest.setUp(self)
+
+        self.api = sys.modules.pop("maya.api.OpenMaya", None)
+        sys.modules["maya.api.OpenMaya"] = None
+        reload(undo_recorder)
+
+    def tearDown(self):
+        del sys.modules["maya.api.OpenMaya"]
+        if self.api is not None:
+            sys.modules["maya.api.OpenMaya"] = self.api
+        reload(undo_recorder)
+
+    def test_commands_are_not_counted(self):
+        self.assertIsNone(undo_recorder.om)
+
+        report = self.run_operation(undo_recorder.UndoRecorder(), lambda: create_node("a"))
+        self.assertIsNone(report["commands"])
+        self.assertEqual(report["undo_steps"], 1)
+
+    def test_empty_operation_has_no_undo_step(self):
+        create_node("previous")
+        report = self.run_operation(undo_recorder.UndoRecorder(), None, "create_building")
+
+        self.assertEqual(report["undo_steps"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()